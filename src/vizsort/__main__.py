@@ -1,55 +1,18 @@
-from typing import TYPE_CHECKING, Callable, List, Tuple, MutableSequence, Iterable
-import pygame
+from array import array
+from typing import TYPE_CHECKING, Callable, List, Optional, Tuple, MutableSequence, Iterable
+from time import perf_counter
+import math
+import os
 import random
+import pygame
 
 import vizsort.lib
+import vizsort.render
+from vizsort.settings import Settings
 
 if TYPE_CHECKING:
     from vizsort.lib._type_hint import CT
-
-
-class Settings:
-    FPS = 60
-    CAPTION = "VizSort"
-    BACKGROUND_COLOR = (30, 30, 30)
-    SCREEN_RECT_SIZE = (1000, 700)
-
-    SMALL_DATASET = 50
-    MEDIUM_DATASET = 200
-    LARGE_DATASET = 1000
-
-    COLOR_SCHEME_R = ((110, 13, 53), (200, 200, 130), (0, 255, 0))
-    COLOR_SCHEME_G = ((10, 80, 20), (10, 224, 154), (255, 0, 255))
-    COLOR_SCHEME_B = ((13, 53, 156), (130, 200, 200), (255, 0, 0))
-    CURRENT_COLOR_SCHEME = COLOR_SCHEME_B
-
-    FONT_NAME = "Arial"
-    FONT_SIZE = 30
-    FONT: pygame.font.Font = None
-
-    FONT_BACKGROUND_COLOR = (50, 37, 89)
-    FONT_DEFAULT_COLOR = (255, 0, 255)
-    FONT_HOVERED_COLOR = (255, 255, 255)
-    FONT_CLICKED_COLOR = (255, 255, 255)
-
-    BUTTON_HOVERED_COLOR = (195, 30, 0)
-    BUTTON_CLICKED_COLOR = (0, 30, 195)
-
-    MENU_SORTING_ALGO_RECT = (740, 370, 250, 320)
-    MENU_DATASET_SIZE_RECT = (10, 640, 350, 50)
-
-    MENU_BACKGROUND_COLOR = (0, 0, 0)
-    MENU_BUTTON_RECT_PADDING = 5
-
-    SORTING_INFO_POSITION = "topleft"
-    SORTING_DISPLAYER_RECT = (0, 0, 3000, 2500)
-
-    MESSAGE_RECT_PADDING = (25, 25)
-    MESSAGE_POSITION = "center"
-    MESSAGE_SORTING_DONE = "SORTING DONE"
-    MESSAGE_PROMPT_TO_START = "PRESS ENTER TO START"
-    MESSAGE_SELECT_DATASET_SIZE = "SELECT DATASET SIZE"
-    MESSAGE_SELECT_SORTING_ALGORITHM = "SELECT SORTING ALGORITHM"
+    from vizsort.lib.step import Step
 
 
 def render_bordered_text(
@@ -61,8 +24,9 @@ def render_bordered_text(
     border_color: Tuple[int, int, int] = Settings.BACKGROUND_COLOR,
     x: int = 0,
     y: int = 0,
-) -> None:
-    font_surf = Settings.FONT.render(text, True, font_color)
+    font: "pygame.font.Font" = None,
+) -> pygame.Rect:
+    font_surf = (font or Settings.FONT).render(text, True, font_color)
 
     surf_rect = surface.get_rect()
     font_surf_rect = font_surf.get_rect(center=getattr(surf_rect, pos))
@@ -76,6 +40,8 @@ def render_bordered_text(
     surface.blit(font_surf, font_surf_rect.topleft)
     pygame.draw.rect(surface, border_color, bg_font_surf_rect, 3)
 
+    return bg_font_surf_rect
+
 
 class Button(pygame.Surface):
     def __init__(
@@ -207,23 +173,50 @@ class Menu(pygame.Surface):
 
 
 class SortingDisplayer(pygame.Surface):
-    def __init__(self, container: pygame.Surface) -> None:
-        self.x, self.y, self.w, self.h = Settings.SORTING_DISPLAYER_RECT
+    def __init__(
+        self,
+        container: pygame.Surface,
+        rect: Tuple[int, int, int, int] = Settings.SORTING_DISPLAYER_RECT,
+        scheduler: "vizsort.lib.StepScheduler" = None,
+        font: "pygame.font.Font" = None,
+    ) -> None:
+        self.x, self.y, self.w, self.h = rect
         super().__init__((self.w, self.h))
+        self.font = font or Settings.FONT
 
         self.dataset_size = 0
-        self.dataset = vizsort.lib.OperationLoggingList()
+        self.dataset = vizsort.lib.OperationLoggingArray(Settings.DATASET_TYPECODE)
         self.container = container
 
         self.column_width = 0
-        self.column_to_hightlight = None
+        self.step_to_highlight: "Step" = None
+
+        # zero-copy view of the dataset for the numpy backend
+        self.dataset_array = None
+
+        # state of the incremental renderer, which draws straight onto the container
+        self.dirty_indices = set()
+        self.needs_full_redraw = True
+        self.rendered_color_scheme = None
+        self.info_rect: pygame.Rect = None
+        # with more elements than pixel columns, the element drawn last (the only one visible) in every pixel column
+        self.visible_indices: List[int] = None
 
         self.sorting = False
-        self.sort_algo: Callable[[MutableSequence["CT"]], None] = None
-        self.sorter: Iterable = None
+        self.sort_algo: Callable[[MutableSequence["CT"]], Iterable["Step"]] = None
+        self.sorter: Iterable["Step"] = None
+        # set while a recorded trace is being replayed in place of the sorter
+        self.replay: vizsort.lib.TraceReplay = None
+        # set while the sort is being run by a background thread
+        self.producer: vizsort.lib.StepProducer = None
+        self.scheduler = scheduler or vizsort.lib.StepScheduler(
+            fps=Settings.FPS, time_budget=Settings.STEP_TIME_BUDGET, steps_per_frame=Settings.STEPS_PER_FRAME
+        )
 
         self.message = None
         self.info = None
+        # which algorithm auto_sort went with & why, shown along with the operation info
+        self.strategy: str = None
 
         self.message = Settings.MESSAGE_SELECT_DATASET_SIZE
 
@@ -235,41 +228,202 @@ class SortingDisplayer(pygame.Surface):
             self.message = Settings.MESSAGE_SELECT_SORTING_ALGORITHM
             return
 
-        self.sorter = self.sort_algo(self.dataset)
+        self.strategy = None
+        if self.sort_algo is vizsort.lib.auto_sort:
+            self.strategy = vizsort.lib.choose_algorithm(self.dataset.tolist()).describe()
+
+        if Settings.BACKGROUND_PRODUCER:
+            self.producer = vizsort.lib.StepProducer(self.sort_algo, self.dataset).start()
+            self.sorter = self.producer
+        else:
+            self.sorter = iter(self.sort_algo(self.dataset))
+        self.scheduler.reset()
         self.message = None
         self.sorting = True
 
-    def sort(self) -> None:
-        try:
-            self.column_to_hightlight = next(self.sorter)
-            self.info = f"array reads: {self.dataset.num_array_reads} | array writes: {self.dataset.num_array_write}"
+        self.dirty_indices.clear()
+        self.needs_full_redraw = True
+        self.info_rect = None
 
-        except StopIteration:
+    def sort(self) -> None:
+        # only the steps the producer has already handed over are taken, so that the frame never waits on it
+        limit = None if self.producer is None else self.producer.available()
+        steps = self.scheduler.advance(self.sorter, limit=limit)
+        self.apply_steps(steps, exhausted=self.scheduler.exhausted)
+
+    def apply_steps(self, steps: List["Step"], exhausted: bool) -> None:
+        """takes note of the steps the sorter was advanced by, for them to be counted & rendered"""
+        if steps:
+            self.step_to_highlight = steps[-1]
+        self.dataset.count_steps(steps)
+
+        SWAP, WRITE = vizsort.lib.SWAP, vizsort.lib.WRITE
+        dirty_indices = self.dirty_indices
+        for step in steps:
+            if step.op == SWAP:
+                dirty_indices.add(step.i)
+                dirty_indices.add(step.j)
+            elif step.op == WRITE:
+                dirty_indices.add(step.i)
+
+        self.info = self.get_sorting_info()
+
+        if exhausted:
             self.message = Settings.MESSAGE_SORTING_DONE
-            self.info = f"array reads: {self.dataset.num_array_reads} | array writes: {self.dataset.num_array_write}"
+            self.info = self.get_operation_info()
+
+            if self.replay is not None:
+                self.replay.close()
+                self.replay = None
+            self.producer = None
 
             self.dataset.reset()
-            self.column_to_hightlight = None
+            self.step_to_highlight = None
             self.sorting = False
 
+    def record(self) -> None:
+        """records the trace of the selected sorting algorithm on (a copy of) the dataset, for it to be replayed later"""
+        if self.dataset_size == 0:
+            return
+
+        elif self.sort_algo is None:
+            self.message = Settings.MESSAGE_SELECT_SORTING_ALGORITHM
+            return
+
+        vizsort.lib.record_trace(self.sort_algo, self.dataset.tolist(), Settings.TRACE_PATH)
+        self.message = Settings.MESSAGE_TRACE_RECORDED
+
+    def start_replay(self) -> None:
+        if not os.path.exists(Settings.TRACE_PATH):
+            self.message = Settings.MESSAGE_NO_TRACE
+            return
+
+        self.replay = vizsort.lib.TraceReplay(Settings.TRACE_PATH)
+        self.strategy = None
+
+        # the dataset takes the size & the starting state of the recorded one
+        self.dataset_array = None
+        if self.replay.size != self.dataset_size:
+            self.dataset_size = self.replay.size
+            self.dataset.regenerate(self.dataset_size)
+            self.column_width = self.w / self.dataset_size
+        self.replay.arr = self.dataset
+        self.replay.rewind()
+
+        self.sorter = self.replay
+        self.scheduler.reset()
+        self.message = None
+        self.sorting = True
+
+        self.dirty_indices.clear()
+        self.needs_full_redraw = True
+        self.info_rect = None
+
+    def seek_replay(self, step: int) -> None:
+        self.replay.seek(step)
+        self.step_to_highlight = None
+        self.needs_full_redraw = True
+
+    def get_sorting_info(self) -> str:
+        info = (
+            f"{self.get_operation_info()}"
+            f" | {self.scheduler.last_step_count} steps/frame{'' if self.scheduler.adaptive else ' (fixed)'}"
+        )
+        if self.replay is not None:
+            info += f" | replay: {self.replay.position}/{len(self.replay)}"
+        return info
+
+    def get_operation_info(self) -> str:
+        info = (
+            f"reads: {self.dataset.num_array_reads} | writes: {self.dataset.num_array_write}"
+            f" | comparisons: {self.dataset.num_comparisons} | swaps: {self.dataset.num_swaps}"
+        )
+        if self.strategy is not None:
+            info += f" | auto sort: {self.strategy}"
+        return info
+
     def generate_data(self, n: int) -> None:
         self.message = (
             Settings.MESSAGE_SELECT_SORTING_ALGORITHM if self.sort_algo is None else Settings.MESSAGE_PROMPT_TO_START
         )
 
+        # the dataset can't be resized while it's being viewed
+        self.dataset_array = None
         if n == self.dataset_size:
-            random.shuffle(self.dataset)
+            self.dataset.shuffle()
             return
 
         self.dataset_size = n
-        self.dataset.clear()
-        self.dataset.extend(list(range(1, n + 1)))
-        random.shuffle(self.dataset)
+        self.dataset.regenerate(n)
 
         self.column_width = self.w / self.dataset_size
 
-    def render(self) -> None:
+    def load_dataset(self, values: Iterable[int]) -> None:
+        """replaces the dataset with a copy of the given values, i.e to start several displayers off the same dataset"""
+        self.dataset_array = None
+        self.dataset.load(values)
+        self.dataset.reset()
+
+        self.dataset_size = len(self.dataset)
+        self.column_width = self.w / self.dataset_size
+        self.needs_full_redraw = True
+
+    def render(self) -> Optional[List[pygame.Rect]]:
+        """
+        renders the dataset onto the container
+
+        returns the rects of the container that were changed if only part of it was redrawn,
+        or None if the whole container has to be updated
+        """
+        # while sorting, only the columns that changed get redrawn, whichever backend draws the full frames
+        if Settings.INCREMENTAL_RENDER and self.sorting:
+            return self.render_incremental()
+
+        if Settings.RENDER_BACKEND == "numpy" and self.dataset_size != 0:
+            self.render_vectorized()
+        else:
+            self.render_full()
+        return None
+
+    def render_vectorized(self) -> None:
+        # the view shares its memory with the dataset, so it never has to be synced
+        if self.dataset_array is None:
+            self.dataset_array = self.dataset.view()
+
+        self.dirty_indices.clear()
+
+        highlight = () if self.step_to_highlight is None else (self.step_to_highlight.i, self.step_to_highlight.j)
+
+        # writing packed pixels is several times faster than writing each color channel separately
+        if self.container.get_bytesize() == 4:
+            pixels = pygame.surfarray.pixels2d(self.container)
+            shifts = self.container.get_shifts()[:3]
+            alpha_mask = self.container.get_masks()[3]
+        else:
+            pixels = pygame.surfarray.pixels3d(self.container)
+            shifts = None
+            alpha_mask = 0
+
+        vizsort.render.rasterize_columns(
+            pixels,
+            self.dataset_array,
+            max_value=self.dataset_size,
+            background_color=Settings.BACKGROUND_COLOR,
+            start_color=Settings.CURRENT_COLOR_SCHEME[0],
+            end_color=Settings.CURRENT_COLOR_SCHEME[1],
+            highlight=highlight,
+            highlight_color=Settings.CURRENT_COLOR_SCHEME[2],
+            shifts=shifts,
+            alpha_mask=alpha_mask,
+        )
+        # the container stays locked for as long as the pixel array is alive
+        del pixels
+
+        self.render_text()
+
+    def render_full(self) -> None:
         self.fill(Settings.BACKGROUND_COLOR)
+        self.dirty_indices.clear()
 
         ir, ig, ib = Settings.CURRENT_COLOR_SCHEME[0]
         er, eg, eb = Settings.CURRENT_COLOR_SCHEME[1]
@@ -286,17 +440,24 @@ class SortingDisplayer(pygame.Surface):
             pygame.draw.rect(self, color, (x, y, self.column_width, h))
             x += self.column_width
 
-        if self.column_to_hightlight != None:
-            ratio = self.column_to_hightlight / self.dataset_size
+        if self.step_to_highlight != None:
+            for index in (self.step_to_highlight.i, self.step_to_highlight.j):
+                if index is None:
+                    continue
 
-            h = ratio * self.h
-            y = self.h - h
+                ratio = self.dataset.peek(index) / self.dataset_size
 
-            x = self.dataset.index(self.column_to_hightlight) * self.column_width
-            pygame.draw.rect(self, Settings.CURRENT_COLOR_SCHEME[2], (x, y, self.column_width, h))
+                h = ratio * self.h
+                y = self.h - h
 
-        pygame.transform.scale(self, Settings.SCREEN_RECT_SIZE, self.container)
+                x = index * self.column_width
+                pygame.draw.rect(self, Settings.CURRENT_COLOR_SCHEME[2], (x, y, self.column_width, h))
 
+        pygame.transform.scale(self, self.container.get_size(), self.container)
+
+        self.render_text()
+
+    def render_text(self) -> None:
         if self.message:
             render_bordered_text(
                 surface=self.container,
@@ -305,6 +466,7 @@ class SortingDisplayer(pygame.Surface):
                 font_color=Settings.FONT_DEFAULT_COLOR,
                 bg_color=Settings.FONT_BACKGROUND_COLOR,
                 border_color=Settings.FONT_DEFAULT_COLOR,
+                font=self.font,
             )
         if self.info:
             render_bordered_text(
@@ -314,7 +476,122 @@ class SortingDisplayer(pygame.Surface):
                 font_color=Settings.FONT_DEFAULT_COLOR,
                 bg_color=Settings.FONT_BACKGROUND_COLOR,
                 border_color=Settings.FONT_DEFAULT_COLOR,
+                font=self.font,
+            )
+
+    def draw_column(self, index: int, color: Tuple[int, int, int] = None) -> pygame.Rect:
+        """draws a single column straight onto the container, returning the area it covers"""
+        return self.draw_columns((index,), color)[0]
+
+    def draw_columns(self, indices: Iterable[int], color: Tuple[int, int, int] = None) -> List[pygame.Rect]:
+        # every lookup is hoisted out of the loop, which runs for thousands of columns per frame in a race
+        container_w, container_h = self.container.get_size()
+        column_width = container_w / self.dataset_size
+        max_value = self.dataset_size
+
+        fill = self.container.fill
+        peek = self.dataset.peek
+        background_color = Settings.BACKGROUND_COLOR
+        ir, ig, ib = Settings.CURRENT_COLOR_SCHEME[0]
+        er, eg, eb = Settings.CURRENT_COLOR_SCHEME[1]
+        dr, dg, db = er - ir, eg - ig, eb - ib
+
+        column_rects = []
+        for index in indices:
+            x = int(index * column_width)
+            w = max(int((index + 1) * column_width) - x, 1)
+
+            ratio = peek(index) / max_value
+            h = int(ratio * container_h)
+
+            # only the part above the column needs clearing
+            fill(background_color, (x, 0, w, container_h - h))
+            fill(
+                color or (int(ratio * dr) + ir, int(ratio * dg) + ig, int(ratio * db) + ib), (x, container_h - h, w, h)
             )
+            column_rects.append(pygame.Rect(x, 0, w, container_h))
+
+        return column_rects
+
+    def render_incremental(self) -> List[pygame.Rect]:
+        container_rect = self.container.get_rect()
+        container_w = container_rect.w
+
+        if self.needs_full_redraw or self.rendered_color_scheme is not Settings.CURRENT_COLOR_SCHEME:
+            self.container.fill(Settings.BACKGROUND_COLOR)
+            self.draw_columns(range(self.dataset_size))
+
+            self.visible_indices = None
+            if self.dataset_size > container_w:
+                column_width = container_w / self.dataset_size
+                self.visible_indices = [0] * container_w
+                for index in range(self.dataset_size):
+                    self.visible_indices[int(index * column_width)] = index
+
+            self.needs_full_redraw = False
+            self.rendered_color_scheme = Settings.CURRENT_COLOR_SCHEME
+            self.dirty_indices.clear()
+            self.info_rect = None
+
+            dirty_rects = [container_rect]
+
+        else:
+            dirty_rects = []
+
+            # restoring the columns hidden behind the previous frame's info
+            if self.info_rect is not None:
+                self.container.fill(Settings.BACKGROUND_COLOR, self.info_rect)
+                self.container.set_clip(self.info_rect)
+
+                if self.visible_indices is not None:
+                    hidden_indices = self.visible_indices[self.info_rect.left : self.info_rect.right]
+                else:
+                    first = int(self.info_rect.left * self.dataset_size / container_w)
+                    last = min(-(-self.info_rect.right * self.dataset_size // container_w), self.dataset_size - 1)
+                    hidden_indices = range(first, last + 1)
+
+                # only the columns tall enough to reach into the info need redrawing, the rest of it is background
+                peek = self.dataset.peek
+                min_value = (container_rect.h - self.info_rect.bottom) * self.dataset_size / container_rect.h
+                self.draw_columns([index for index in hidden_indices if peek(index) >= min_value])
+
+                self.container.set_clip(None)
+                dirty_rects.append(self.info_rect)
+
+            dirty_indices = self.dirty_indices
+            # redrawing a pixel column once is enough, and only with the element that's visible in it
+            if self.visible_indices is not None:
+                column_width = container_w / self.dataset_size
+                dirty_indices = {self.visible_indices[int(index * column_width)] for index in dirty_indices}
+
+            dirty_rects.extend(self.draw_columns(dirty_indices))
+            self.dirty_indices.clear()
+
+        if self.step_to_highlight != None:
+            for index in (self.step_to_highlight.i, self.step_to_highlight.j):
+                if index is None:
+                    continue
+
+                dirty_rects.append(self.draw_column(index, Settings.CURRENT_COLOR_SCHEME[2]))
+                # the highlight has to be undone on the next frame
+                self.dirty_indices.add(index)
+
+        if self.info:
+            self.info_rect = render_bordered_text(
+                surface=self.container,
+                text=self.info,
+                pos=Settings.SORTING_INFO_POSITION,
+                font_color=Settings.FONT_DEFAULT_COLOR,
+                bg_color=Settings.FONT_BACKGROUND_COLOR,
+                border_color=Settings.FONT_DEFAULT_COLOR,
+                font=self.font,
+            )
+            dirty_rects.append(self.info_rect)
+
+        if len(dirty_rects) > Settings.MAX_DIRTY_RECTS:
+            return [dirty_rects[0].unionall(dirty_rects[1:])]
+
+        return dirty_rects
 
     def set_sort_algo(self, sort_algo: Callable) -> None:
         self.sort_algo = sort_algo
@@ -322,22 +599,295 @@ class SortingDisplayer(pygame.Surface):
             self.message = Settings.MESSAGE_PROMPT_TO_START
 
     def handle_event(self, event: pygame.event.Event) -> None:
-        if event.key != pygame.K_RETURN:
+        if event.key == pygame.K_UP:
+            self.scheduler.speed_up()
             return
 
-        if self.sorting:
-            vizsort.lib.exhaust(self.sorter)
+        elif event.key == pygame.K_DOWN:
+            self.scheduler.slow_down()
+            return
+
+        elif event.key == pygame.K_a:
+            self.scheduler.set_adaptive()
+            return
+
+        elif event.key == pygame.K_i:
+            Settings.INCREMENTAL_RENDER = not Settings.INCREMENTAL_RENDER
+            self.needs_full_redraw = True
+            return
+
+        elif event.key == pygame.K_v and vizsort.render.np is not None:
+            Settings.RENDER_BACKEND = "pygame" if Settings.RENDER_BACKEND == "numpy" else "numpy"
+            self.needs_full_redraw = True
+            self.dataset_array = None
+            return
+
+        elif event.key == pygame.K_w and not self.sorting:
+            Settings.BACKGROUND_PRODUCER = not Settings.BACKGROUND_PRODUCER
+            return
+
+        elif event.key == pygame.K_t and not self.sorting:
+            self.record()
+            return
+
+        elif event.key == pygame.K_p and not self.sorting:
+            self.start_replay()
+            return
+
+        elif event.key in (pygame.K_LEFT, pygame.K_RIGHT, pygame.K_HOME) and self.replay is not None:
+            seek_distance = int(len(self.replay) * Settings.TRACE_SEEK_FRACTION)
+            if event.key == pygame.K_HOME:
+                self.seek_replay(0)
+            elif event.key == pygame.K_LEFT:
+                self.seek_replay(self.replay.position - seek_distance)
+            else:
+                self.seek_replay(self.replay.position + seek_distance)
+            return
+
+        elif event.key != pygame.K_RETURN:
+            return
+
+        if self.sorting and self.producer is not None:
+            self.producer.fast_forward()
+            return
+
+        elif self.sorting:
+            self.dataset.run(self.sorter)
             return
 
         self.start()
 
-    def update(self, new_sorting_func: Callable[[MutableSequence["CT"]], None], new_dataset_size: int) -> None:
+    def update(self, new_algorithm: "vizsort.lib.AlgorithmInfo", new_dataset_size: int) -> None:
         if self.sorting:
             self.sort()
             return
 
-        if new_sorting_func != None and new_sorting_func != self.sort_algo:
-            self.set_sort_algo(new_sorting_func)
+        if new_algorithm != None:
+            self.set_sort_algo(new_algorithm.load())
+        if new_dataset_size != None:
+            self.generate_data(new_dataset_size)
+
+
+class RaceViewport(SortingDisplayer):
+    """a displayer taking up part of the screen, labelled with its algorithm & its place in the race once finished"""
+
+    def __init__(
+        self,
+        container: pygame.Surface,
+        algorithm: "vizsort.lib.AlgorithmInfo",
+        scheduler: "vizsort.lib.StepScheduler",
+    ) -> None:
+        w, h = container.get_size()
+        super().__init__(container, rect=(0, 0, w, h), scheduler=scheduler, font=Settings.RACE_FONT)
+
+        self.name = algorithm.name.replace("_", " ").title()
+        self.place: int = None
+        self.set_sort_algo(algorithm.load())
+        self.info = self.name
+
+    def start(self) -> None:
+        self.place = None
+        super().start()
+
+    def get_sorting_info(self) -> str:
+        # the steps per frame are the same for every viewport, so only the counters are shown
+        return self.get_operation_info()
+
+    def get_operation_info(self) -> str:
+        place = "" if self.place is None else f"#{self.place} "
+        return f"{place}{self.name} | reads: {self.dataset.num_array_reads} | writes: {self.dataset.num_array_write}"
+
+    def render_text(self) -> None:
+        # the messages are shown once for the whole race instead
+        if self.info:
+            render_bordered_text(
+                surface=self.container,
+                text=self.info,
+                pos=Settings.SORTING_INFO_POSITION,
+                font_color=Settings.FONT_DEFAULT_COLOR,
+                bg_color=Settings.FONT_BACKGROUND_COLOR,
+                border_color=Settings.FONT_DEFAULT_COLOR,
+                font=self.font,
+            )
+
+
+class RaceDisplayer:
+    """
+    races several sorting algorithms against each other on copies of the same dataset, each in its own viewport,
+    with a single scheduler splitting every frame between the sorters, so that every sorter takes the same number of
+    steps per frame, and the order they finish in is the order of how many steps they take to sort the dataset
+
+    picking an algorithm from the menu adds it to the race, or takes it out if it's already in it
+
+    """
+
+    def __init__(self, container: pygame.Surface) -> None:
+        self.container = container
+        self.scheduler = vizsort.lib.StepScheduler(
+            fps=Settings.FPS, time_budget=Settings.STEP_TIME_BUDGET, steps_per_frame=Settings.STEPS_PER_FRAME
+        )
+
+        all_algorithms = vizsort.lib.algorithms()
+        self.algorithms: List["vizsort.lib.AlgorithmInfo"] = [all_algorithms[name] for name in Settings.RACE_ALGORITHMS]
+        self.viewports: List[RaceViewport] = []
+
+        # the dataset every viewport starts the race off from
+        self.dataset = array(Settings.DATASET_TYPECODE)
+        self.num_finished = 0
+        # how long the last frame took to render, which the sorters can't have on top of the scheduler's budget
+        self.render_time = 0.0
+
+        self.sorting = False
+        self.message = Settings.MESSAGE_SELECT_DATASET_SIZE
+
+        self.layout()
+
+    def layout(self) -> None:
+        """splits the container into a grid of viewports, one for every algorithm in the race"""
+        columns = math.ceil(math.sqrt(len(self.algorithms)))
+        rows = math.ceil(len(self.algorithms) / columns)
+
+        container_w, container_h = self.container.get_size()
+        padding = Settings.RACE_VIEWPORT_PADDING
+        viewport_w = (container_w - padding * (columns - 1)) // columns
+        viewport_h = (container_h - padding * (rows - 1)) // rows
+
+        self.viewports = []
+        for k, algorithm in enumerate(self.algorithms):
+            row, column = divmod(k, columns)
+            rect = (column * (viewport_w + padding), row * (viewport_h + padding), viewport_w, viewport_h)
+            viewport = RaceViewport(self.container.subsurface(rect), algorithm, self.scheduler)
+            if self.dataset:
+                viewport.load_dataset(self.dataset)
+            self.viewports.append(viewport)
+
+        self.container.fill(Settings.MENU_BACKGROUND_COLOR)
+
+    def start(self) -> None:
+        if not self.dataset:
+            return
+
+        # every race starts off from the same dataset, even if the viewports were sorted by a previous race
+        for viewport in self.viewports:
+            viewport.load_dataset(self.dataset)
+            viewport.start()
+
+        self.scheduler.reset()
+        self.num_finished = 0
+        self.message = None
+        self.sorting = True
+
+    def sort(self) -> None:
+        # with every viewport redrawing the columns its sorter touched, the more steps, the longer the render takes,
+        # so the steps only get what's left of the frame after rendering, to keep the frame rate up
+        frame_time = 1 / Settings.FPS
+        self.scheduler.frame_budget = min(
+            Settings.STEP_TIME_BUDGET * frame_time,
+            max(frame_time - self.render_time * Settings.RACE_RENDER_TIME_MARGIN, Settings.RACE_MIN_STEP_TIME),
+        )
+
+        limits = [None if viewport.producer is None else viewport.producer.available() for viewport in self.viewports]
+        all_steps = self.scheduler.advance_all([viewport.sorter for viewport in self.viewports], limits)
+
+        for k, (viewport, steps) in enumerate(zip(self.viewports, all_steps)):
+            if not viewport.sorting:
+                continue
+
+            finished = k in self.scheduler.finished
+            if finished:
+                self.num_finished += 1
+                viewport.place = self.num_finished
+            viewport.apply_steps(steps, exhausted=finished)
+
+        if self.scheduler.exhausted:
+            self.message = Settings.MESSAGE_SORTING_DONE
+            self.sorting = False
+
+    def generate_data(self, n: int) -> None:
+        self.dataset = array(Settings.DATASET_TYPECODE, range(1, n + 1))
+        random.shuffle(self.dataset)
+        for viewport in self.viewports:
+            viewport.load_dataset(self.dataset)
+
+        self.message = Settings.MESSAGE_PROMPT_TO_START
+
+    def toggle_algorithm(self, algorithm: "vizsort.lib.AlgorithmInfo") -> None:
+        if algorithm in self.algorithms:
+            # there's no race without at least one algorithm in it
+            if len(self.algorithms) > 1:
+                self.algorithms.remove(algorithm)
+        elif len(self.algorithms) < Settings.RACE_MAX_SORTERS:
+            self.algorithms.append(algorithm)
+
+        self.layout()
+
+    def render(self) -> Optional[List[pygame.Rect]]:
+        """renders every viewport, returning the rects of the container that were changed like SortingDisplayer does"""
+        start_time = perf_counter()
+        dirty_rects = []
+        full_redraw = False
+
+        for viewport in self.viewports:
+            viewport_rects = viewport.render()
+            if viewport_rects is None:
+                full_redraw = True
+                continue
+
+            # the rects are relative to the viewport
+            offset = viewport.container.get_offset()
+            dirty_rects.extend(rect.move(offset) for rect in viewport_rects)
+
+        if self.message:
+            render_bordered_text(
+                surface=self.container,
+                text=self.message,
+                pos=Settings.MESSAGE_POSITION,
+                font_color=Settings.FONT_DEFAULT_COLOR,
+                bg_color=Settings.FONT_BACKGROUND_COLOR,
+                border_color=Settings.FONT_DEFAULT_COLOR,
+            )
+            full_redraw = True
+
+        self.render_time = perf_counter() - start_time
+        if full_redraw:
+            return None
+        if len(dirty_rects) > Settings.MAX_DIRTY_RECTS:
+            return [dirty_rects[0].unionall(dirty_rects[1:])]
+        return dirty_rects
+
+    def handle_event(self, event: pygame.event.Event) -> None:
+        if event.key == pygame.K_UP:
+            self.scheduler.speed_up()
+
+        elif event.key == pygame.K_DOWN:
+            self.scheduler.slow_down()
+
+        elif event.key == pygame.K_a:
+            self.scheduler.set_adaptive()
+
+        elif event.key in (pygame.K_i, pygame.K_v):
+            # the viewports share the render settings, so any one of them can toggle them
+            self.viewports[0].handle_event(event)
+            for viewport in self.viewports:
+                viewport.needs_full_redraw = True
+                viewport.dataset_array = None
+
+        elif event.key == pygame.K_RETURN and self.sorting:
+            # finishing the sorters that are still going, which the scheduler notices on the next frame
+            for viewport in self.viewports:
+                if viewport.sorting:
+                    viewport.handle_event(event)
+
+        elif event.key == pygame.K_RETURN:
+            self.start()
+
+    def update(self, new_algorithm: "vizsort.lib.AlgorithmInfo", new_dataset_size: int) -> None:
+        if self.sorting:
+            self.sort()
+            return
+
+        if new_algorithm != None:
+            self.toggle_algorithm(new_algorithm)
         if new_dataset_size != None:
             self.generate_data(new_dataset_size)
 
@@ -346,14 +896,14 @@ def main():
     pygame.init()
     pygame.font.init()
     Settings.FONT = pygame.font.SysFont(Settings.FONT_NAME, Settings.FONT_SIZE)
+    Settings.RACE_FONT = pygame.font.SysFont(Settings.FONT_NAME, Settings.RACE_FONT_SIZE)
 
     screen = pygame.display.set_mode(Settings.SCREEN_RECT_SIZE)
     pygame.display.set_caption(Settings.CAPTION)
     screen.fill(Settings.BACKGROUND_COLOR)
 
-    sorting_algorithm_info = [
-        (k.replace("_", " ").title(), v) for k, v in vizsort.lib.__dict__.items() if k.endswith("_sort") and callable(v)
-    ]
+    # the menu hands out the info of the algorithms, which only get imported once they're picked
+    sorting_algorithm_info = [(name.replace("_", " ").title(), info) for name, info in vizsort.lib.algorithms().items()]
 
     sorting_algorithm_names, sorting_algorithms = map(list, zip(*sorting_algorithm_info))
     algo_menu = Menu(
@@ -375,7 +925,9 @@ def main():
         container=screen,
     )
 
-    displayer = SortingDisplayer(container=screen)
+    # the single sort & the race each keep their own state, so switching between them picks up where it was left off
+    displayers = {False: SortingDisplayer(container=screen), True: RaceDisplayer(container=screen)}
+    displayer = displayers[Settings.RACE_MODE]
 
     running = True
     clock = pygame.time.Clock()
@@ -400,6 +952,11 @@ def main():
                     Settings.CURRENT_COLOR_SCHEME = Settings.COLOR_SCHEME_G
                 elif event.key == pygame.K_b:
                     Settings.CURRENT_COLOR_SCHEME = Settings.COLOR_SCHEME_B
+                elif event.key == pygame.K_m and not displayer.sorting:
+                    Settings.RACE_MODE = not Settings.RACE_MODE
+                    displayer = displayers[Settings.RACE_MODE]
+                    # the gaps between the viewports of the race are left in the menu's color
+                    screen.fill(Settings.MENU_BACKGROUND_COLOR if Settings.RACE_MODE else Settings.BACKGROUND_COLOR)
 
         new_sorting_algo = new_dataset_size = None
         if not displayer.sorting:
@@ -407,12 +964,15 @@ def main():
             new_dataset_size = size_menu.update(mouse_pos, clicked=clicked)
         displayer.update(new_sorting_algo, new_dataset_size)
 
-        displayer.render()
+        dirty_rects = displayer.render()
         if not displayer.sorting:
             size_menu.render()
             algo_menu.render()
 
-        pygame.display.flip()
+        if dirty_rects is None:
+            pygame.display.flip()
+        else:
+            pygame.display.update(dirty_rects)
 
     pygame.quit()
 
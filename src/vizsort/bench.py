@@ -0,0 +1,205 @@
+"""
+headless benchmark of every sorting algorithm in vizsort.lib over a grid of dataset sizes & input distributions
+
+usage: python -m vizsort.bench [--algorithms ...] [--sizes ...] [--distributions ...] [--format json|csv] [--output FILE]
+"""
+
+from typing import Callable, Dict, Iterable, List, MutableSequence
+import argparse
+import csv
+import json
+import random
+import sys
+import time
+import tracemalloc
+
+import vizsort.lib
+
+
+def random_data(n: int, rng: random.Random) -> List[int]:
+    data = list(range(n))
+    rng.shuffle(data)
+    return data
+
+
+def sorted_data(n: int, rng: random.Random) -> List[int]:
+    return list(range(n))
+
+
+def reversed_data(n: int, rng: random.Random) -> List[int]:
+    return list(range(n - 1, -1, -1))
+
+
+def few_unique_data(n: int, rng: random.Random) -> List[int]:
+    return [rng.randrange(8) for _ in range(n)]
+
+
+def organ_pipe_data(n: int, rng: random.Random) -> List[int]:
+    # ascending up till the middle, descending afterwards
+    half = n // 2
+    return list(range(half)) + list(range(n - half - 1, -1, -1))
+
+
+def nearly_sorted_data(n: int, rng: random.Random) -> List[int]:
+    # sorted, with 1 in every 20 elements swapped with a random other element
+    data = list(range(n))
+    for _ in range(n // 20):
+        i, j = rng.randrange(n), rng.randrange(n)
+        data[i], data[j] = data[j], data[i]
+    return data
+
+
+DISTRIBUTIONS: Dict[str, Callable[[int, random.Random], List[int]]] = {
+    "random": random_data,
+    "sorted": sorted_data,
+    "reversed": reversed_data,
+    "few_unique": few_unique_data,
+    "organ_pipe": organ_pipe_data,
+    "nearly_sorted": nearly_sorted_data,
+}
+
+DEFAULT_SIZES = (100, 1000)
+
+FIELDS = (
+    "algorithm",
+    "size",
+    "distribution",
+    "time",
+    "fast_time",
+    "reads",
+    "writes",
+    "comparisons",
+    "swaps",
+    "peak_memory",
+    "strategy",
+    "error",
+)
+
+
+def get_algorithms() -> Dict[str, Callable[[MutableSequence], Iterable]]:
+    return {name: info.load() for name, info in vizsort.lib.algorithms().items()}
+
+
+def benchmark(sort_algo: Callable[[MutableSequence], Iterable], data: List[int], repeat: int = 1) -> Dict[str, float]:
+    """
+    runs the sorting algorithm on copies of the data & returns its measurements
+
+    [Process]
+    1. time the algorithm with the counting turned off, keeping the best of the repeats
+    2. do the same for its non-yielding fast path, once it's been run on a throwaway copy,
+       as it only gets compiled the first time it's called
+    3. run it again with the counting turned on to get the number of operations
+    4. run it once more under tracemalloc to get the peak memory allocated, which would skew the timing otherwise
+
+    """
+    expected = sorted(data)
+
+    best_time = float("inf")
+    for _ in range(repeat):
+        arr = vizsort.lib.OperationLoggingList(data)
+        arr.logging = False
+
+        start = time.perf_counter()
+        vizsort.lib.exhaust(sort_algo(arr))
+        best_time = min(best_time, time.perf_counter() - start)
+
+        if arr != expected:
+            raise ValueError(f"{sort_algo.__name__} failed to sort the data")
+
+    sort_algo.fast(data.copy())
+
+    best_fast_time = float("inf")
+    for _ in range(repeat):
+        arr = data.copy()
+
+        start = time.perf_counter()
+        sort_algo.fast(arr)
+        best_fast_time = min(best_fast_time, time.perf_counter() - start)
+
+        if arr != expected:
+            raise ValueError(f"the fast path of {sort_algo.__name__} failed to sort the data")
+
+    arr = vizsort.lib.OperationLoggingList(data)
+    arr.run(sort_algo(arr))
+    result = {"time": best_time, "fast_time": best_fast_time, **arr.stats}
+
+    arr = vizsort.lib.OperationLoggingList(data)
+    arr.logging = False
+    tracemalloc.start()
+    try:
+        vizsort.lib.exhaust(sort_algo(arr))
+        result["peak_memory"] = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+    return result
+
+
+def run(
+    algorithms: Iterable[str],
+    sizes: Iterable[int],
+    distributions: Iterable[str],
+    repeat: int = 1,
+    seed: int = 0,
+) -> List[Dict[str, object]]:
+    all_algorithms = get_algorithms()
+
+    rows = []
+    for size in sizes:
+        for distribution in distributions:
+            # every algorithm gets the same input for a given size & distribution
+            data = DISTRIBUTIONS[distribution](size, random.Random(seed))
+
+            for name in algorithms:
+                row = {"algorithm": name, "size": size, "distribution": distribution}
+                # which algorithm auto_sort went with on the data, and why
+                if all_algorithms[name] is vizsort.lib.auto_sort:
+                    row["strategy"] = vizsort.lib.choose_algorithm(data).describe()
+
+                # a failing algorithm is reported as such instead of bringing down the whole run
+                try:
+                    row.update(benchmark(all_algorithms[name], data, repeat))
+                except (ValueError, RecursionError) as e:
+                    row["error"] = f"{type(e).__name__}: {e}"
+
+                rows.append(row)
+
+    return rows
+
+
+def write_rows(rows: List[Dict[str, object]], fmt: str, file) -> None:
+    if fmt == "json":
+        json.dump(rows, file, indent=2)
+        file.write("\n")
+        return
+
+    writer = csv.DictWriter(file, fieldnames=FIELDS)
+    writer.writeheader()
+    writer.writerows(rows)
+
+
+def main(argv: List[str] = None) -> None:
+    all_algorithms = list(get_algorithms())
+
+    parser = argparse.ArgumentParser(prog="python -m vizsort.bench", description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--algorithms", nargs="+", choices=all_algorithms, default=all_algorithms, metavar="NAME")
+    parser.add_argument("--sizes", nargs="+", type=int, default=DEFAULT_SIZES)
+    parser.add_argument("--distributions", nargs="+", choices=list(DISTRIBUTIONS), default=list(DISTRIBUTIONS))
+    parser.add_argument("--repeat", type=int, default=1, help="number of timed runs, the best one is reported")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--format", choices=("json", "csv"), default="json")
+    parser.add_argument("--output", help="file to write the results to, defaults to stdout")
+    args = parser.parse_args(argv)
+
+    rows = run(args.algorithms, args.sizes, args.distributions, repeat=args.repeat, seed=args.seed)
+
+    if args.output is None:
+        write_rows(rows, args.format, sys.stdout)
+        return
+
+    with open(args.output, "w", newline="") as file:
+        write_rows(rows, args.format, file)
+
+
+if __name__ == "__main__":
+    main()
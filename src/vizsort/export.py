@@ -0,0 +1,277 @@
+"""
+headless export of a sorting algorithm's visualization to an image sequence or a video, without opening a window
+
+usage: python -m vizsort.export ALGORITHM OUTPUT [--size N] [--distribution NAME] [--duration SECONDS] [--fps FPS] ...
+
+OUTPUT is either a directory, which gets filled with numbered .ppm or .png frames,
+or a video file (i.e .mp4, .webm, .gif), which the frames get piped into ffmpeg for
+"""
+
+from typing import Callable, Iterable, Iterator, List, MutableSequence, Sequence, Tuple
+import argparse
+import math
+import os
+import random
+import shutil
+import struct
+import subprocess
+import sys
+import zlib
+
+import vizsort.lib
+import vizsort.render
+from vizsort.bench import DISTRIBUTIONS
+from vizsort.settings import Settings
+
+VIDEO_EXTENSIONS = (".mp4", ".mkv", ".webm", ".avi", ".mov", ".gif")
+IMAGE_FORMATS = ("ppm", "png")
+
+DEFAULT_DURATION = 10
+
+
+class ImageSequenceWriter:
+    """writes every frame into its own numbered image file in the given directory"""
+
+    def __init__(self, directory: str, width: int, height: int, image_format: str = "ppm") -> None:
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.width = width
+        self.height = height
+        self.image_format = image_format
+        self.num_frames = 0
+
+    def write(self, frame: bytes) -> None:
+        path = os.path.join(self.directory, f"frame_{self.num_frames:06d}.{self.image_format}")
+        with open(path, "wb") as file:
+            if self.image_format == "ppm":
+                file.write(b"P6 %d %d 255\n" % (self.width, self.height))
+                file.write(frame)
+            else:
+                file.write(encode_png(frame, self.width, self.height))
+        self.num_frames += 1
+
+    def close(self) -> None:
+        pass
+
+
+class FFmpegWriter:
+    """pipes every frame as raw rgb into an ffmpeg process encoding the video"""
+
+    def __init__(self, path: str, width: int, height: int, fps: int) -> None:
+        # the frames come in as raw rgb through stdin
+        command = ["ffmpeg", "-y", "-loglevel", "error", "-f", "rawvideo", "-pix_fmt", "rgb24"]
+        command += ["-s", f"{width}x{height}", "-r", str(fps), "-i", "-"]
+        if not path.endswith(".gif"):
+            command += ["-pix_fmt", "yuv420p"]
+
+        self.process = subprocess.Popen(command + [path], stdin=subprocess.PIPE)
+        self.num_frames = 0
+
+    def write(self, frame: bytes) -> None:
+        self.process.stdin.write(frame)
+        self.num_frames += 1
+
+    def close(self) -> None:
+        self.process.stdin.close()
+        if self.process.wait() != 0:
+            raise RuntimeError(f"ffmpeg exited with code {self.process.returncode}")
+
+
+def encode_png(frame: bytes, width: int, height: int) -> bytes:
+    # every row starts with its filter type, 0 being no filter
+    stride = width * 3
+    rows = b"".join(b"\x00" + frame[y * stride : (y + 1) * stride] for y in range(height))
+
+    def chunk(kind: bytes, data: bytes) -> bytes:
+        return struct.pack(">I", len(data)) + kind + data + struct.pack(">I", zlib.crc32(kind + data))
+
+    header = struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0)
+    return b"\x89PNG\r\n\x1a\n" + chunk(b"IHDR", header) + chunk(b"IDAT", zlib.compress(rows, 6)) + chunk(b"IEND", b"")
+
+
+class NumpyRasterizer:
+    """renders the columns straight into a numpy buffer with the vectorized rasterizer"""
+
+    def __init__(self, width: int, height: int) -> None:
+        np = vizsort.render.np
+        self.frame = np.empty((height, width, 3), dtype=np.uint8)
+        # the rasterizer indexes its buffer by (x, y), the frame is laid out row by row
+        self.pixels = self.frame.transpose(1, 0, 2)
+
+    def render(self, values: MutableSequence[int], max_value: int, highlight: Sequence[int]) -> bytes:
+        vizsort.render.rasterize_columns(
+            self.pixels,
+            values.view(),
+            max_value=max_value,
+            background_color=Settings.BACKGROUND_COLOR,
+            start_color=Settings.CURRENT_COLOR_SCHEME[0],
+            end_color=Settings.CURRENT_COLOR_SCHEME[1],
+            highlight=highlight,
+            highlight_color=Settings.CURRENT_COLOR_SCHEME[2],
+        )
+        return self.frame.tobytes()
+
+
+class PygameRasterizer:
+    """renders the columns onto an offscreen surface, for when numpy isn't around"""
+
+    def __init__(self, width: int, height: int) -> None:
+        # the frames are rendered offscreen, so there's never a window to open
+        os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+        import pygame
+
+        self.surface = pygame.Surface((width, height))
+
+    def render(self, values: MutableSequence[int], max_value: int, highlight: Sequence[int]) -> bytes:
+        import pygame
+
+        w, h = self.surface.get_size()
+        n = len(values)
+        self.surface.fill(Settings.BACKGROUND_COLOR)
+
+        ir, ig, ib = Settings.CURRENT_COLOR_SCHEME[0]
+        er, eg, eb = Settings.CURRENT_COLOR_SCHEME[1]
+
+        # a column per element, or with more elements than pixel columns, a sampled element per pixel column
+        if n > w:
+            columns = [(x * n // w, x, x + 1) for x in range(w)]
+        else:
+            columns = [(i, i * w // n, (i + 1) * w // n) for i in range(n)]
+        highlight = set(highlight)
+        for index, left, right in columns:
+            ratio = values.peek(index) / max_value
+            if index in highlight:
+                color = Settings.CURRENT_COLOR_SCHEME[2]
+            else:
+                color = (int(ratio * (er - ir)) + ir, int(ratio * (eg - ig)) + ig, int(ratio * (eb - ib)) + ib)
+
+            column_h = int(ratio * h)
+            self.surface.fill(color, (left, h - column_h, right - left, column_h))
+
+        return pygame.image.tostring(self.surface, "RGB")
+
+
+def render_frames(
+    sort_algo: Callable[[MutableSequence[int]], Iterable["vizsort.lib.Step"]],
+    data: List[int],
+    width: int,
+    height: int,
+    steps_per_frame: int,
+    backend: str = None,
+) -> Iterator[bytes]:
+    """
+    yields the frames of the visualization of the sort as raw rgb bytes, row by row
+
+    [Process]
+    1. render the dataset before any step is taken
+
+    2. advance the sorter by steps_per_frame steps, skipping straight over the frames in between,
+       and render the dataset with the last of those steps highlighted, until the sorter is exhausted
+
+    3. render the sorted dataset without any highlight
+
+    """
+    if backend is None:
+        backend = "pygame" if vizsort.render.np is None else "numpy"
+    rasterizer = (NumpyRasterizer if backend == "numpy" else PygameRasterizer)(width, height)
+
+    arr = vizsort.lib.OperationLoggingArray("i", data)
+    arr.logging = False
+    max_value = max(max(data, default=1), 1)
+
+    sorter = iter(sort_algo(arr))
+    scheduler = vizsort.lib.StepScheduler(fps=Settings.FPS, steps_per_frame=steps_per_frame)
+
+    yield rasterizer.render(arr, max_value, ())
+    while not scheduler.exhausted:
+        steps = scheduler.advance(sorter)
+        if steps:
+            yield rasterizer.render(arr, max_value, [i for i in steps[-1][1:] if i is not None])
+
+    yield rasterizer.render(arr, max_value, ())
+
+
+def count_steps(sort_algo: Callable[[MutableSequence[int]], Iterable["vizsort.lib.Step"]], data: List[int]) -> int:
+    return sum(1 for _ in sort_algo(data.copy()))
+
+
+def export(
+    algorithm: str,
+    output: str,
+    size: int = Settings.LARGE_DATASET,
+    distribution: str = "random",
+    fps: int = Settings.FPS,
+    duration: float = DEFAULT_DURATION,
+    steps_per_frame: int = None,
+    resolution: Tuple[int, int] = Settings.SCREEN_RECT_SIZE,
+    image_format: str = "ppm",
+    backend: str = None,
+    seed: int = 0,
+) -> int:
+    """
+    renders the sort of a generated dataset into the output, returning the number of frames written
+
+    without a fixed number of steps per frame, the steps get spread evenly over the given duration,
+    which takes a dry run of the sort to count its steps
+    """
+    sort_algo = vizsort.lib.get_algorithm(algorithm)
+    data = DISTRIBUTIONS[distribution](size, random.Random(seed))
+
+    if steps_per_frame is None:
+        steps_per_frame = max(math.ceil(count_steps(sort_algo, data) / (duration * fps)), 1)
+
+    width, height = resolution
+    if output.lower().endswith(VIDEO_EXTENSIONS):
+        writer = FFmpegWriter(output, width, height, fps)
+    else:
+        writer = ImageSequenceWriter(output, width, height, image_format)
+
+    try:
+        for frame in render_frames(sort_algo, data, width, height, steps_per_frame, backend):
+            writer.write(frame)
+    finally:
+        writer.close()
+
+    return writer.num_frames
+
+
+def main(argv: List[str] = None) -> None:
+    all_algorithms = list(vizsort.lib.algorithms())
+
+    parser = argparse.ArgumentParser(prog="python -m vizsort.export", description=__doc__.strip().splitlines()[0])
+    parser.add_argument("algorithm", choices=all_algorithms, metavar="ALGORITHM")
+    parser.add_argument("output", help="directory for an image sequence, or a video file to be encoded by ffmpeg")
+    parser.add_argument("--size", type=int, default=Settings.LARGE_DATASET)
+    parser.add_argument("--distribution", choices=list(DISTRIBUTIONS), default="random")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--fps", type=int, default=Settings.FPS)
+    parser.add_argument("--duration", type=float, default=DEFAULT_DURATION, help="length of the output in seconds")
+    parser.add_argument("--steps-per-frame", type=int, help="fixed number of steps per frame, overrides --duration")
+    parser.add_argument("--resolution", type=int, nargs=2, default=Settings.SCREEN_RECT_SIZE, metavar=("W", "H"))
+    parser.add_argument("--image-format", choices=IMAGE_FORMATS, default="ppm")
+    parser.add_argument("--backend", choices=("numpy", "pygame"))
+    args = parser.parse_args(argv)
+
+    if args.output.lower().endswith(VIDEO_EXTENSIONS) and shutil.which("ffmpeg") is None:
+        parser.error("exporting a video requires ffmpeg to be on the PATH")
+    if args.backend == "numpy" and vizsort.render.np is None:
+        parser.error("the numpy backend requires numpy to be installed")
+
+    num_frames = export(
+        args.algorithm,
+        args.output,
+        size=args.size,
+        distribution=args.distribution,
+        fps=args.fps,
+        duration=args.duration,
+        steps_per_frame=args.steps_per_frame,
+        resolution=tuple(args.resolution),
+        image_format=args.image_format,
+        backend=args.backend,
+        seed=args.seed,
+    )
+    print(f"wrote {num_frames} frames to {args.output}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,3 +1,57 @@
-from .quadratic_sort import *
-from .logarithmic_sort import *
-from .utils import *
+from importlib import import_module
+
+from .step import *
+from .registry import *
+
+# everything else is only imported from its module once it's first used, so that importing the library stays cheap
+_LAZY_NAMES = {
+    "bubble_sort": ".quadratic_sort",
+    "insertion_sort": ".quadratic_sort",
+    "selection_sort": ".quadratic_sort",
+    "merge_sort": ".logarithmic_sort",
+    "bottom_up_merge_sort": ".logarithmic_sort",
+    "tim_sort": ".logarithmic_sort",
+    "radix_sort": ".logarithmic_sort",
+    "iterative_quick_sort": ".logarithmic_sort",
+    "quick_sort": ".logarithmic_sort",
+    "heap_sort": ".logarithmic_sort",
+    "intro_sort": ".logarithmic_sort",
+    "block_merge_sort": ".logarithmic_sort",
+    "nth_element": ".selection",
+    "partial_sort": ".selection",
+    "top_k": ".selection",
+    "exhaust": ".utils",
+    "StepScheduler": ".utils",
+    "OperationLoggingList": ".utils",
+    "OperationLoggingArray": ".utils",
+    "with_fast_path": ".fast_path",
+    "parallel_sort": ".parallel",
+    "ExternalSorter": ".external",
+    "with_key": ".keyed",
+    "record_trace": ".trace",
+    "TraceReplay": ".trace",
+    "StepProducer": ".producer",
+    "auto_sort": ".adaptive",
+    "choose_algorithm": ".adaptive",
+    "profile_input": ".adaptive",
+    "InputProfile": ".adaptive",
+    "Decision": ".adaptive",
+    "AsyncSorter": ".aio",
+    "run_async": ".aio",
+}
+
+__all__ = step.__all__ + registry.__all__ + list(_LAZY_NAMES)
+
+
+def __getattr__(name: str):
+    module_name = _LAZY_NAMES.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    value = getattr(import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_NAMES))
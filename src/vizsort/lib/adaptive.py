@@ -0,0 +1,194 @@
+from typing import Any, Iterable, List, MutableSequence, NamedTuple, Optional, Tuple
+import math
+import os
+import random
+
+from vizsort.lib._type_hint import CT
+from vizsort.lib.fast_path import with_fast_path
+from vizsort.lib.keyed import with_key
+from vizsort.lib.parallel import _infer_typecode
+from vizsort.lib.registry import get_algorithm
+from vizsort.lib.step import Step
+
+__all__ = ["InputProfile", "Decision", "profile_input", "choose_algorithm", "auto_sort"]
+
+
+# the number of elements, adjacent pairs & random pairs looked at, which keeps the profiling O(1) in the array size
+SAMPLE_SIZE = 128
+
+# below this, insertion sort's lack of overhead beats everything else
+SMALL_INPUT = 32
+# the fraction of inverted pairs below which (or above 1 minus which) the input counts as nearly sorted (or reversed)
+PRESORTED_INVERSIONS = 0.05
+# the average run length above which the input counts as made of a few long runs
+LONG_RUN_LENGTH = 32
+# the fraction of the sampled elements that are duplicates above which partitioning into 3 ways pays off
+MANY_DUPLICATES = 0.5
+# radix sort takes a pass per digit of its base 256, which beats comparing when there are at most 1 in 4 of log2 N
+RADIX_DIGIT_BITS = 8
+RADIX_PASSES_PER_LOG = 0.25
+# from this size on, numeric inputs are worth spreading over the cores
+PARALLEL_INPUT = 1 << 20
+
+
+class InputProfile(NamedTuple):
+    """
+    what a cheap sample of an array reveals about it
+
+    [Fields]
+    size: the number of elements in the array
+    sample_size: the number of elements, adjacent pairs & random pairs sampled
+    runs: the estimated number of ascending runs, from the fraction of sampled adjacent pairs that descend
+    inversions: the fraction of sampled pairs that are out of order, 0 being sorted, 0.5 random & 1 reversed
+    duplicates: the fraction of sampled elements that are equal to another sampled element
+    value_range: the difference between the largest & smallest sampled element, if they're all numbers
+    integers: whether every sampled element is an int
+
+    """
+
+    size: int
+    sample_size: int
+    runs: int
+    inversions: float
+    duplicates: float
+    value_range: Optional[float]
+    integers: bool
+
+
+class Decision(NamedTuple):
+    """the algorithm auto_sort routes an array to, the reasons why & the profile they're based on"""
+
+    algorithm: str
+    reasons: Tuple[str, ...]
+    profile: InputProfile
+
+    def describe(self) -> str:
+        return f"{self.algorithm} ({'; '.join(self.reasons)})"
+
+
+def _duplicate_ratio(values: List[Any]) -> float:
+    try:
+        distinct = len(set(values))
+    except TypeError:
+        # unhashable elements can still be counted by sorting them
+        ordered = sorted(values)
+        distinct = 1 + sum(a != b for a, b in zip(ordered, ordered[1:]))
+    return 1 - distinct / len(values)
+
+
+def profile_input(arr: MutableSequence[CT], sample_size: int = SAMPLE_SIZE) -> InputProfile:
+    """
+    profiles the array from a sample of it, the sample being drawn the same way for arrays of the same size,
+    so that profiling the same array always leads to the same decision
+    """
+    n = len(arr)
+    if n < 2:
+        return InputProfile(n, n, n, 0.0, 0.0, None, all(type(elem) is int for elem in arr))
+
+    rng = random.Random(n)
+    k = min(sample_size, n - 1)
+
+    descents = sum(arr[i] > arr[i + 1] for i in rng.sample(range(n - 1), k))
+    runs = 1 + round(descents / k * (n - 1))
+
+    inversions = 0
+    for _ in range(k):
+        i, j = sorted(rng.sample(range(n), 2))
+        inversions += arr[i] > arr[j]
+
+    values = [arr[i] for i in rng.sample(range(n), min(sample_size, n))]
+    integers = all(type(value) is int for value in values)
+    numeric = all(type(value) in (int, float) for value in values)
+
+    return InputProfile(
+        size=n,
+        sample_size=k,
+        runs=runs,
+        inversions=inversions / k,
+        duplicates=_duplicate_ratio(values),
+        value_range=max(values) - min(values) if numeric else None,
+        integers=integers,
+    )
+
+
+def _parallel_ready(arr: MutableSequence[CT]) -> bool:
+    # the sample can miss the one element that doesn't fit into the shared memory, e.g an int beyond 64 bits
+    try:
+        _infer_typecode(arr)
+    except TypeError:
+        return False
+    return True
+
+
+def choose_algorithm(arr: MutableSequence[CT], stable: bool = False) -> Decision:
+    """
+    picks the algorithm to sort the array with, from a profile of a sample of it
+
+    [Process]
+    1. small arrays go to insertion sort
+
+    2. nearly sorted or nearly reversed arrays, or arrays made of a few long runs, go to tim sort,
+       which finds those runs instead of re-sorting them
+
+    3. ints spanning a narrow enough range go to radix sort, whose digit passes are then fewer than the comparisons
+       every element would go through otherwise
+
+    4. huge arrays of numbers go to parallel sort, when there's more than a single core to spread them over,
+       and every element (not just the sampled ones) fits into the machine type the workers sort them as
+
+    5. arrays with many duplicates go to intro sort, which partitions them into 3 ways, grouping the duplicates together
+       (or to tim sort, if the sort has to be stable)
+
+    6. everything else goes to intro sort (or to tim sort, if the sort has to be stable)
+
+    """
+    profile = profile_input(arr)
+    n = profile.size
+
+    if n <= SMALL_INPUT:
+        return Decision("insertion_sort", (f"only {n} elements",), profile)
+
+    presorted = min(profile.inversions, 1 - profile.inversions)
+    if presorted <= PRESORTED_INVERSIONS:
+        direction = "reversed" if profile.inversions > 0.5 else "sorted"
+        reasons = (f"nearly {direction}", f"{profile.inversions:.0%} of sampled pairs out of order")
+        return Decision("tim_sort", reasons, profile)
+
+    if n / profile.runs >= LONG_RUN_LENGTH:
+        return Decision("tim_sort", (f"~{profile.runs} runs of ~{n // profile.runs} elements",), profile)
+
+    if profile.integers:
+        passes = max(math.ceil(int(profile.value_range).bit_length() / RADIX_DIGIT_BITS), 1)
+        if passes <= RADIX_PASSES_PER_LOG * math.log2(n):
+            return Decision(
+                "radix_sort",
+                (
+                    f"ints spanning a range of {profile.value_range}",
+                    f"{passes} digit pass(es) against {math.log2(n):.0f} comparisons",
+                ),
+                profile,
+            )
+
+    if profile.value_range is not None and n >= PARALLEL_INPUT and (os.cpu_count() or 1) > 1 and _parallel_ready(arr):
+        return Decision("parallel_sort", (f"{n} numbers", f"{os.cpu_count()} cores"), profile)
+
+    algorithm = "tim_sort" if stable else "intro_sort"
+    if profile.duplicates >= MANY_DUPLICATES:
+        return Decision(algorithm, (f"{profile.duplicates:.0%} of sampled elements are duplicates",), profile)
+
+    return Decision(
+        algorithm, (f"no exploitable order, {profile.inversions:.0%} of sampled pairs out of order",), profile
+    )
+
+
+@with_key
+@with_fast_path
+def auto_sort(arr: MutableSequence[CT], stable: bool = False) -> Iterable[Step]:
+    """
+    sorts the given array in place with whichever algorithm fits it best, as chosen by choose_algorithm,
+    which can be called on the array beforehand to find out which algorithm that'll be & why
+
+    [Time Complexity]: that of the chosen algorithm, plus a sample of constant size
+
+    """
+    return (yield from get_algorithm(choose_algorithm(arr, stable).algorithm)(arr))
@@ -0,0 +1,71 @@
+from itertools import islice
+from typing import Any, Callable, Iterable, List, MutableSequence, Tuple, Union
+import asyncio
+
+from vizsort.lib.step import Step, WRITE
+
+__all__ = ["AsyncSorter", "run_async"]
+
+
+DEFAULT_BATCH_SIZE = 1024
+
+
+class AsyncSorter:
+    """
+    drives a sorting algorithm on an asyncio event loop, as an async iterator of batches of its steps,
+    handing control back to the loop before every batch, so that other tasks keep running while it sorts
+
+    with values, every step comes paired with the value it wrote (None for every other op),
+    which is what it takes to replay the steps onto another copy of the array, the array itself being ahead by a batch
+
+    """
+
+    def __init__(
+        self,
+        sort_algo: Callable[[MutableSequence], Iterable[Step]],
+        arr: MutableSequence,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        values: bool = False,
+    ) -> None:
+        self.arr = arr
+        self.batch_size = batch_size
+        self.values = values
+
+        self.sorter = iter(sort_algo(arr))
+        self.num_steps = 0
+        self.done = False
+
+    def __aiter__(self) -> "AsyncSorter":
+        return self
+
+    async def __anext__(self) -> List[Union[Step, Tuple[Step, Any]]]:
+        if self.done:
+            raise StopAsyncIteration
+
+        await asyncio.sleep(0)
+
+        if self.values:
+            arr = self.arr
+            batch = [(step, arr[step.i] if step.op == WRITE else None) for step in islice(self.sorter, self.batch_size)]
+        else:
+            batch = list(islice(self.sorter, self.batch_size))
+
+        self.num_steps += len(batch)
+        if len(batch) < self.batch_size:
+            self.done = True
+            if not batch:
+                raise StopAsyncIteration
+
+        return batch
+
+
+async def run_async(
+    sort_algo: Callable[[MutableSequence], Iterable[Step]],
+    arr: MutableSequence,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+) -> int:
+    """sorts the array on the running event loop, yielding to the other tasks every batch_size steps"""
+    sorter = AsyncSorter(sort_algo, arr, batch_size)
+    async for _ in sorter:
+        pass
+    return sorter.num_steps
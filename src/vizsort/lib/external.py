@@ -0,0 +1,153 @@
+from array import array
+from heapq import merge
+from itertools import chain, islice
+from tempfile import TemporaryDirectory
+from typing import Callable, Dict, Iterable, Iterator, MutableSequence, Union
+import os
+
+from vizsort.lib.logarithmic_sort import tim_sort
+from vizsort.lib.step import Step
+
+__all__ = ["ExternalSorter"]
+
+
+# the rough cost of holding a single element in memory while sorting it:
+# the list slot, the int/float object itself & the share of the sorting algorithm's auxiliary buffers
+ITEM_MEMORY_COST = 64
+
+Source = Union[str, os.PathLike, Iterable]
+
+
+class ExternalSorter:
+    """
+    sorts streams of ints or floats that are too large to be held in memory at once
+
+    [Process]
+    1. read the input in chunks that fit into the memory budget, sort each chunk with the fast path of sort_algo
+       and spill it to a temporary file as a run of raw machine values (see the array module for the typecodes)
+
+    2. while there are more runs than the fan-in, merge them in groups of fan-in runs into longer runs
+
+    3. stream out the heap based k-way merge of the remaining runs
+
+    an input that fits into a single chunk is never written to disk
+
+    [Counters]
+    runs_written: the number of sorted runs spilled to disk, including the ones written by intermediate merges
+    merge_passes: the number of intermediate merge passes made over the runs
+    bytes_read & bytes_written: the amount of I/O done on the input, output & temporary files
+    items: the number of elements sorted
+
+    """
+
+    def __init__(
+        self,
+        typecode: str = "q",
+        memory_budget: int = 64 * 1024 * 1024,
+        fan_in: int = 16,
+        sort_algo: Callable[[MutableSequence], Iterable[Step]] = tim_sort,
+        tmp_dir: str = None,
+    ) -> None:
+        if fan_in < 2:
+            raise ValueError(f"fan_in must be at least 2, got {fan_in}")
+
+        self.typecode = typecode
+        self.itemsize = array(typecode).itemsize
+        self.memory_budget = memory_budget
+        self.fan_in = fan_in
+        self.sort_algo = sort_algo
+        self.tmp_dir = tmp_dir
+
+        self.chunk_size = max(memory_budget // ITEM_MEMORY_COST, 1)
+        # while merging, the budget gets shared between the buffers of the runs & the output
+        self.buffer_size = max(memory_budget // (ITEM_MEMORY_COST * (fan_in + 1)), 1)
+
+        self.reset()
+
+    @property
+    def stats(self) -> Dict[str, int]:
+        return {
+            "runs_written": self.runs_written,
+            "merge_passes": self.merge_passes,
+            "bytes_read": self.bytes_read,
+            "bytes_written": self.bytes_written,
+            "items": self.items,
+        }
+
+    def reset(self) -> None:
+        self.runs_written = 0
+        self.merge_passes = 0
+        self.bytes_read = 0
+        self.bytes_written = 0
+        self.items = 0
+
+    def sort(self, source: Source) -> Iterator:
+        """
+        lazily yields the elements of the source in sorted order,
+        the source being either an iterable of elements or the path to a file of raw values of the sorter's typecode
+        """
+        if isinstance(source, (str, os.PathLike)):
+            source = self.read(source)
+        source = iter(source)
+
+        chunk = list(islice(source, self.chunk_size))
+        lookahead = list(islice(source, 1))
+
+        # nothing to spill when everything fits in memory
+        if not lookahead:
+            self.items += len(chunk)
+            self.sort_algo.fast(chunk)
+            yield from chunk
+            return
+
+        source = chain(lookahead, source)
+        with TemporaryDirectory(prefix="vizsort-", dir=self.tmp_dir) as tmp_dir:
+            runs = []
+            while chunk:
+                self.items += len(chunk)
+                self.sort_algo.fast(chunk)
+                runs.append(self._write_run(tmp_dir, len(runs), chunk))
+
+                # dropping the sorted chunk before reading the next one keeps a single chunk in memory at a time
+                chunk = None
+                chunk = list(islice(source, self.chunk_size))
+
+            while len(runs) > self.fan_in:
+                self.merge_passes += 1
+                merged_runs = []
+                for k in range(0, len(runs), self.fan_in):
+                    group = runs[k : k + self.fan_in]
+                    merged = merge(*(self.read(run) for run in group))
+                    merged_runs.append(self._write_run(tmp_dir, f"{self.merge_passes}-{k}", merged))
+                    for run in group:
+                        os.remove(run)
+                runs = merged_runs
+
+            yield from merge(*(self.read(run) for run in runs))
+
+    def sort_file(self, source: Source, output: Union[str, os.PathLike]) -> Dict[str, int]:
+        """sorts the source into a file of raw values of the sorter's typecode, returning the I/O statistics"""
+        with open(output, "wb") as file:
+            self._write(file, self.sort(source))
+        return self.stats
+
+    def read(self, path: Union[str, os.PathLike]) -> Iterator:
+        """lazily yields the values stored in a file of raw values of the sorter's typecode"""
+        buffer_bytes = self.buffer_size * self.itemsize
+        with open(path, "rb") as file:
+            while data := file.read(buffer_bytes):
+                self.bytes_read += len(data)
+                yield from array(self.typecode, data)
+
+    def _write_run(self, tmp_dir: str, name: Union[int, str], elements: Iterable) -> str:
+        path = os.path.join(tmp_dir, f"{name}.run")
+        with open(path, "wb") as file:
+            self._write(file, elements)
+        self.runs_written += 1
+        return path
+
+    def _write(self, file, elements: Iterable) -> None:
+        elements = iter(elements)
+        while buffer := array(self.typecode, islice(elements, self.buffer_size)):
+            buffer.tofile(file)
+            self.bytes_written += len(buffer) * self.itemsize
@@ -0,0 +1,148 @@
+import ast
+import inspect
+import textwrap
+from typing import Any, Callable, Iterator
+
+__all__ = ["with_fast_path"]
+
+
+def with_fast_path(sort_algo: Callable[..., Iterator]) -> Callable[..., Iterator]:
+    """
+    gives a sorting algorithm a non-yielding twin, reachable as `sort_algo.fast`,
+    for when the array just needs to be sorted and nobody is watching the steps
+
+    [Process]
+    1. parse the source of the sorting algorithm
+
+    2. strip out every `yield` statement, and turn every `yield from f(...)` into a plain call to the fast twin of f,
+       the nested helper generators are stripped as well so they become plain functions too
+
+    3. compile the result in the module of the original, keeping its line numbers so that tracebacks still make sense
+
+    the compiling is done on the first call, so that importing the library stays cheap
+
+    """
+    sort_algo.fast = _FastPath(sort_algo)
+    return sort_algo
+
+
+class _FastPath:
+    def __init__(self, sort_algo: Callable[..., Iterator]) -> None:
+        self.sort_algo = sort_algo
+        self.compiled: Callable = None
+
+        self.__name__ = sort_algo.__name__
+        self.__qualname__ = f"{sort_algo.__qualname__}.fast"
+        self.__doc__ = sort_algo.__doc__
+
+    def __call__(self, *args: Any, **kwargs: Any) -> Any:
+        if self.compiled is None:
+            self.compiled = _compile_fast_path(self.sort_algo)
+        return self.compiled(*args, **kwargs)
+
+    def __repr__(self) -> str:
+        return f"<fast path of {self.sort_algo.__qualname__}>"
+
+
+def _fast_call(func: Callable) -> Callable:
+    fast = getattr(func, "fast", None)
+    if fast is not None:
+        return fast
+
+    if inspect.isgeneratorfunction(func):
+        return lambda *args, **kwargs: _drain(func(*args, **kwargs))
+
+    # the nested helpers that have already been stripped
+    return func
+
+
+def _drain(generator: Iterator) -> Any:
+    # unlike exhaust, keeps the return value the same way 'yield from' would
+    while True:
+        try:
+            next(generator)
+        except StopIteration as e:
+            return e.value
+
+
+class _StripYields(ast.NodeTransformer):
+    def visit_Expr(self, node: ast.Expr) -> ast.AST:
+        if isinstance(node.value, ast.Yield):
+            return None
+        return self.generic_visit(node)
+
+    def visit_Yield(self, node: ast.Yield) -> ast.AST:
+        raise SyntaxError("only 'yield' statements can be stripped, not 'yield' expressions")
+
+    def visit_YieldFrom(self, node: ast.YieldFrom) -> ast.AST:
+        value = self.visit(node.value)
+
+        if not isinstance(value, ast.Call):
+            return ast.copy_location(
+                ast.Call(func=ast.Name("__drain__", ast.Load()), args=[value], keywords=[]),
+                node,
+            )
+
+        fast_func = ast.Call(func=ast.Name("__fast_call__", ast.Load()), args=[value.func], keywords=[])
+        return ast.copy_location(ast.Call(func=fast_func, args=value.args, keywords=value.keywords), node)
+
+    def visit_If(self, node: ast.If) -> ast.AST:
+        self.generic_visit(node)
+
+        # same goes for checks that only decided whether to yield
+        if not node.body and not node.orelse and isinstance(node.test, ast.Name):
+            return None
+
+        return node
+
+    def visit_For(self, node: ast.For) -> ast.AST:
+        self.generic_visit(node)
+
+        # loops over a range that did nothing besides yielding are dropped entirely
+        iterates_range = (
+            isinstance(node.iter, ast.Call) and isinstance(node.iter.func, ast.Name) and node.iter.func.id == "range"
+        )
+        if not node.body and not node.orelse and iterates_range:
+            return None
+
+        return node
+
+
+def _compile_fast_path(sort_algo: Callable[..., Iterator]) -> Callable:
+    try:
+        source = textwrap.dedent(inspect.getsource(sort_algo))
+        filename = inspect.getsourcefile(sort_algo)
+    except (OSError, TypeError):
+        # without the source, the best that can be done is draining the generator
+        return lambda *args, **kwargs: _drain(sort_algo(*args, **kwargs))
+
+    func_def = ast.parse(source).body[0]
+    func_def.decorator_list = []
+    func_def = _StripYields().visit(func_def)
+
+    # blocks that consisted of nothing but yields still need a body
+    for node in ast.walk(func_def):
+        if getattr(node, "body", None) == []:
+            node.body = [ast.Pass()]
+
+    # wrapped in a factory so that the helpers are closed over instead of being put into the module's globals
+    factory = ast.FunctionDef(
+        name="__make_fast_path__",
+        args=ast.arguments(
+            posonlyargs=[],
+            args=[ast.arg("__fast_call__"), ast.arg("__drain__")],
+            kwonlyargs=[],
+            kw_defaults=[],
+            defaults=[],
+        ),
+        body=[func_def, ast.copy_location(ast.Return(ast.Name(sort_algo.__name__, ast.Load())), func_def)],
+        decorator_list=[],
+    )
+    ast.copy_location(factory, func_def)
+    module = ast.Module(body=[factory], type_ignores=[])
+    ast.increment_lineno(module, sort_algo.__code__.co_firstlineno - 1)
+    ast.fix_missing_locations(module)
+
+    namespace = {}
+    exec(compile(module, filename, "exec"), sort_algo.__globals__, namespace)
+    return namespace["__make_fast_path__"](_fast_call, _drain)
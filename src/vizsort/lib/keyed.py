@@ -0,0 +1,162 @@
+from array import array
+from functools import wraps
+from inspect import signature
+from typing import Any, Callable, Iterable, Iterator, List, MutableSequence, Tuple
+
+from vizsort.lib.step import Step
+
+__all__ = ["with_key"]
+
+
+def with_key(sort_algo: Callable[..., Iterator] = None, *, positional: bool = False) -> Callable[..., Iterator]:
+    """
+    gives a sorting algorithm (and its fast path) the `key` & `reverse` keyword arguments of the builtin sorted
+
+    [Process]
+    1. compute the key of every element in the sorted range once,
+       and decorate it into a (key, tiebreak, element) triple in a mirror of the array
+
+    2. sort the mirror, whose writes are passed on to the array, so the array gets sorted along with it
+
+    [Note]
+    the tiebreak is the element's original index, making every algorithm stable when given a key,
+    and with reverse, the mirror is laid over the sorted range back to front (the steps get mapped accordingly),
+    with the tiebreak negated so that equal elements still keep their original order
+
+    algorithms that are given positions other than the range, e.g the rank of the element to select,
+    are decorated as positional, and get the mirror laid over the range in order with the keys compared the other way
+    around for reverse instead, so that those positions still point to where they would without a key
+
+    whatever the algorithm returns is returned by it (and its fast path) with a key too
+
+    """
+    if sort_algo is None:
+        return lambda sort_algo: with_key(sort_algo, positional=positional)
+
+    params = signature(sort_algo).parameters
+
+    @wraps(sort_algo)
+    def keyed_sort(arr: MutableSequence, *args: Any, key: Callable = None, reverse: bool = False, **kwargs: Any):
+        if key is None and not reverse:
+            return sort_algo(arr, *args, **kwargs)
+        return _sort_keyed(sort_algo, params, arr, args, kwargs, key, reverse, positional)
+
+    def fast_keyed_sort(arr: MutableSequence, *args: Any, key: Callable = None, reverse: bool = False, **kwargs: Any):
+        if key is None and not reverse:
+            return sort_algo.fast(arr, *args, **kwargs)
+
+        lo, hi = _sorted_range(params, arr, args, kwargs)
+        decorated = _decorate(arr, lo, hi, key, reverse, positional)
+        result = sort_algo.fast(decorated, *args, **kwargs)
+
+        elements = [item[2] for item in decorated[lo : hi + 1]]
+        if reverse and not positional:
+            elements.reverse()
+        arr[lo : hi + 1] = array(arr.typecode, elements) if isinstance(arr, array) else elements
+        return result
+
+    keyed_sort.fast = wraps(sort_algo.fast, assigned=("__name__", "__qualname__", "__doc__"))(fast_keyed_sort)
+    return keyed_sort
+
+
+def _sorted_range(params, arr: MutableSequence, args: Tuple, kwargs: dict) -> Tuple[int, int]:
+    # the sorting algorithms without a start & end sort the whole array
+    arguments = dict(zip(list(params)[1:], args), **kwargs)
+    lo = arguments.get("start", 0)
+    hi = arguments.get("end")
+    return lo, len(arr) - 1 if hi is None else hi
+
+
+class _Inverted:
+    # a key that compares the other way around
+    __slots__ = ("key",)
+
+    def __init__(self, key: Any) -> None:
+        self.key = key
+
+    def __eq__(self, other: "_Inverted") -> bool:
+        return self.key == other.key
+
+    def __lt__(self, other: "_Inverted") -> bool:
+        return other.key < self.key
+
+    def __le__(self, other: "_Inverted") -> bool:
+        return other.key <= self.key
+
+    def __gt__(self, other: "_Inverted") -> bool:
+        return self.key < other.key
+
+    def __ge__(self, other: "_Inverted") -> bool:
+        return self.key <= other.key
+
+
+def _decorate(arr: MutableSequence, lo: int, hi: int, key: Callable, reverse: bool, positional: bool = False) -> List:
+    decorated = [None] * len(arr)
+    for i in range(lo, hi + 1):
+        elem = arr[i]
+        k = elem if key is None else key(elem)
+        if positional:
+            decorated[i] = (_Inverted(k) if reverse else k, i, elem)
+        elif reverse:
+            decorated[lo + hi - i] = (k, -i, elem)
+        else:
+            decorated[i] = (k, i, elem)
+    return decorated
+
+
+class _KeyedMirror(list):
+    # the decorated array, passing every read & write on to the element's position in the actual array,
+    # so that an array keeping count of its reads & writes still counts those of the sort
+
+    def __init__(self, decorated: List, arr: MutableSequence, lo: int, hi: int, reverse: bool) -> None:
+        super().__init__(decorated)
+        self.arr = arr
+        self.lo = lo
+        self.hi = hi
+        self.reverse = reverse
+
+    def position(self, i: int) -> int:
+        if self.reverse and self.lo <= i <= self.hi:
+            return self.lo + self.hi - i
+        return i
+
+    def __getitem__(self, i):
+        # a slice is a single read, like it is on the array, whichever elements it covers
+        self.arr[i if isinstance(i, slice) else self.position(i)]
+        return list.__getitem__(self, i)
+
+    def __setitem__(self, i, item) -> None:
+        list.__setitem__(self, i, item)
+
+        if isinstance(i, slice):
+            for index in range(*i.indices(len(self))):
+                self.arr[self.position(index)] = list.__getitem__(self, index)[2]
+            return
+
+        self.arr[self.position(i)] = item[2]
+
+
+def _sort_keyed(
+    sort_algo: Callable[..., Iterator],
+    params,
+    arr: MutableSequence,
+    args: Tuple,
+    kwargs: dict,
+    key: Callable,
+    reverse: bool,
+    positional: bool = False,
+) -> Iterable[Step]:
+    lo, hi = _sorted_range(params, arr, args, kwargs)
+    mirror = _KeyedMirror(_decorate(arr, lo, hi, key, reverse, positional), arr, lo, hi, reverse and not positional)
+
+    if not mirror.reverse:
+        return (yield from sort_algo(mirror, *args, **kwargs))
+
+    position = mirror.position
+    steps = iter(sort_algo(mirror, *args, **kwargs))
+    while True:
+        try:
+            op, i, j = next(steps)
+        except StopIteration as stop:
+            return stop.value
+        yield Step(op, position(i), None if j is None else position(j))
@@ -1,14 +1,29 @@
-from bisect import insort
 from vizsort.lib._type_hint import CT
-from vizsort.lib.utils import exhaust
-from typing import List, MutableSequence, Tuple
+from vizsort.lib.fast_path import with_fast_path
+from vizsort.lib.keyed import with_key
+from vizsort.lib.quadratic_sort import insertion_sort
+from vizsort.lib.step import Step, READ, COMPARE, SWAP, WRITE
+from typing import Callable, Iterable, List, MutableSequence, Tuple, Union
 from itertools import accumulate
-from operator import lt, gt
-
-__all__ = ["merge_sort", "tim_sort", "radix_sort", "iterative_quick_sort", "quick_sort"]
-
-
-def merge_sort(arr: MutableSequence[CT], start: int = 0, end: int = None) -> None:
+import math
+import struct
+
+__all__ = [
+    "merge_sort",
+    "bottom_up_merge_sort",
+    "tim_sort",
+    "radix_sort",
+    "iterative_quick_sort",
+    "quick_sort",
+    "heap_sort",
+    "intro_sort",
+    "block_merge_sort",
+]
+
+
+@with_key
+@with_fast_path
+def merge_sort(arr: MutableSequence[CT], start: int = 0, end: int = None) -> Iterable[Step]:
     """
     executes merge sort on the given array in place
 
@@ -23,15 +38,17 @@ def merge_sort(arr: MutableSequence[CT], start: int = 0, end: int = None) -> Non
 
     """
 
-    def recursive_merge_sort(start: int, end: int) -> None:
-        if end == start:
+    def recursive_merge_sort(start: int, end: int) -> Iterable[Step]:
+        if end <= start:
             return
 
         # recursively splitting the array into left & right halves
         mid = start + (end - start) // 2
         yield from recursive_merge_sort(start, mid)
         yield from recursive_merge_sort(mid + 1, end)
+        yield from merge(start, mid, end)
 
+    def merge(start: int, mid: int, end: int) -> Iterable[Step]:
         # choosing the left/right array to become the temporary array
         # +1 for the left array's size to avoid it being a 0 when the array is the size of 2, i.e (0, 0, 1) -> (start, mid, end)
         left_size = mid - start + 1
@@ -39,14 +56,19 @@ def merge_sort(arr: MutableSequence[CT], start: int = 0, end: int = None) -> Non
 
         # +1 for mid beacuse everything brekas without doing this
         mid += 1
-        if left_size > right_size:
+        # equal elements have to be taken from the left half first, whichever half ends up in the temporary array
+        temp_is_left = left_size <= right_size
+        if not temp_is_left:
             # i.e (0, 1, 2) -> (start, mid, end)
             # since left size is bigger left arr must be [0, 1] & right arr must be only 2
             # but this is not possible with index slicing unless the end & mid is incremented by 1
             # so the slicing notations ends up being arr[0:2], arr[2:3]
             # ? there's most definitely a better way to go about this, but i'm too tired to care
             temp_arr = arr[mid : end + 1]
-            arr[start + right_size : mid + right_size] = arr[start:mid]
+            # shifting from the back, so that nothing gets overwritten before it's been moved
+            for k in range(mid - 1, start - 1, -1):
+                arr[k + right_size] = arr[k]
+                yield Step(WRITE, k + right_size)
 
             temp_size = right_size
 
@@ -60,204 +82,711 @@ def merge_sort(arr: MutableSequence[CT], start: int = 0, end: int = None) -> Non
             i = mid
             end_index = right_size + i
 
+        # the comparisons name the slot the temporary element was copied out of, as it's no longer in the array
+        temp_start = start if temp_is_left else mid
+
         # copying the elements of splitted-array back into the original array in order
         t, k = 0, start
         while t < temp_size and i < end_index:
             temp_elem = temp_arr[t]
             orig_elem = arr[i]
 
-            if temp_elem < orig_elem:
+            yield Step(COMPARE, temp_start + t, i)
+            if (not orig_elem < temp_elem) if temp_is_left else temp_elem < orig_elem:
                 arr[k] = temp_elem
-                yield temp_elem
                 t += 1
             else:
                 arr[k] = orig_elem
-                yield orig_elem
                 i += 1
+            yield Step(WRITE, k)
             k += 1
 
         while i < end_index:
             arr[k] = arr[i]
+            yield Step(WRITE, k)
             k += 1
             i += 1
 
         while t < temp_size:
             arr[k] = temp_arr[t]
+            yield Step(WRITE, k)
             k += 1
             t += 1
 
-    yield from recursive_merge_sort(0, len(arr) - 1)
+    if end is None:
+        end = len(arr) - 1
+    yield from recursive_merge_sort(start, end)
 
 
-def tim_sort(arr: MutableSequence[CT], merge_size: int = 32) -> None:
-    remainder = 0
+@with_key
+@with_fast_path
+def bottom_up_merge_sort(arr: MutableSequence[CT], start: int = 0, end: int = None) -> Iterable[Step]:
+    """
+    executes an iterative, bottom up merge sort on the given array in place
+
+    [Process]
+    1. allocate a single auxiliary buffer the size of the array, which is the only allocation made
+
+    2. treat every element as a sorted run of width 1, and merge every pair of neighbouring runs
+       from the array into the buffer
+
+    3. double the width & merge the other way around, from the buffer back into the array,
+       the two keep swapping roles until a single run covers the whole array
+
+    4. pairs of runs that are already in order (the last element of the left run is not greater than
+       the first element of the right run) get copied over as they are instead of being merged
+
+    5. if the last pass ended up in the buffer, copy it back into the array
+
+    [Time Complexity]: N log N
+
+    """
+    if end is None:
+        end = len(arr) - 1
+    size = end - start + 1
+    if size < 2:
+        return
+
+    buffer = arr[start : end + 1]
+
+    # the offsets map a position in the range being sorted to an index of the array & of the buffer
+    src, src_offset, dst, dst_offset = arr, start, buffer, 0
+
+    def copy(lo: int, hi: int, src_lo: int) -> Iterable[Step]:
+        # copies src[src_lo : src_lo + hi - lo] into dst[lo:hi], announcing every element that lands in the array
+        if dst is not arr:
+            dst[dst_offset + lo : dst_offset + hi] = src[src_offset + src_lo : src_offset + src_lo + hi - lo]
+            return
+
+        for k in range(lo, hi):
+            arr[start + k] = src[src_offset + src_lo + k - lo]
+            yield Step(WRITE, start + k)
+
+    width = 1
+    while width < size:
+        writes_to_arr = dst is arr
+
+        for lo in range(0, size - width, 2 * width):
+            mid = lo + width
+            hi = min(lo + 2 * width, size)
+
+            yield Step(COMPARE, start + mid, start + mid - 1)
+            if not src[src_offset + mid] < src[src_offset + mid - 1]:
+                yield from copy(lo, hi, lo)
+                continue
+
+            i, j, k = lo, mid, lo
+            left_elem, right_elem = src[src_offset + i], src[src_offset + j]
+            while True:
+                yield Step(COMPARE, start + j, start + i)
+                if right_elem < left_elem:
+                    dst[dst_offset + k] = right_elem
+                    if writes_to_arr:
+                        yield Step(WRITE, start + k)
+                    k += 1
+                    j += 1
+                    if j == hi:
+                        break
+                    right_elem = src[src_offset + j]
+                else:
+                    dst[dst_offset + k] = left_elem
+                    if writes_to_arr:
+                        yield Step(WRITE, start + k)
+                    k += 1
+                    i += 1
+                    if i == mid:
+                        break
+                    left_elem = src[src_offset + i]
+
+            # only one of the runs can have anything left in it
+            yield from copy(k, hi, i if i < mid else j)
+
+        # the trailing run without a partner still has to end up in the destination
+        if (size - 1) // width % 2 == 0:
+            lo = (size - 1) // width * width
+            yield from copy(lo, size, lo)
+
+        src, src_offset, dst, dst_offset = dst, dst_offset, src, src_offset
+        width *= 2
+
+    if src is buffer:
+        for k in range(size):
+            arr[start + k] = buffer[k]
+            yield Step(WRITE, start + k)
+
+
+MIN_GALLOP = 7
+
+
+@with_fast_path
+def _gallop_left(
+    key: CT, key_index: int, a: MutableSequence[CT], base: int, n: int, hint: int, step_offset: int = 0
+) -> Iterable[Step]:
+    """
+    returns k such that a[base + k - 1] < key <= a[base + k], i.e the leftmost position the key could be inserted at,
+    searching exponentially outwards from a[base + hint] before binary searching the narrowed down range
+
+    """
+    ofs, last_ofs = 1, 0
+
+    yield Step(COMPARE, step_offset + base + hint, key_index)
+    if a[base + hint] < key:
+        # gallop to the right until a[base + hint + last_ofs] < key <= a[base + hint + ofs]
+        max_ofs = n - hint
+        while ofs < max_ofs:
+            yield Step(COMPARE, step_offset + base + hint + ofs, key_index)
+            if not a[base + hint + ofs] < key:
+                break
+            last_ofs, ofs = ofs, (ofs << 1) + 1
+
+        ofs = min(ofs, max_ofs)
+        last_ofs, ofs = last_ofs + hint, ofs + hint
+
+    else:
+        # gallop to the left until a[base + hint - ofs] < key <= a[base + hint - last_ofs]
+        max_ofs = hint + 1
+        while ofs < max_ofs:
+            yield Step(COMPARE, step_offset + base + hint - ofs, key_index)
+            if a[base + hint - ofs] < key:
+                break
+            last_ofs, ofs = ofs, (ofs << 1) + 1
+
+        ofs = min(ofs, max_ofs)
+        last_ofs, ofs = hint - ofs, hint - last_ofs
+
+    # a[base + last_ofs] < key <= a[base + ofs], binary search the rest
+    last_ofs += 1
+    while last_ofs < ofs:
+        m = last_ofs + ((ofs - last_ofs) >> 1)
+        yield Step(COMPARE, step_offset + base + m, key_index)
+        if a[base + m] < key:
+            last_ofs = m + 1
+        else:
+            ofs = m
+
+    return ofs
+
+
+@with_fast_path
+def _gallop_right(
+    key: CT, key_index: int, a: MutableSequence[CT], base: int, n: int, hint: int, step_offset: int = 0
+) -> Iterable[Step]:
+    """
+    returns k such that a[base + k - 1] <= key < a[base + k], i.e the rightmost position the key could be inserted at,
+    searching exponentially outwards from a[base + hint] before binary searching the narrowed down range
+
+    """
+    ofs, last_ofs = 1, 0
+
+    yield Step(COMPARE, key_index, step_offset + base + hint)
+    if key < a[base + hint]:
+        # gallop to the left until a[base + hint - ofs] <= key < a[base + hint - last_ofs]
+        max_ofs = hint + 1
+        while ofs < max_ofs:
+            yield Step(COMPARE, key_index, step_offset + base + hint - ofs)
+            if not key < a[base + hint - ofs]:
+                break
+            last_ofs, ofs = ofs, (ofs << 1) + 1
+
+        ofs = min(ofs, max_ofs)
+        last_ofs, ofs = hint - ofs, hint - last_ofs
+
+    else:
+        # gallop to the right until a[base + hint + last_ofs] <= key < a[base + hint + ofs]
+        max_ofs = n - hint
+        while ofs < max_ofs:
+            yield Step(COMPARE, key_index, step_offset + base + hint + ofs)
+            if key < a[base + hint + ofs]:
+                break
+            last_ofs, ofs = ofs, (ofs << 1) + 1
+
+        ofs = min(ofs, max_ofs)
+        last_ofs, ofs = last_ofs + hint, ofs + hint
+
+    # a[base + last_ofs] <= key < a[base + ofs], binary search the rest
+    last_ofs += 1
+    while last_ofs < ofs:
+        m = last_ofs + ((ofs - last_ofs) >> 1)
+        yield Step(COMPARE, key_index, step_offset + base + m)
+        if key < a[base + m]:
+            ofs = m
+        else:
+            last_ofs = m + 1
+
+    return ofs
+
+
+@with_key
+@with_fast_path
+def tim_sort(arr: MutableSequence[CT], merge_size: int = 32) -> Iterable[Step]:
+    """
+    executes tim sort on the given array in place
+
+    [Process]
+    1. find the next natural run in the array, reversing it if it's strictly descending,
+       and extend it to the minimum run size with binary insertion sort if it's too short
+
+    2. push the run onto the run stack, then merge the runs at the top of the stack until the stack satisfies:
+        i. every run is longer than the next run above it
+        ii. every run is longer than the sum of the 2 runs above it
+       which keeps the merges balanced & the stack at log N runs
+
+    3. before merging 2 runs, gallop to find where the first element of the right run belongs in the left run,
+       and where the last element of the left run belongs in the right run, everything outside of that is in place
+
+    4. merge by copying the shorter of the 2 runs into a temporary array,
+       and switch to galloping once one of the runs keeps winning for min_gallop elements in a row,
+       min_gallop gets lowered as long as galloping pays off & raised again when it doesn't
+
+    5. once the whole array has been split into runs, merge everything that's left on the stack
+
+    [Time Complexity]: N log N, close to N for partially sorted arrays
+
+    """
     arr_size = n = len(arr)
+    if arr_size < 2:
+        return
+
+    remainder = 0
     while n >= merge_size:
         # will either be 1 or 0 depending on whether n is an odd or even number
         remainder |= n & 1
         n >>= 1
     min_runsize = n + remainder
 
-    # perform insertion sort on subarrays with the length of the minimum run size
-    index = 0
-    prev_index = 0
-    end_index = arr_size - 1
-    run_chunks: List[Tuple[int, int]] = []
+    min_gallop = MIN_GALLOP
+    # the (start, length) of the runs that are waiting to be merged
+    run_stack: List[Tuple[int, int]] = []
 
-    while index < end_index:
-        comparator = lt if arr[index] < arr[index + 1] else gt
+    def count_run(lo: int, hi: int) -> Iterable[Step]:
+        if lo + 1 == hi:
+            return 1
 
-        index += 1
-        run_size = 2
-        while index < end_index and comparator(arr[index], arr[index + 1]):
-            yield arr[index, True]
-            index += 1
-            run_size += 1
+        yield Step(COMPARE, lo + 1, lo)
+        descending = arr[lo + 1] < arr[lo]
 
-        if comparator is gt:
-            end_section_index = prev_index + -(-(index - prev_index) // 2)
+        i = lo + 2
+        while i < hi:
+            yield Step(COMPARE, i, i - 1)
+            if (arr[i] < arr[i - 1]) != descending:
+                break
+            i += 1
 
-            for i in range(prev_index, end_section_index):
-                arr[i], arr[end_section_index] = arr[end_section_index], arr[i]
-                yield arr[end_section_index, True]
-                end_section_index -= 1
+        # only strictly descending runs get reversed, so that equal elements keep their order
+        if descending:
+            j, k = lo, i - 1
+            while j < k:
+                arr[j], arr[k] = arr[k], arr[j]
+                yield Step(SWAP, j, k)
+                j += 1
+                k -= 1
+
+        return i - lo
+
+    def binary_insertion_sort(lo: int, hi: int, start: int) -> Iterable[Step]:
+        # arr[lo:start] is already sorted
+        for start in range(start, hi):
+            pivot = arr[start]
+
+            left, right = lo, start
+            while left < right:
+                mid = (left + right) >> 1
+                yield Step(COMPARE, start, mid)
+                if pivot < arr[mid]:
+                    right = mid
+                else:
+                    left = mid + 1
 
-        if run_size < min_runsize or 0 < end_index - index < min_runsize:
-            index = min(index + min_runsize - run_size, end_index)
+            if left == start:
+                continue
 
-            for i in range(prev_index + 1, index + 1):
-                while i > prev_index and arr[i - 1] > arr[i]:
-                    arr[i - 1], arr[i] = arr[i], arr[i - 1]
-                    yield arr[i, True]
-                    i -= 1
+            for k in range(start, left, -1):
+                arr[k] = arr[k - 1]
+                yield Step(WRITE, k)
+            arr[left] = pivot
+            yield Step(WRITE, left)
+
+    def merge_lo(base_a: int, len_a: int, base_b: int, len_b: int) -> Iterable[Step]:
+        # the left run is the shorter one, so it gets copied out & the merge goes from left to right,
+        # with the comparisons naming the slot a copied out element came from, rather than where it'll be written to
+        nonlocal min_gallop
+
+        temp_arr = arr[base_a : base_a + len_a]
+        dest, cursor_a, cursor_b = base_a, 0, base_b
+
+        # the first element of the right run is known to be the smallest
+        arr[dest] = arr[cursor_b]
+        yield Step(WRITE, dest)
+        dest, cursor_b, len_b = dest + 1, cursor_b + 1, len_b - 1
+
+        while len_b > 0 and len_a > 1:
+            count_a = count_b = 0
+
+            # merging one element at a time until one of the runs keeps winning
+            while len_b > 0 and len_a > 1:
+                yield Step(COMPARE, cursor_b, base_a + cursor_a)
+                if arr[cursor_b] < temp_arr[cursor_a]:
+                    arr[dest] = arr[cursor_b]
+                    yield Step(WRITE, dest)
+                    dest, cursor_b, len_b = dest + 1, cursor_b + 1, len_b - 1
+                    count_a, count_b = 0, count_b + 1
+                else:
+                    arr[dest] = temp_arr[cursor_a]
+                    yield Step(WRITE, dest)
+                    dest, cursor_a, len_a = dest + 1, cursor_a + 1, len_a - 1
+                    count_a, count_b = count_a + 1, 0
 
-        run_chunks.append((prev_index, index))
-        index += 1
-        prev_index = index
+                if count_a >= min_gallop or count_b >= min_gallop:
+                    break
+            else:
+                break
+
+            # galloping, copying whole chunks of a run at once
+            min_gallop += 1
+            while len_b > 0 and len_a > 1:
+                min_gallop -= min_gallop > 1
+
+                count_a = yield from _gallop_right(arr[cursor_b], cursor_b, temp_arr, cursor_a, len_a, 0, base_a)
+                if count_a:
+                    for k in range(count_a):
+                        arr[dest + k] = temp_arr[cursor_a + k]
+                        yield Step(WRITE, dest + k)
+                    dest, cursor_a, len_a = dest + count_a, cursor_a + count_a, len_a - count_a
+                    if len_a <= 1:
+                        break
+
+                arr[dest] = arr[cursor_b]
+                yield Step(WRITE, dest)
+                dest, cursor_b, len_b = dest + 1, cursor_b + 1, len_b - 1
+                if len_b == 0:
+                    break
+
+                count_b = yield from _gallop_left(temp_arr[cursor_a], base_a + cursor_a, arr, cursor_b, len_b, 0)
+                if count_b:
+                    for k in range(count_b):
+                        arr[dest + k] = arr[cursor_b + k]
+                        yield Step(WRITE, dest + k)
+                    dest, cursor_b, len_b = dest + count_b, cursor_b + count_b, len_b - count_b
+                    if len_b == 0:
+                        break
+
+                arr[dest] = temp_arr[cursor_a]
+                yield Step(WRITE, dest)
+                dest, cursor_a, len_a = dest + 1, cursor_a + 1, len_a - 1
+                if len_a <= 1:
+                    break
+
+                if count_a < MIN_GALLOP and count_b < MIN_GALLOP:
+                    # penalize galloping for not paying off
+                    min_gallop += 1
+                    break
+
+        if len_a == 1 and len_b > 0:
+            # the last element of the left run belongs after everything that's left in the right run
+            for k in range(len_b):
+                arr[dest + k] = arr[cursor_b + k]
+                yield Step(WRITE, dest + k)
+            dest += len_b
+
+        for k in range(len_a):
+            arr[dest + k] = temp_arr[cursor_a + k]
+            yield Step(WRITE, dest + k)
+
+    def merge_hi(base_a: int, len_a: int, base_b: int, len_b: int) -> Iterable[Step]:
+        # the right run is the shorter one, so it gets copied out & the merge goes from right to left
+        nonlocal min_gallop
+
+        temp_arr = arr[base_b : base_b + len_b]
+        dest, cursor_a, cursor_b = base_b + len_b - 1, base_a + len_a - 1, len_b - 1
+
+        # the last element of the left run is known to be the largest
+        arr[dest] = arr[cursor_a]
+        yield Step(WRITE, dest)
+        dest, cursor_a, len_a = dest - 1, cursor_a - 1, len_a - 1
+
+        while len_a > 0 and len_b > 1:
+            count_a = count_b = 0
+
+            # merging one element at a time until one of the runs keeps winning
+            while len_a > 0 and len_b > 1:
+                yield Step(COMPARE, base_b + cursor_b, cursor_a)
+                if temp_arr[cursor_b] < arr[cursor_a]:
+                    arr[dest] = arr[cursor_a]
+                    yield Step(WRITE, dest)
+                    dest, cursor_a, len_a = dest - 1, cursor_a - 1, len_a - 1
+                    count_a, count_b = count_a + 1, 0
+                else:
+                    arr[dest] = temp_arr[cursor_b]
+                    yield Step(WRITE, dest)
+                    dest, cursor_b, len_b = dest - 1, cursor_b - 1, len_b - 1
+                    count_a, count_b = 0, count_b + 1
 
-    if len(run_chunks) == 1:
+                if count_a >= min_gallop or count_b >= min_gallop:
+                    break
+            else:
+                break
+
+            # galloping, copying whole chunks of a run at once
+            min_gallop += 1
+            while len_a > 0 and len_b > 1:
+                min_gallop -= min_gallop > 1
+
+                k = yield from _gallop_right(temp_arr[cursor_b], base_b + cursor_b, arr, base_a, len_a, len_a - 1)
+                count_a = len_a - k
+                if count_a:
+                    for k in range(count_a):
+                        arr[dest - k] = arr[cursor_a - k]
+                        yield Step(WRITE, dest - k)
+                    dest, cursor_a, len_a = dest - count_a, cursor_a - count_a, len_a - count_a
+                    if len_a == 0:
+                        break
+
+                arr[dest] = temp_arr[cursor_b]
+                yield Step(WRITE, dest)
+                dest, cursor_b, len_b = dest - 1, cursor_b - 1, len_b - 1
+                if len_b <= 1:
+                    break
+
+                k = yield from _gallop_left(arr[cursor_a], cursor_a, temp_arr, 0, len_b, len_b - 1, base_b)
+                count_b = len_b - k
+                if count_b:
+                    for k in range(count_b):
+                        arr[dest - k] = temp_arr[cursor_b - k]
+                        yield Step(WRITE, dest - k)
+                    dest, cursor_b, len_b = dest - count_b, cursor_b - count_b, len_b - count_b
+                    if len_b <= 1:
+                        break
+
+                arr[dest] = arr[cursor_a]
+                yield Step(WRITE, dest)
+                dest, cursor_a, len_a = dest - 1, cursor_a - 1, len_a - 1
+                if len_a == 0:
+                    break
+
+                if count_a < MIN_GALLOP and count_b < MIN_GALLOP:
+                    # penalize galloping for not paying off
+                    min_gallop += 1
+                    break
+
+        if len_b == 1 and len_a > 0:
+            # the first element of the right run belongs before everything that's left in the left run
+            for k in range(len_a):
+                arr[dest - k] = arr[cursor_a - k]
+                yield Step(WRITE, dest - k)
+            dest, cursor_a = dest - len_a, cursor_a - len_a
+
+        for k in range(len_b):
+            arr[dest - k] = temp_arr[len_b - 1 - k]
+            yield Step(WRITE, dest - k)
+
+    def merge_at(i: int) -> Iterable[Step]:
+        base_a, len_a = run_stack[i]
+        base_b, len_b = run_stack[i + 1]
+        run_stack[i] = (base_a, len_a + len_b)
+        del run_stack[i + 1]
+
+        # the elements of the left run that are smaller than the first element of the right run are already in place
+        k = yield from _gallop_right(arr[base_b], base_b, arr, base_a, len_a, 0)
+        base_a, len_a = base_a + k, len_a - k
+        if len_a == 0:
+            return
+
+        # same goes for the elements of the right run that are larger than the last element of the left run
+        len_b = yield from _gallop_left(arr[base_a + len_a - 1], base_a + len_a - 1, arr, base_b, len_b, len_b - 1)
+        if len_b == 0:
+            return
+
+        if len_a <= len_b:
+            yield from merge_lo(base_a, len_a, base_b, len_b)
+        else:
+            yield from merge_hi(base_a, len_a, base_b, len_b)
+
+    def merge_collapse() -> Iterable[Step]:
+        while len(run_stack) > 1:
+            n = len(run_stack) - 2
+            if (n > 0 and run_stack[n - 1][1] <= run_stack[n][1] + run_stack[n + 1][1]) or (
+                n > 1 and run_stack[n - 2][1] <= run_stack[n - 1][1] + run_stack[n][1]
+            ):
+                if run_stack[n - 1][1] < run_stack[n + 1][1]:
+                    n -= 1
+            elif run_stack[n][1] > run_stack[n + 1][1]:
+                break
+            yield from merge_at(n)
+
+    lo, remaining = 0, arr_size
+    while remaining > 0:
+        run_size = yield from count_run(lo, lo + remaining)
+
+        if run_size < min_runsize:
+            forced_size = min(min_runsize, remaining)
+            yield from binary_insertion_sort(lo, lo + forced_size, lo + run_size)
+            run_size = forced_size
+
+        run_stack.append((lo, run_size))
+        yield from merge_collapse()
+
+        lo, remaining = lo + run_size, remaining - run_size
+
+    while len(run_stack) > 1:
+        n = len(run_stack) - 2
+        if n > 0 and run_stack[n - 1][1] < run_stack[n + 1][1]:
+            n -= 1
+        yield from merge_at(n)
+
+
+# the sign bit of a 64 bit float
+FLOAT_SIGN_BIT = 1 << 63
+
+
+def _is_exact_float(k: Union[int, float]) -> bool:
+    try:
+        return float(k) == k
+    except OverflowError:
+        return False
+
+
+def _radix_keys(keys: List) -> List[int]:
+    # radix sort works on the digits of non-negative integers, so every key is mapped onto one, keeping their order
+    if all(type(k) is int for k in keys):
+        min_key = min(keys)
+        if min_key >= 0:
+            return keys
+        return [k - min_key for k in keys]
+
+    if not all(isinstance(k, (int, float)) for k in keys):
+        raise TypeError("radix sort only supports int & float keys")
+
+    if all(_is_exact_float(k) for k in keys):
+        # the bits of an IEEE double read as a signed integer are ordered the same way as the floats themselves,
+        # except that the negative ones are reversed, flipping them & offsetting the positive ones fixes that,
+        # adding 0.0 turns -0.0 into 0.0, which it's equal to, but whose bits would've sorted it before
+        doubles = [float(k) + 0.0 for k in keys]
+        bits = struct.unpack(f"<{len(keys)}q", struct.pack(f"<{len(keys)}d", *doubles))
+        return [~b if b < 0 else b | FLOAT_SIGN_BIT for b in bits]
+
+    # ints too large to be a double without losing precision, mixed with floats, get everything scaled to fixed point,
+    # every finite float being a fraction over a power of 2, the largest denominator is a multiple of all the others
+    finite = [type(k) is int or math.isfinite(k) for k in keys]
+    ratios = [k.as_integer_ratio() if is_finite else (0, 1) for k, is_finite in zip(keys, finite)]
+    scale = max(denominator for _, denominator in ratios)
+    fixed = [numerator * (scale // denominator) for numerator, denominator in ratios]
+
+    # the infinities go right past the smallest & largest finite keys
+    finite_keys = [k for k, is_finite in zip(fixed, finite) if is_finite]
+    min_key, max_key = min(finite_keys, default=0) - 1, max(finite_keys, default=0) + 1
+    return [
+        f - min_key if is_finite else (max_key - min_key if k > 0 else 0)
+        for k, f, is_finite in zip(keys, fixed, finite)
+    ]
+
+
+@with_fast_path
+def radix_sort(
+    arr: MutableSequence[CT], base: int = 256, key: Callable = None, reverse: bool = False
+) -> Iterable[Step]:
+    """
+    executes a least significant digit first radix sort on the given array in place,
+    the keys (the elements themselves, or the results of the given key function) can be any int or float
+
+    [Process]
+    1. map every key onto a non-negative integer with the same order,
+       negative integers are offset by the minimum key & floats are mapped through their IEEE bits
+       (or scaled to fixed point along with the ints, if some of those are too large to be a double exactly),
+       for a reversed sort, the mapped keys are subtracted from the maximum one, which keeps the sort stable
+
+    2. round the base up to a power of 2, so that every digit can be taken with a shift & a mask
+
+    3. for each digit, starting from the least significant one, count the number of keys in every bucket,
+       a digit where every key falls into the same bucket is skipped entirely
+
+    4. place every element (and its key) into the scratch buffer at the start of its bucket,
+       which keeps the elements with the same digit in their original order, then write them back into the array
+
+    [Time Complexity]: N * (number of digits)
+
+    """
+    if base < 2:
+        raise ValueError(f"base must be at least 2, got {base}")
+
+    arr_size = len(arr)
+    if arr_size < 2:
         return
 
-    while (size := len(run_chunks)) > 1:
+    values = arr[:]
+    keys = _radix_keys(values if key is None else [key(v) for v in values])
+    if reverse:
+        max_key = max(keys)
+        keys = [max_key - k for k in keys]
 
-        for m in range(size - 1, -1, -2):
-            rc_2, rc_1 = run_chunks.pop(m), run_chunks.pop(m - 1)
-            start, mid, end = rc_1[0], rc_1[1], rc_2[1]
+    digit_bits = (base - 1).bit_length()
+    radix = 1 << digit_bits
+    mask = radix - 1
+    key_bits = max(keys).bit_length()
 
-            left_size = mid - start + 1
-            right_size = end - mid
-            mid += 1
-            if left_size > right_size:
-                temp_arr = arr[mid : end + 1]
-                arr[start + right_size : mid + right_size] = arr[start:mid]
+    # allocated once & reused for every digit
+    scratch_values = [None] * arr_size
+    scratch_keys = [0] * arr_size
+    count_index = [0] * radix
+    no_counts = [0] * radix
 
-                temp_size = right_size
+    def digit_pass(shift: int) -> Iterable[Step]:
+        nonlocal values, scratch_values, keys, scratch_keys
 
-                i = start + right_size
-                end_index = left_size + i
+        count_index[:] = no_counts
+        for i in range(arr_size):
+            count_index[(keys[i] >> shift) & mask] += 1
+            yield Step(READ, i)
 
-            else:
-                temp_arr = arr[start:mid]
-                temp_size = left_size
-
-                i = mid
-                end_index = right_size + i
-
-            # copying the elements of splitted-array back into the original array in order
-            t, k = 0, start
-            while t < temp_size and i < end_index:
-                temp_elem = temp_arr[t]
-                orig_elem = arr[i]
-
-                if temp_elem < orig_elem:
-                    arr[k] = temp_elem
-                    yield temp_elem
-                    t += 1
-                else:
-                    arr[k] = orig_elem
-                    yield orig_elem
-                    i += 1
-                k += 1
+        if max(count_index) == arr_size:
+            return
 
-            while i < end_index:
-                arr[k] = arr[i]
-                k += 1
-                i += 1
+        # the starting index of every bucket
+        bucket_start = [0]
+        bucket_start.extend(accumulate(count_index[:-1]))
 
-            while t < temp_size:
-                arr[k] = temp_arr[t]
-                k += 1
-                t += 1
+        for i in range(arr_size):
+            k = keys[i]
+            index = bucket_start[(k >> shift) & mask]
+            bucket_start[(k >> shift) & mask] = index + 1
+            scratch_values[index] = values[i]
+            scratch_keys[index] = k
 
-            insort(run_chunks, (start, end))
+        values, scratch_values = scratch_values, values
+        keys, scratch_keys = scratch_keys, keys
 
+        # re-writing the elements in their new order back into the actual array
+        for i in range(arr_size):
+            arr[i] = values[i]
+            yield Step(WRITE, i)
 
-def radix_sort(arr: MutableSequence[CT], base: int = 10) -> None:
-    max_elem = max(arr)
-    arr_size = len(arr)
+    for shift in range(0, key_bits, digit_bits):
+        yield from digit_pass(shift)
 
-    # the larger the base, the larger the required space, but the lower the time complexity
-    # larger base allows for lesser iterations of the array through counting sort, but it increases
-    # the size of the temporary array used, base larger than the size of the array itself would result in a lot of
-    # unnecessary empty-space created in the count_index array
-    base = min(base, len(arr))
-    digit = 1
-
-    # keep looping until the digit of the max element has been exceeded
-    while max_elem // digit > 0:
-
-        # to keep track of the number of occurence of each number (0-9)
-        count_index = [0] * base
-
-        for i in range(0, arr_size):
-            # divide the number so that the position that we're looking for is the LSD
-            index = arr[i] // digit
-            # modulus the number to get the LSD
-            count_index[index % base] += 1
-            yield arr[i, True]
-
-        # getting the cummulative sum of the count_index array
-        # basically getting the index of the element with the given LSD in the actual array
-        # i.e: given an already sorted array
-        # given_array = [0, 1, 1, 2, 3, 5, 6, 6, 7, 8, 9]
-        # count_array = [1, 2, 1, 1, 0, 1, 2, 1, 1, 1]
-        # cummulative_count_array = [1, 3, 4, 5, 5, 6, 8, 9, 10, 11]
-        # given the element 7, its index would be 7, which corresponds to 9 in the cummulative_count_array,
-        # minus 1 and its 8, whih is the correct index of the element in the actual array
-        cummulative_count_index = list(accumulate(count_index))
-
-        i = arr_size - 1
-        output_arr = [0] * arr_size
-        while i >= 0:
-            elem = arr[i]
-            index = (elem // digit) % base
-            output_arr[cummulative_count_index[index] - 1] = elem
-            cummulative_count_index[index] -= 1
-            i -= 1
-
-        # re-writing the temporary array back into the actual array
-        for i in range(0, arr_size):
-            arr[i] = output_arr[i]
-            yield output_arr[i, True]
-
-        digit *= base
-
-
-def iterative_quick_sort(arr: MutableSequence[CT]) -> None:
-    def recursive_quick_sort(start: int, end: int) -> None:
-        while start < end:
 
-            pivot = arr[end]
-            i = start
+@with_fast_path
+def _partition(arr: MutableSequence[CT], start: int, end: int) -> Iterable[Step]:
+    # lomuto partition around the last element, returning the index the pivot ends up at
+    pivot = arr[end]
+    i = start
 
-            for j in range(start, end):
-                if arr[j] <= pivot:
-                    arr[i], arr[j] = arr[j], arr[i]
-                    yield arr[j, True]
-                    i += 1
+    for j in range(start, end):
+        yield Step(COMPARE, j, end)
+        if arr[j] <= pivot:
+            arr[i], arr[j] = arr[j], arr[i]
+            yield Step(SWAP, i, j)
+            i += 1
+
+    arr[i], arr[end] = arr[end], arr[i]
+    yield Step(SWAP, i, end)
+    return i
 
-            arr[i], arr[end] = arr[end], arr[i]
-            yield arr[end, True]
+
+@with_key
+@with_fast_path
+def iterative_quick_sort(arr: MutableSequence[CT]) -> Iterable[Step]:
+    def recursive_quick_sort(start: int, end: int) -> Iterable[Step]:
+        while start < end:
+            i = yield from _partition(arr, start, end)
 
             if i - start < end - i:
                 yield from recursive_quick_sort(start, i - 1)
@@ -270,24 +799,338 @@ def iterative_quick_sort(arr: MutableSequence[CT]) -> None:
     yield from recursive_quick_sort(0, len(arr) - 1)
 
 
-def quick_sort(arr: MutableSequence[CT]) -> None:
-    def recursive_quick_sort(start: int, end: int) -> None:
+@with_key
+@with_fast_path
+def quick_sort(arr: MutableSequence[CT]) -> Iterable[Step]:
+    def recursive_quick_sort(start: int, end: int) -> Iterable[Step]:
         if start >= end:
             return
 
-        pivot = arr[end]
-        i = start
-
-        for j in range(start, end):
-            if arr[j] <= pivot:
-                arr[i], arr[j] = arr[j], arr[i]
-                yield arr[j, True]
-                i += 1
-
-        arr[i], arr[end] = arr[end], arr[i]
-        yield arr[end]
+        i = yield from _partition(arr, start, end)
 
         yield from recursive_quick_sort(start, i - 1)
         yield from recursive_quick_sort(i + 1, end)
 
     yield from recursive_quick_sort(0, len(arr) - 1)
+
+
+@with_fast_path
+def _sift_down(arr: MutableSequence[CT], offset: int, root: int, size: int) -> Iterable[Step]:
+    # the heap lives in arr[offset : offset + size], with the children of i at 2i + 1 & 2i + 2
+    while (child := 2 * root + 1) < size:
+        if child + 1 < size:
+            yield Step(COMPARE, offset + child, offset + child + 1)
+            if arr[offset + child] < arr[offset + child + 1]:
+                child += 1
+
+        yield Step(COMPARE, offset + root, offset + child)
+        if not arr[offset + root] < arr[offset + child]:
+            return
+
+        arr[offset + root], arr[offset + child] = arr[offset + child], arr[offset + root]
+        yield Step(SWAP, offset + root, offset + child)
+        root = child
+
+
+@with_key
+@with_fast_path
+def heap_sort(arr: MutableSequence[CT], start: int = 0, end: int = None) -> Iterable[Step]:
+    """
+    executes heap sort on the given array in place
+
+    [Process]
+    1. turn the array into a max-heap by sifting down every parent node, starting from the last one
+
+    2. swap the root of the heap (the largest element) with the last element of the heap & shrink the heap by 1
+
+    3. sift the new root down to restore the heap, and repeat until the heap is empty
+
+    [Time Complexity]: N log N
+
+    """
+    if end is None:
+        end = len(arr) - 1
+    size = end - start + 1
+
+    for root in range(size // 2 - 1, -1, -1):
+        yield from _sift_down(arr, start, root, size)
+
+    # note: the 'sorted group' will reside at the end of the array
+    for last in range(size - 1, 0, -1):
+        arr[start], arr[start + last] = arr[start + last], arr[start]
+        yield Step(SWAP, start, start + last)
+        yield from _sift_down(arr, start, 0, last)
+
+
+@with_fast_path
+def _median_of_three(arr: MutableSequence[CT], a: int, b: int, c: int) -> Iterable[Step]:
+    """returns the index of the median of the 3 elements"""
+    yield Step(COMPARE, a, b)
+    if arr[a] < arr[b]:
+        yield Step(COMPARE, b, c)
+        if arr[b] < arr[c]:
+            return b
+
+        yield Step(COMPARE, a, c)
+        return c if arr[a] < arr[c] else a
+
+    yield Step(COMPARE, a, c)
+    if arr[a] < arr[c]:
+        return a
+
+    yield Step(COMPARE, b, c)
+    return c if arr[b] < arr[c] else b
+
+
+@with_fast_path
+def _choose_pivot(arr: MutableSequence[CT], start: int, end: int) -> Iterable[Step]:
+    """returns the index of the median of three for small partitions, and of tukey's ninther for large ones"""
+    mid = start + (end - start) // 2
+    if end - start < NINTHER_THRESHOLD:
+        return (yield from _median_of_three(arr, start, mid, end))
+
+    s = (end - start) // 8
+    return (
+        yield from _median_of_three(
+            arr,
+            (yield from _median_of_three(arr, start, start + s, start + 2 * s)),
+            (yield from _median_of_three(arr, mid - s, mid, mid + s)),
+            (yield from _median_of_three(arr, end - 2 * s, end - s, end)),
+        )
+    )
+
+
+@with_fast_path
+def _partition3(arr: MutableSequence[CT], start: int, end: int, pivot_index: int) -> Iterable[Step]:
+    """
+    three-way partitions arr[start : end + 1] around the pivot, returning (lt, gt) such that
+    arr[start:lt] < pivot, arr[lt : gt + 1] == pivot & arr[gt + 1 : end + 1] > pivot
+
+    """
+    arr[start], arr[pivot_index] = arr[pivot_index], arr[start]
+    yield Step(SWAP, start, pivot_index)
+    pivot = arr[start]
+
+    # the elements equal to the pivot gather in arr[lt:i], with the pivot itself always at arr[lt]
+    lt, i, gt = start, start + 1, end
+    while i <= gt:
+        elem = arr[i]
+
+        yield Step(COMPARE, i, lt)
+        if elem < pivot:
+            arr[lt], arr[i] = elem, arr[lt]
+            yield Step(SWAP, lt, i)
+            lt += 1
+            i += 1
+            continue
+
+        yield Step(COMPARE, lt, i)
+        if pivot < elem:
+            arr[i], arr[gt] = arr[gt], elem
+            yield Step(SWAP, i, gt)
+            gt -= 1
+        else:
+            i += 1
+
+    return lt, gt
+
+
+INSERTION_SORT_THRESHOLD = 16
+NINTHER_THRESHOLD = 128
+
+
+@with_key
+@with_fast_path
+def intro_sort(arr: MutableSequence[CT], start: int = 0, end: int = None) -> Iterable[Step]:
+    """
+    executes introspective sort on the given array in place
+
+    [Process]
+    1. pick the pivot as the median of the first, middle & last element, or as tukey's ninther for large partitions,
+       which keeps sorted & reversed input from degrading into the worst case
+
+    2. three-way partition the array into the elements smaller than, equal to & greater than the pivot,
+       so that runs of duplicates are dealt with in one go
+
+    3. keep partitioning the smaller side & push the larger side onto a stack for later,
+       which keeps the stack at log N entries without relying on recursion
+
+    4. once a partition has gone through more than 2 log N levels, heap sort it instead to guarantee N log N
+
+    5. partitions smaller than the threshold get insertion sorted instead
+
+    [Time Complexity]: N log N
+
+    """
+    if end is None:
+        end = len(arr) - 1
+    if end <= start:
+        return
+
+    stack: List[Tuple[int, int, int]] = [(start, end, 2 * (end - start + 1).bit_length())]
+    while stack:
+        start, end, depth_limit = stack.pop()
+
+        while end - start + 1 > INSERTION_SORT_THRESHOLD:
+            if depth_limit == 0:
+                yield from heap_sort(arr, start, end)
+                break
+            depth_limit -= 1
+
+            pivot_index = yield from _choose_pivot(arr, start, end)
+            lt, gt = yield from _partition3(arr, start, end, pivot_index)
+
+            if lt - start < end - gt:
+                stack.append((gt + 1, end, depth_limit))
+                end = lt - 1
+            else:
+                stack.append((start, lt - 1, depth_limit))
+                start = gt + 1
+
+        # only reached when the partition got small enough without falling back to heap sort
+        else:
+            yield from insertion_sort(arr, start, end)
+
+
+@with_fast_path
+def _rotate(arr: MutableSequence[CT], start: int, mid: int, end: int) -> Iterable[Step]:
+    # rotates arr[start:end] in place so that arr[mid] ends up at start, by reversing both sides & then the whole
+    for lo, hi in ((start, mid - 1), (mid, end - 1), (start, end - 1)):
+        while lo < hi:
+            arr[lo], arr[hi] = arr[hi], arr[lo]
+            yield Step(SWAP, lo, hi)
+            lo += 1
+            hi -= 1
+
+
+@with_fast_path
+def _sym_merge(arr: MutableSequence[CT], start: int, mid: int, end: int) -> Iterable[Step]:
+    """
+    stably merges the sorted arr[start:mid] & arr[mid:end] in place, without any buffer,
+    returns the peak number of merges that were pending on its stack
+
+    [Process]
+    1. find the split of both halves around the middle of the whole range by a binary search,
+       such that everything left of the split in the right half belongs before everything right of it in the left half
+
+    2. rotate those 2 inner parts past each other, leaving 2 smaller merges on either side of the middle,
+       which get pushed onto the stack instead of recursing
+
+    3. a merge with a single element on either side is just a binary search & a shift of that element into place
+
+    [Note]
+    this is the SymMerge algorithm of Kim & Kutzner, which merges with O(M log(N/M + 1)) comparisons,
+    with the stack never holding more than log N merges
+
+    """
+    stack = [(start, mid, end)]
+    peak = 1
+
+    while stack:
+        a, m, b = stack.pop()
+
+        if m - a == 1:
+            # the lone left element goes right before the first element of the right half that isn't smaller
+            lo, hi = m, b
+            while lo < hi:
+                c = (lo + hi) // 2
+                yield Step(COMPARE, c, a)
+                if arr[c] < arr[a]:
+                    lo = c + 1
+                else:
+                    hi = c
+            for k in range(a, lo - 1):
+                arr[k], arr[k + 1] = arr[k + 1], arr[k]
+                yield Step(SWAP, k, k + 1)
+            continue
+
+        if b - m == 1:
+            # the lone right element goes right before the first element of the left half that's greater
+            lo, hi = a, m
+            while lo < hi:
+                c = (lo + hi) // 2
+                yield Step(COMPARE, m, c)
+                if not arr[m] < arr[c]:
+                    lo = c + 1
+                else:
+                    hi = c
+            for k in range(m, lo, -1):
+                arr[k], arr[k - 1] = arr[k - 1], arr[k]
+                yield Step(SWAP, k - 1, k)
+            continue
+
+        middle = (a + b) // 2
+        n = middle + m
+        if m > middle:
+            lo, hi = n - b, middle
+        else:
+            lo, hi = a, m
+
+        # arr[lo:split] & arr[n - split:n] get swapped around the middle
+        while lo < hi:
+            c = (lo + hi) // 2
+            yield Step(COMPARE, n - 1 - c, c)
+            if not arr[n - 1 - c] < arr[c]:
+                lo = c + 1
+            else:
+                hi = c
+        split_start, split_end = lo, n - lo
+
+        if split_start < m < split_end:
+            yield from _rotate(arr, split_start, m, split_end)
+
+        if a < split_start < middle:
+            stack.append((a, split_start, middle))
+        if middle < split_end < b:
+            stack.append((middle, split_end, b))
+        peak = max(peak, len(stack))
+
+    return peak
+
+
+BLOCK_SIZE = 16
+
+
+@with_key
+@with_fast_path
+def block_merge_sort(arr: MutableSequence[CT], start: int = 0, end: int = None) -> Iterable[Step]:
+    """
+    executes a stable merge sort on the given array in place, without a temporary array,
+    returns the peak number of merges that were pending on the stack, that being the only auxiliary memory used
+
+    [Process]
+    1. insertion sort the array in blocks of BLOCK_SIZE elements
+
+    2. merge neighbouring blocks into blocks twice their size, until there's only a single block left,
+       skipping the merge if the last element of the left block isn't greater than the first element of the right one
+
+    3. merge in place by rotating parts of both blocks past each other (see _sym_merge)
+
+    [Time Complexity]: N log^2 N, with O(log N) auxiliary memory
+
+    """
+    if end is None:
+        end = len(arr) - 1
+    if end <= start:
+        return 0
+    end += 1
+
+    for lo in range(start, end, BLOCK_SIZE):
+        yield from insertion_sort(arr, lo, min(lo + BLOCK_SIZE, end) - 1)
+
+    peak = 0
+    width = BLOCK_SIZE
+    while width < end - start:
+        for lo in range(start, end - width, 2 * width):
+            mid = lo + width
+
+            yield Step(COMPARE, mid - 1, mid)
+            if not arr[mid - 1] > arr[mid]:
+                continue
+
+            stack_size = yield from _sym_merge(arr, lo, mid, min(mid + width, end))
+            peak = max(peak, stack_size)
+
+        width *= 2
+
+    return peak
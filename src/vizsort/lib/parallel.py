@@ -0,0 +1,212 @@
+from array import array
+from bisect import bisect_left
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from contextlib import contextmanager
+from heapq import merge
+from multiprocessing.shared_memory import SharedMemory
+from typing import Callable, Iterable, Iterator, List, MutableSequence, Tuple
+import os
+
+from vizsort.lib.fast_path import with_fast_path
+from vizsort.lib.logarithmic_sort import merge_sort
+from vizsort.lib.step import Step, WRITE
+
+__all__ = ["parallel_sort"]
+
+
+# chunks smaller than this aren't worth the cost of shipping them to another process
+MIN_CHUNK_SIZE = 4096
+
+INT64_MIN = -(1 << 63)
+INT64_MAX = (1 << 63) - 1
+
+
+def _infer_typecode(arr: MutableSequence) -> str:
+    # the shared memory holds raw machine values, so only arrays of a single numeric type can be put into it
+    if isinstance(arr, array):
+        return arr.typecode
+
+    if all(type(elem) is int for elem in arr):
+        if INT64_MIN <= min(arr) and max(arr) <= INT64_MAX:
+            return "q"
+        raise TypeError("parallel sort only supports integers that fit in 64 bits")
+
+    if all(type(elem) is float for elem in arr):
+        return "d"
+
+    raise TypeError("parallel sort only supports arrays of either ints or floats")
+
+
+@contextmanager
+def _attach(blocks: List[Tuple[str, str]]) -> Iterator[List[memoryview]]:
+    # attaches to the blocks of shared memory by their (name, typecode), yielding a typed view of each
+    shms = [SharedMemory(name) for name, _ in blocks]
+    views = [memoryview(shm.buf).cast(typecode) for shm, (_, typecode) in zip(shms, blocks)]
+    try:
+        yield views
+    finally:
+        # the shared memory can only be closed once every view into it is gone
+        for view in views:
+            view.release()
+        for shm in shms:
+            shm.close()
+
+
+def _sort_chunk(blocks: List[Tuple[str, str]], lo: int, hi: int, sort_algo: Callable) -> Tuple[int, int]:
+    # runs in the worker processes, which sort their chunk of the values in place,
+    # when the values are keys, there's a 2nd block the original index of every key gets written into
+    with _attach(blocks) as views:
+        values = views[0][lo:hi].tolist()
+
+        if len(views) == 1:
+            sort_algo.fast(values)
+            views[0][lo:hi] = array(views[0].format, values)
+        else:
+            # every algorithm sorts stably when given a key, so equal keys keep the order of their indices
+            order = list(range(lo, hi))
+            sort_algo.fast(order, key=lambda i: values[i - lo])
+            views[0][lo:hi] = array(views[0].format, [values[i - lo] for i in order])
+            views[1][lo:hi] = array(views[1].format, order)
+
+    return lo, hi
+
+
+def _merge_partition(
+    blocks: List[Tuple[str, str]], out_blocks: List[Tuple[str, str]], ranges: List[Tuple[int, int]], out_lo: int
+) -> Tuple[int, int]:
+    # runs in the worker processes, which merge their part of every sorted chunk into the output blocks
+    with _attach(blocks) as views, _attach(out_blocks) as out_views:
+        if len(views) == 1:
+            merged = array(views[0].format, merge(*(views[0][lo:hi].tolist() for lo, hi in ranges)))
+            out_hi = out_lo + len(merged)
+            out_views[0][out_lo:out_hi] = merged
+        else:
+            # the keys are merged along with their indices, which break the ties between equal keys
+            keys, indices = views
+            merged = list(merge(*(zip(keys[lo:hi].tolist(), indices[lo:hi].tolist()) for lo, hi in ranges)))
+            out_hi = out_lo + len(merged)
+            out_views[0][out_lo:out_hi] = array(keys.format, [k for k, _ in merged])
+            out_views[1][out_lo:out_hi] = array(indices.format, [i for _, i in merged])
+
+    return out_lo, out_hi
+
+
+def _partition_chunks(view: memoryview, bounds: List[int]) -> List[List[Tuple[int, int]]]:
+    """
+    splits the sorted chunks into one partition per chunk, every partition holding the elements of every chunk that
+    fall between 2 splitters, so that the partitions can be merged independently of each other & laid end to end
+
+    the splitters are picked by regular sampling, i.e the chunks are sampled at the same p evenly spaced ranks each,
+    and every pth of the sorted samples becomes a splitter, which keeps every partition under 2N / p elements
+
+    """
+    num_chunks = len(bounds) - 1
+    samples = sorted(
+        view[lo + (hi - lo) * k // num_chunks] for lo, hi in zip(bounds, bounds[1:]) for k in range(num_chunks)
+    )
+    splitters = samples[num_chunks::num_chunks]
+
+    # bisecting left puts every element equal to a splitter into the same partition, whichever chunk it's from
+    cuts = [[lo] + [bisect_left(view, s, lo, hi) for s in splitters] + [hi] for lo, hi in zip(bounds, bounds[1:])]
+    return [[(chunk_cuts[p], chunk_cuts[p + 1]) for chunk_cuts in cuts] for p in range(num_chunks)]
+
+
+@with_fast_path
+def parallel_sort(
+    arr: MutableSequence[int],
+    sort_algo: Callable[[MutableSequence], Iterable[Step]] = merge_sort,
+    workers: int = None,
+    min_chunk_size: int = MIN_CHUNK_SIZE,
+    typecode: str = None,
+    key: Callable = None,
+    reverse: bool = False,
+) -> Iterable[Step]:
+    """
+    sorts the given array of ints or floats in place by spreading it over multiple processes,
+    the array can hold anything if the given key maps every element to an int or float
+
+    [Process]
+    1. copy the array (or the keys of its elements) into a block of shared memory,
+       so that the worker processes can reach it without pickling
+
+    2. split it into one chunk per worker (but none smaller than min_chunk_size),
+       and have every worker sort its chunk in place with the fast path of the given sorting algorithm
+
+    3. copy every chunk back into the array as soon as it is done, announcing it with WRITE steps
+
+    4. split the sorted chunks into one partition per worker around splitters picked by regular sampling,
+       and have every worker k-way merge its partition into a second block of shared memory
+
+    5. copy every merged partition back into its place in the array as soon as it is done
+
+    an array too small to be split is simply sorted by the given sorting algorithm
+
+    [Time Complexity]: (N / workers) log N, plus N for copying the chunks & partitions back into the array
+
+    [Note]
+    the copying back is done by this process one element at a time, so that every element gets its WRITE step,
+    which makes it the part that doesn't get any faster with more workers
+
+    with a key or reverse, the keys (negated for reverse) get sorted instead, along with the original index of every
+    key in a block of its own, which is what the elements get copied back into the array by,
+    equal keys keep their original order, the same way they do with the builtin sorted
+
+    """
+    arr_size = len(arr)
+    if workers is None:
+        workers = os.cpu_count() or 1
+
+    keyed = key is not None or reverse
+
+    num_chunks = max(min(workers, arr_size // max(min_chunk_size, 1)), 1)
+    if num_chunks == 1:
+        yield from (sort_algo(arr, key=key, reverse=reverse) if keyed else sort_algo(arr))
+        return
+
+    if keyed:
+        elements = list(arr)
+        values = elements if key is None else [key(elem) for elem in elements]
+        if reverse:
+            values = [-value for value in values]
+        typecodes = [_infer_typecode(values), "q"]
+    else:
+        values = arr
+        typecodes = [typecode or _infer_typecode(arr)]
+
+    bounds = [arr_size * k // num_chunks for k in range(num_chunks + 1)]
+
+    # the values (& indices) being sorted, followed by the blocks they get merged into
+    shms = [SharedMemory(create=True, size=arr_size * array(tc).itemsize) for tc in typecodes * 2]
+    blocks = [(shm.name, tc) for shm, tc in zip(shms, typecodes * 2)]
+    in_blocks, out_blocks = blocks[: len(typecodes)], blocks[len(typecodes) :]
+    try:
+        with _attach(blocks) as views, ProcessPoolExecutor(max_workers=num_chunks) as executor:
+            view, out_view = views[0], views[len(typecodes)]
+            indices, out_indices = (views[1], views[3]) if keyed else (None, None)
+
+            view[:] = array(view.format, values)
+
+            futures = [executor.submit(_sort_chunk, in_blocks, lo, hi, sort_algo) for lo, hi in zip(bounds, bounds[1:])]
+
+            for future in as_completed(futures):
+                lo, hi = future.result()
+                for i in range(lo, hi):
+                    arr[i] = elements[indices[i]] if keyed else view[i]
+                    yield Step(WRITE, i)
+
+            # the partitions are laid end to end in the output, in the order of their splitters
+            futures = []
+            out_lo = 0
+            for ranges in _partition_chunks(view, bounds):
+                futures.append(executor.submit(_merge_partition, in_blocks, out_blocks, ranges, out_lo))
+                out_lo += sum(hi - lo for lo, hi in ranges)
+
+            for future in as_completed(futures):
+                lo, hi = future.result()
+                for i in range(lo, hi):
+                    arr[i] = elements[out_indices[i]] if keyed else out_view[i]
+                    yield Step(WRITE, i)
+    finally:
+        for shm in shms:
+            shm.close()
+            shm.unlink()
@@ -0,0 +1,185 @@
+from array import array
+from collections import deque
+from queue import Empty, Full, Queue
+from threading import Event, Thread
+from typing import Any, Callable, Iterable, List, MutableSequence, Tuple
+
+from vizsort.lib.step import Step, SWAP, WRITE
+from vizsort.lib.utils import OperationLoggingList
+
+__all__ = ["StepProducer"]
+
+
+# how often the waiting on the queue gets interrupted to check whether the sort has been fast-forwarded or stopped
+POLL_INTERVAL = 0.01
+
+
+class StepProducer:
+    """
+    runs a sorting algorithm ahead of whoever is consuming its steps, on a copy of the array in a background thread
+
+    the steps are handed over in batches through a bounded queue, with the value of every WRITE attached,
+    and the producer is an iterator of those steps, applying every step to the array right before yielding it,
+    which makes it a drop-in replacement for the generator of a sorting algorithm
+
+    the copy keeps count of the reads & writes the sort makes on it, and an array that keeps count as well
+    (an OperationLoggingList or OperationLoggingArray) gets those counts carried over as its steps are taken,
+    instead of counting the replay of the steps on it
+
+    [Consuming]
+    available: the number of steps that can be taken without waiting on the producer,
+    with every step taken, and the end of the steps reached, it's 1 more than that so that the end can be noticed
+
+    fast_forward: has the producer stop handing over steps & finish the sort by itself,
+    after which the array jumps straight to the sorted state, without the consumer ever having to wait for it
+
+    stop: abandons the sort
+
+    """
+
+    def __init__(
+        self,
+        sort_algo: Callable[[MutableSequence], Iterable[Step]],
+        arr: MutableSequence,
+        batch_size: int = 1024,
+        max_batches: int = 64,
+    ) -> None:
+        self.sort_algo = sort_algo
+        self.arr = arr
+        self.batch_size = batch_size
+
+        # the replay of the steps goes around the counting indexing of a logging array
+        base = array if isinstance(arr, array) else list if isinstance(arr, list) else type(arr)
+        self._getitem, self._setitem = base.__getitem__, base.__setitem__
+
+        self.queue: "Queue[Tuple[List[Tuple[Step, Any]], int, int]]" = Queue(max_batches)
+        self.batch = deque()
+        self.batch_counts: Tuple[int, int] = None
+        self.carried_counts = (0, 0)
+
+        self.num_produced = 0
+        self.num_consumed = 0
+
+        self.done = Event()
+        self.fast_forwarding = Event()
+        self.stopped = Event()
+        self.result: OperationLoggingList = None
+        self.error: BaseException = None
+
+        self.thread = Thread(target=self._produce, name=f"{sort_algo.__name__} producer", daemon=True)
+
+    def start(self) -> "StepProducer":
+        self.thread.start()
+        return self
+
+    def available(self) -> int:
+        if self.fast_forwarding.is_set() or self.error is not None:
+            # nothing more will be handed over, the sorted array is all that's left to wait on
+            return 1 if self.done.is_set() else 0
+
+        available = max(self.num_produced - self.num_consumed, 0)
+        return available + 1 if self.done.is_set() else available
+
+    def fast_forward(self) -> None:
+        self.fast_forwarding.set()
+
+    def stop(self) -> None:
+        self.stopped.set()
+
+    def __iter__(self) -> "StepProducer":
+        return self
+
+    def __next__(self) -> Step:
+        while not self.batch:
+            if self.fast_forwarding.is_set():
+                self.done.wait()
+                self._finish()
+
+            try:
+                batch, *self.batch_counts = self.queue.get(timeout=POLL_INTERVAL)
+                self.batch.extend(batch)
+            except Empty:
+                # the producer is only done after handing over its last batch
+                if self.done.is_set() and self.queue.empty():
+                    self._finish()
+
+        step, value = self.batch.popleft()
+        op, i, j = step
+        arr = self.arr
+        if op == SWAP:
+            a, b = self._getitem(arr, i), self._getitem(arr, j)
+            self._setitem(arr, i, b)
+            self._setitem(arr, j, a)
+        elif op == WRITE:
+            self._setitem(arr, i, value)
+
+        if not self.batch:
+            self._carry_counts(*self.batch_counts)
+
+        self.num_consumed += 1
+        return step
+
+    def _carry_counts(self, reads: int, writes: int) -> None:
+        # the array's counters follow the sort's accesses to the copy, up to the steps taken so far
+        if getattr(self.arr, "logging", False):
+            carried_reads, carried_writes = self.carried_counts
+            self.arr.num_array_reads += reads - carried_reads
+            self.arr.num_array_write += writes - carried_writes
+        self.carried_counts = (reads, writes)
+
+    def _finish(self) -> None:
+        if self.error is not None:
+            raise self.error
+
+        if self.fast_forwarding.is_set():
+            self.batch.clear()
+            result = array(self.arr.typecode, self.result) if isinstance(self.arr, array) else list(self.result)
+            self._setitem(self.arr, slice(None), result)
+            self.num_consumed = self.num_produced
+
+        self._carry_counts(self.result.num_array_reads, self.result.num_array_write)
+        raise StopIteration
+
+    def _hand_over(self, batch: List[Tuple[Step, Any]], work: OperationLoggingList) -> bool:
+        # waits for room in the queue, unless the steps aren't wanted anymore
+        item = (batch, work.num_array_reads, work.num_array_write)
+        while not (self.fast_forwarding.is_set() or self.stopped.is_set()):
+            try:
+                self.queue.put(item, timeout=POLL_INTERVAL)
+            except Full:
+                continue
+
+            self.num_produced += len(batch)
+            return True
+
+        return False
+
+    def _produce(self) -> None:
+        work = OperationLoggingList(self.arr)
+        sorter = iter(self.sort_algo(work))
+
+        try:
+            batch = []
+            for step in sorter:
+                batch.append((step, work.peek(step.i) if step.op == WRITE else None))
+
+                if len(batch) == self.batch_size:
+                    if not self._hand_over(batch, work):
+                        break
+                    batch = []
+            else:
+                self._hand_over(batch, work)
+
+            if self.stopped.is_set():
+                return
+
+            # the rest of the sort, which nobody is watching
+            for _ in sorter:
+                pass
+
+        except BaseException as e:
+            self.error = e
+
+        finally:
+            self.result = work
+            self.done.set()
@@ -1,10 +1,15 @@
 from vizsort.lib._type_hint import CT
+from vizsort.lib.fast_path import with_fast_path
+from vizsort.lib.keyed import with_key
+from vizsort.lib.step import Step, COMPARE, SWAP, READ
 from typing import Iterable, MutableSequence
 
 __all__ = ["bubble_sort", "insertion_sort", "selection_sort"]
 
 
-def bubble_sort(arr: MutableSequence[CT], start: int = 0, end: int = None) -> Iterable[CT]:
+@with_key
+@with_fast_path
+def bubble_sort(arr: MutableSequence[CT], start: int = 0, end: int = None) -> Iterable[Step]:
     """excecutes bubble sort on the given array in-place
     [Process]
     1. for every element in the array, compare its value to the value of the next element
@@ -22,17 +27,19 @@ def bubble_sort(arr: MutableSequence[CT], start: int = 0, end: int = None) -> It
     for i in range(start, end + 1):
 
         # for every element up-till the last 'i' element
-        for j in range(end - i):
+        for j in range(start, end - (i - start)):
 
-            yield arr[j, True]
             # compare the element's value with its predecessor's value
             k = j + 1
+            yield Step(COMPARE, j, k)
             if arr[j] > arr[k]:
                 arr[j], arr[k] = arr[k], arr[j]
-                yield arr[k, True]
+                yield Step(SWAP, j, k)
 
 
-def insertion_sort(arr: MutableSequence[CT], start: int = 0, end: int = None) -> Iterable[CT]:
+@with_key
+@with_fast_path
+def insertion_sort(arr: MutableSequence[CT], start: int = 0, end: int = None) -> Iterable[Step]:
     """excecutes insertion sort on the given array in-place
 
     [Process]
@@ -55,14 +62,19 @@ def insertion_sort(arr: MutableSequence[CT], start: int = 0, end: int = None) ->
         end = len(arr) - 1
 
     for i in range(start + 1, end + 1):
-        yield arr[i, True]
-        while i > start and arr[i - 1] > arr[i]:
+        yield Step(READ, i)
+        while i > start:
+            yield Step(COMPARE, i - 1, i)
+            if not arr[i - 1] > arr[i]:
+                break
             arr[i - 1], arr[i] = arr[i], arr[i - 1]
-            yield arr[i - 1, True]
+            yield Step(SWAP, i - 1, i)
             i -= 1
 
 
-def selection_sort(arr: MutableSequence[CT], start: int = 0, end: int = None) -> MutableSequence[CT]:
+@with_key
+@with_fast_path
+def selection_sort(arr: MutableSequence[CT], start: int = 0, end: int = None) -> Iterable[Step]:
     """excecutes selection sort on the given array in-place
 
     [Process]
@@ -82,17 +94,17 @@ def selection_sort(arr: MutableSequence[CT], start: int = 0, end: int = None) ->
 
         # looping through to find a smaller value
         min_elem_index = i
-        for j in range(i, end + 1):
+        for j in range(i + 1, end + 1):
             _elem = arr[j]
 
+            yield Step(COMPARE, j, min_elem_index)
             if _elem < elem:
                 min_elem_index = j
                 elem = _elem
 
-            yield _elem
-
         # swap if a new minimum value has been found
         if min_elem_index != i:
             arr[i], arr[min_elem_index] = arr[min_elem_index], arr[i]
+            yield Step(SWAP, i, min_elem_index)
 
     return arr
@@ -0,0 +1,129 @@
+from importlib import import_module
+from typing import Callable, Dict, Iterable, MutableSequence, NamedTuple, Tuple, Union
+import warnings
+
+__all__ = ["AlgorithmInfo", "register", "algorithms", "get_algorithm", "ENTRY_POINT_GROUP"]
+
+
+# third-party packages register their algorithms under this entry point group, every entry point pointing to either
+# an AlgorithmInfo, or to a sorting algorithm itself, which then gets registered under the entry point's name
+ENTRY_POINT_GROUP = "vizsort.algorithms"
+
+COMPARABLE = ("comparable",)
+NUMERIC = ("int", "float")
+
+
+class AlgorithmInfo(NamedTuple):
+    """
+    a registered sorting algorithm & what is known about it
+
+    [Fields]
+    name: the name the algorithm is registered under
+    target: where to import the algorithm from, as "module:attribute", or the algorithm itself
+    complexity: the average time complexity, written the same way as in the docstrings of the algorithms
+    stable: whether elements that compare equal keep their order, without a key (every algorithm is stable with one)
+    in_place: whether the algorithm sorts without an auxiliary array proportional to the input
+    input_types: the kind of elements the algorithm can sort, "comparable" being anything that supports <
+
+    """
+
+    name: str
+    target: Union[str, Callable]
+    complexity: str
+    stable: bool
+    in_place: bool
+    input_types: Tuple[str, ...] = COMPARABLE
+
+    def load(self) -> Callable[[MutableSequence], Iterable]:
+        """imports the algorithm, which is only done the first time it's needed"""
+        if callable(self.target):
+            return self.target
+
+        module_name, _, attribute = self.target.partition(":")
+        return getattr(import_module(module_name), attribute)
+
+
+_ALGORITHMS: Dict[str, AlgorithmInfo] = {}
+_plugins_loaded = False
+
+
+def register(
+    name: str,
+    target: Union[str, Callable],
+    complexity: str,
+    stable: bool,
+    in_place: bool,
+    input_types: Tuple[str, ...] = COMPARABLE,
+) -> AlgorithmInfo:
+    info = AlgorithmInfo(name, target, complexity, stable, in_place, tuple(input_types))
+    _ALGORITHMS[name] = info
+    return info
+
+
+def _load_plugins() -> None:
+    global _plugins_loaded
+    _plugins_loaded = True
+
+    from importlib.metadata import entry_points
+
+    found = entry_points()
+    # the selection api only exists since python 3.10
+    found = found.select(group=ENTRY_POINT_GROUP) if hasattr(found, "select") else found.get(ENTRY_POINT_GROUP, ())
+
+    for entry_point in found:
+        # a broken plugin shouldn't take the rest of the algorithms down with it
+        try:
+            target = entry_point.load()
+        except Exception as e:
+            warnings.warn(f"failed to load the sorting algorithm {entry_point.name!r}: {e}")
+            continue
+
+        if isinstance(target, AlgorithmInfo):
+            _ALGORITHMS[target.name] = target
+        else:
+            register(entry_point.name, target, complexity="unknown", stable=False, in_place=False)
+
+
+def algorithms() -> Dict[str, AlgorithmInfo]:
+    """every registered algorithm by name, including the ones registered through entry points"""
+    if not _plugins_loaded:
+        _load_plugins()
+    return dict(_ALGORITHMS)
+
+
+def get_algorithm(name: str) -> Callable[[MutableSequence], Iterable]:
+    return algorithms()[name].load()
+
+
+register("bubble_sort", "vizsort.lib.quadratic_sort:bubble_sort", "N^2", stable=True, in_place=True)
+register("insertion_sort", "vizsort.lib.quadratic_sort:insertion_sort", "N^2", stable=True, in_place=True)
+register("selection_sort", "vizsort.lib.quadratic_sort:selection_sort", "N^2", stable=False, in_place=True)
+register("merge_sort", "vizsort.lib.logarithmic_sort:merge_sort", "N log N", stable=True, in_place=False)
+register(
+    "bottom_up_merge_sort", "vizsort.lib.logarithmic_sort:bottom_up_merge_sort", "N log N", stable=True, in_place=False
+)
+register("tim_sort", "vizsort.lib.logarithmic_sort:tim_sort", "N log N", stable=True, in_place=False)
+register(
+    "radix_sort",
+    "vizsort.lib.logarithmic_sort:radix_sort",
+    "N * (number of digits)",
+    stable=True,
+    in_place=False,
+    input_types=NUMERIC,
+)
+register("auto_sort", "vizsort.lib.adaptive:auto_sort", "that of the chosen algorithm", stable=False, in_place=False)
+register("quick_sort", "vizsort.lib.logarithmic_sort:quick_sort", "N log N", stable=False, in_place=True)
+register(
+    "iterative_quick_sort", "vizsort.lib.logarithmic_sort:iterative_quick_sort", "N log N", stable=False, in_place=True
+)
+register("heap_sort", "vizsort.lib.logarithmic_sort:heap_sort", "N log N", stable=False, in_place=True)
+register("intro_sort", "vizsort.lib.logarithmic_sort:intro_sort", "N log N", stable=False, in_place=True)
+register("block_merge_sort", "vizsort.lib.logarithmic_sort:block_merge_sort", "N log^2 N", stable=True, in_place=True)
+register(
+    "parallel_sort",
+    "vizsort.lib.parallel:parallel_sort",
+    "(N / workers) log N + N",
+    stable=True,
+    in_place=False,
+    input_types=NUMERIC,
+)
@@ -0,0 +1,159 @@
+from vizsort.lib._type_hint import CT
+from vizsort.lib.fast_path import with_fast_path
+from vizsort.lib.keyed import with_key
+from vizsort.lib.logarithmic_sort import (
+    INSERTION_SORT_THRESHOLD,
+    _choose_pivot,
+    _partition3,
+    _sift_down,
+    heap_sort,
+)
+from vizsort.lib.quadratic_sort import insertion_sort
+from vizsort.lib.step import Step, COMPARE, SWAP
+from typing import Iterable, MutableSequence
+
+__all__ = ["nth_element", "partial_sort", "top_k"]
+
+
+# the size of the groups whose medians the median of medians is taken of
+GROUP_SIZE = 5
+
+
+@with_fast_path
+def _median_of_medians(arr: MutableSequence[CT], start: int, end: int) -> Iterable[Step]:
+    """
+    returns the index of a pivot with at least 3/10 of arr[start : end + 1] on either side of it,
+    which is the median of the medians of every group of 5 elements
+
+    """
+    # the median of every group gets moved to the front of the range, where the median of those gets selected from
+    medians_end = start
+    for lo in range(start, end + 1, GROUP_SIZE):
+        hi = min(lo + GROUP_SIZE - 1, end)
+        yield from insertion_sort(arr, lo, hi)
+
+        median = lo + (hi - lo) // 2
+        if median != medians_end:
+            arr[medians_end], arr[median] = arr[median], arr[medians_end]
+            yield Step(SWAP, medians_end, median)
+        medians_end += 1
+
+    nth = start + (medians_end - 1 - start) // 2
+    yield from _select(arr, start, medians_end - 1, nth, True)
+    return nth
+
+
+@with_fast_path
+def _select(arr: MutableSequence[CT], start: int, end: int, nth: int, median_of_medians: bool) -> Iterable[Step]:
+    # if quickselect's pivots haven't halved the range after every 2 partitions, median of medians takes over
+    partitions, checkpoint = 0, end - start + 1
+
+    while end - start + 1 > INSERTION_SORT_THRESHOLD:
+        if median_of_medians:
+            pivot_index = yield from _median_of_medians(arr, start, end)
+        else:
+            pivot_index = yield from _choose_pivot(arr, start, end)
+
+        lt, gt = yield from _partition3(arr, start, end, pivot_index)
+        if nth < lt:
+            end = lt - 1
+        elif nth > gt:
+            start = gt + 1
+        else:
+            return
+
+        partitions += 1
+        if partitions == 2:
+            median_of_medians = median_of_medians or end - start + 1 > checkpoint // 2
+            partitions, checkpoint = 0, end - start + 1
+
+    yield from insertion_sort(arr, start, end)
+
+
+@with_key(positional=True)
+@with_fast_path
+def nth_element(arr: MutableSequence[CT], nth: int, start: int = 0, end: int = None) -> Iterable[Step]:
+    """
+    rearranges the given array in place so that arr[nth] is the element that would be there if it was sorted,
+    with nothing after it being smaller & nothing before it being greater, e.g nth_element(arr, len(arr) // 2)
+    moves the median into the middle
+
+    [Process]
+    1. pick the pivot as the median of three or tukey's ninther & three-way partition the range around it,
+       the same way intro sort does
+
+    2. keep only the side of the partition that nth is in, stopping once nth is among the elements equal to the pivot
+
+    3. if the range hasn't at least halved over the last 2 partitions, switch to the median of medians for the pivot,
+       which always leaves at least 3/10 of the range on either side of it
+
+    4. ranges smaller than the threshold get insertion sorted instead
+
+    [Time Complexity]: N, with the median of medians guaranteeing it in the worst case too
+
+    """
+    if end is None:
+        end = len(arr) - 1
+    if not start <= nth <= end:
+        raise IndexError(f"nth must be within {start} & {end}, got {nth}")
+
+    yield from _select(arr, start, end, nth, False)
+
+
+@with_key(positional=True)
+@with_fast_path
+def partial_sort(arr: MutableSequence[CT], k: int, start: int = 0, end: int = None) -> Iterable[Step]:
+    """
+    sorts the k smallest elements of the given array into arr[start : start + k], in place,
+    leaving the rest of the elements after them in no particular order
+
+    [Process]
+    1. turn the first k elements into a max-heap, its root being the largest of the k smallest elements seen so far
+
+    2. compare every other element with the root, and if it's smaller, swap it with the root & sift it down
+
+    3. heap sort the heap, which holds the k smallest elements by then
+
+    [Time Complexity]: N log K
+
+    """
+    if end is None:
+        end = len(arr) - 1
+    k = min(k, end - start + 1)
+    if k < 1:
+        return
+
+    for root in range(k // 2 - 1, -1, -1):
+        yield from _sift_down(arr, start, root, k)
+
+    for i in range(start + k, end + 1):
+        yield Step(COMPARE, i, start)
+        if arr[i] < arr[start]:
+            arr[start], arr[i] = arr[i], arr[start]
+            yield Step(SWAP, start, i)
+            yield from _sift_down(arr, start, 0, k)
+
+    yield from heap_sort(arr, start, start + k - 1)
+
+
+@with_key(positional=True)
+@with_fast_path
+def top_k(arr: MutableSequence[CT], k: int, start: int = 0, end: int = None) -> Iterable[Step]:
+    """
+    moves the k smallest elements of the given array (or the k largest, with reverse) into arr[start : start + k],
+    in place & in no particular order, which is all it takes when they don't have to be sorted
+
+    [Process]
+    1. select the kth smallest element with nth_element, which leaves every element smaller than it before it
+
+    [Time Complexity]: N
+
+    """
+    if end is None:
+        end = len(arr) - 1
+    if not 0 <= k <= end - start + 1:
+        raise IndexError(f"k must be within 0 & {end - start + 1}, got {k}")
+    if k in (0, end - start + 1):
+        return
+
+    yield from _select(arr, start, end, start + k - 1, False)
@@ -0,0 +1,32 @@
+from typing import NamedTuple, Optional
+
+__all__ = ["Step", "READ", "COMPARE", "SWAP", "WRITE"]
+
+
+READ = 0
+COMPARE = 1
+SWAP = 2
+WRITE = 3
+
+
+class Step(NamedTuple):
+    """
+    a single operation performed by a sorting algorithm, yielded by every generator in vizsort.lib
+
+    [Fields]
+    op: the kind of operation, one of READ, COMPARE, SWAP or WRITE
+    i: the index that the operation acted on
+    j: the other index for COMPARE & SWAP, None for READ & WRITE
+
+    [Protocol]
+    - a COMPARE step is yielded for every comparison made between two elements of the array,
+      an element that has been copied out of the array (e.g into a merge's temporary array) is named by the index
+      it was copied out of, which may have been written over since
+    - every mutation of the array is announced by a SWAP or WRITE step, yielded right after the mutation,
+      so whoever is consuming the steps always sees the array in the state that the step describes
+
+    """
+
+    op: int
+    i: int
+    j: Optional[int] = None
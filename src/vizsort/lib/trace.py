@@ -0,0 +1,268 @@
+from array import array
+from bisect import bisect_right
+from mmap import mmap, ACCESS_READ
+from typing import Callable, Iterable, List, MutableSequence, Tuple, Union
+import os
+import struct
+
+from vizsort.lib.step import Step, SWAP, WRITE
+
+__all__ = ["record_trace", "TraceReplay"]
+
+
+MAGIC = b"VIZTRACE"
+VERSION = 1
+
+# the steps between keyframes, which is scaled up with the size of the array so that the snapshots stay cheap
+MIN_KEYFRAME_INTERVAL = 4096
+
+# the lowest 4 bits of every record's head: the op, whether j is given & whether the record is a keyframe
+HAS_J = 0b0100
+KEYFRAME = 0b1000
+
+KEYFRAME_ENTRY = struct.Struct("<QQ")
+TRAILER = struct.Struct("<QQQ")
+
+FLUSH_SIZE = 1 << 16
+
+
+def _zigzag(x: int) -> int:
+    return x << 1 if x >= 0 else ((-x) << 1) - 1
+
+
+def _unzigzag(z: int) -> int:
+    return (z >> 1) ^ -(z & 1)
+
+
+def _put_varint(buffer: bytearray, x: int) -> None:
+    while x > 0x7F:
+        buffer.append((x & 0x7F) | 0x80)
+        x >>= 7
+    buffer.append(x)
+
+
+def _get_varint(data, offset: int) -> Tuple[int, int]:
+    x = shift = 0
+    while True:
+        byte = data[offset]
+        offset += 1
+        x |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return x, offset
+        shift += 7
+
+
+def _put_keyframe(buffer: bytearray, arr: List[int]) -> None:
+    buffer.append(KEYFRAME)
+    for elem in arr:
+        _put_varint(buffer, _zigzag(elem))
+
+
+def record_trace(
+    sort_algo: Callable[[MutableSequence[int]], Iterable[Step]],
+    arr: Iterable[int],
+    path: Union[str, os.PathLike],
+    keyframe_interval: int = None,
+) -> int:
+    """
+    runs the sorting algorithm on a copy of the array of ints, recording every step it yields into a trace file,
+    returns the number of steps recorded
+
+    [Format]
+    header: the magic bytes, the version & the size of the array as a varint
+
+    records: one per step, starting with a varint head of the zigzagged delta of i from the previous record's i,
+    shifted past the op & the HAS_J flag, followed by the zigzagged delta of j from i (if given),
+    and for WRITE steps, the zigzagged value written, that being the only thing that can't be inferred from the step
+
+    keyframes: a record with only the KEYFRAME flag set, followed by the zigzagged value of every element,
+    written before the first step & after every keyframe_interval steps, with the delta of i restarting from 0
+
+    trailer: the (step index, file offset) of every keyframe, followed by the offset of that table,
+    the number of keyframes & the number of steps
+
+    """
+    arr = list(arr)
+    if keyframe_interval is None:
+        keyframe_interval = max(MIN_KEYFRAME_INTERVAL, 2 * len(arr))
+
+    keyframes = []
+    num_steps = 0
+
+    with open(path, "wb") as file:
+        buffer = bytearray(MAGIC)
+        buffer.append(VERSION)
+        _put_varint(buffer, len(arr))
+        offset = 0
+
+        keyframes.append((0, offset + len(buffer)))
+        _put_keyframe(buffer, arr)
+
+        prev_i = 0
+        for step in sort_algo(arr):
+            op, i, j = step
+            if j is None:
+                _put_varint(buffer, _zigzag(i - prev_i) << 4 | op)
+            else:
+                _put_varint(buffer, _zigzag(i - prev_i) << 4 | HAS_J | op)
+                _put_varint(buffer, _zigzag(j - i))
+
+            if op == WRITE:
+                _put_varint(buffer, _zigzag(arr[i]))
+
+            prev_i = i
+            num_steps += 1
+
+            # the state of the array after the step that was just recorded
+            if num_steps % keyframe_interval == 0:
+                keyframes.append((num_steps, offset + len(buffer)))
+                _put_keyframe(buffer, arr)
+                prev_i = 0
+
+            if len(buffer) >= FLUSH_SIZE:
+                file.write(buffer)
+                offset += len(buffer)
+                buffer.clear()
+
+        table_offset = offset + len(buffer)
+        for keyframe in keyframes:
+            buffer += KEYFRAME_ENTRY.pack(*keyframe)
+        buffer += TRAILER.pack(table_offset, len(keyframes), num_steps)
+        file.write(buffer)
+
+    return num_steps
+
+
+class TraceReplay:
+    """
+    replays a trace recorded by record_trace onto an array, without re-running the sorting algorithm
+
+    the replay is an iterator of the recorded steps, every step being applied to the array right before it is yielded,
+    which makes it a drop-in replacement for the generator of a sorting algorithm
+
+    [Navigation]
+    seek: jumps to the state right before the given step, by restoring the keyframe before it & replaying the rest
+    rewind: jumps back to the start
+
+    [Note]
+    the file is memory-mapped, so only the parts of the trace that are replayed get read from disk
+
+    """
+
+    def __init__(self, path: Union[str, os.PathLike], arr: MutableSequence[int] = None) -> None:
+        self.file = open(path, "rb")
+        self.data = mmap(self.file.fileno(), 0, access=ACCESS_READ)
+
+        if self.data[: len(MAGIC)] != MAGIC or self.data[len(MAGIC)] != VERSION:
+            self.close()
+            raise ValueError(f"{path} is not a vizsort trace")
+
+        self.size, _ = _get_varint(self.data, len(MAGIC) + 1)
+
+        table_offset, num_keyframes, self.num_steps = TRAILER.unpack_from(self.data, len(self.data) - TRAILER.size)
+        self.keyframes: List[Tuple[int, int]] = [
+            KEYFRAME_ENTRY.unpack_from(self.data, table_offset + k * KEYFRAME_ENTRY.size) for k in range(num_keyframes)
+        ]
+        self.keyframe_steps = [step for step, _ in self.keyframes]
+
+        self.arr = [0] * self.size if arr is None else arr
+        if len(self.arr) != self.size:
+            self.close()
+            raise ValueError(f"the trace is of an array of size {self.size}, not {len(self.arr)}")
+
+        self.position = 0
+        self.offset = 0
+        self.prev_i = 0
+        self.rewind()
+
+    def __enter__(self) -> "TraceReplay":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return self.num_steps
+
+    def __iter__(self) -> "TraceReplay":
+        return self
+
+    def __next__(self) -> Step:
+        if self.position >= self.num_steps:
+            raise StopIteration
+
+        # most of the varints fit in a single byte, so that case skips the call
+        data = self.data
+        offset = self.offset
+        head = data[offset]
+        if head < 0x80:
+            offset += 1
+        else:
+            head, offset = _get_varint(data, offset)
+
+        if head & KEYFRAME:
+            # the array is already in the state of the keyframe when it's reached by replaying
+            for _ in range(self.size):
+                _, offset = _get_varint(data, offset)
+            self.prev_i = 0
+            head, offset = _get_varint(data, offset)
+
+        op = head & 0b11
+        i = self.prev_i + _unzigzag(head >> 4)
+        j = None
+        if head & HAS_J:
+            z = data[offset]
+            if z < 0x80:
+                offset += 1
+            else:
+                z, offset = _get_varint(data, offset)
+            j = i + _unzigzag(z)
+
+        arr = self.arr
+        if op == SWAP:
+            arr[i], arr[j] = arr[j], arr[i]
+        elif op == WRITE:
+            z, offset = _get_varint(data, offset)
+            arr[i] = _unzigzag(z)
+
+        self.offset = offset
+        self.prev_i = i
+        self.position += 1
+        return Step(op, i, j)
+
+    def seek(self, step: int) -> None:
+        step = max(0, min(step, self.num_steps))
+        keyframe_step, keyframe_offset = self.keyframes[bisect_right(self.keyframe_steps, step) - 1]
+
+        # carrying on from the current position is cheaper than restoring the keyframe, as long as it's after it
+        if not keyframe_step <= self.position <= step:
+            self._restore(keyframe_step, keyframe_offset)
+
+        while self.position < step:
+            next(self)
+
+    def rewind(self) -> None:
+        self._restore(*self.keyframes[0])
+
+    def close(self) -> None:
+        self.data.close()
+        self.file.close()
+
+    def _restore(self, keyframe_step: int, keyframe_offset: int) -> None:
+        data = self.data
+        offset = keyframe_offset + 1
+
+        elements = []
+        for _ in range(self.size):
+            z, offset = _get_varint(data, offset)
+            elements.append(_unzigzag(z))
+
+        # a bulk write, so that the counting arrays only see a single write
+        if isinstance(self.arr, array):
+            self.arr[:] = array(self.arr.typecode, elements)
+        else:
+            self.arr[:] = elements
+
+        self.position = keyframe_step
+        self.offset = offset
+        self.prev_i = 0
@@ -1,27 +1,275 @@
+from array import array
 from collections import deque
-from typing import Iterable, Any, Tuple
+from itertools import islice
+from time import perf_counter
+from typing import Dict, Iterator, Iterable, Any, List
+import random
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+__all__ = ["exhaust", "StepScheduler", "OperationLoggingList", "OperationLoggingArray"]
+
+from vizsort.lib.step import Step, COMPARE, SWAP
 
 
 def exhaust(__i: Iterable) -> None:
     deque(__i, 0)
 
 
-class OperationLoggingList(list):
-    def __init__(self) -> None:
-        super().__init__()
-        self.num_array_reads = 0
-        self.num_array_write = 0
+class StepScheduler:
+    """
+    decides how many steps of a sorter get advanced per rendered frame
+
+    [Modes]
+    adaptive (steps_per_frame == 0): keep draining steps in chunks until the per-frame time budget is used up
+    fixed (steps_per_frame > 0): advance exactly that many steps per frame
+
+    a single scheduler can also be shared by several sorters through advance_all, which splits every frame between them
+
+    """
+
+    def __init__(self, fps: int, time_budget: float = 0.5, steps_per_frame: int = 0, chunk_size: int = 64) -> None:
+        # the fraction of a frame's duration that is allowed to be spent on advancing the sorter
+        self.frame_budget = time_budget / fps
+        self.steps_per_frame = steps_per_frame
+        self.chunk_size = chunk_size
+
+        self.exhausted = False
+        self.last_step_count = 0
+        # the indices of the sorters given to advance_all that have run out of steps
+        self.finished = set()
+
+    @property
+    def adaptive(self) -> bool:
+        return self.steps_per_frame == 0
 
     def reset(self) -> None:
+        self.exhausted = False
+        self.last_step_count = 0
+        self.finished.clear()
+
+    def speed_up(self) -> None:
+        self.steps_per_frame = max(self.steps_per_frame, self.last_step_count, 1) * 2
+
+    def slow_down(self) -> None:
+        self.steps_per_frame = max(max(self.steps_per_frame, self.last_step_count) // 2, 1)
+
+    def set_adaptive(self) -> None:
+        self.steps_per_frame = 0
+
+    def advance(self, sorter: Iterator[Any], limit: int = None) -> List[Any]:
+        """
+        advances the sorter by one frame's worth of steps, returning the steps in the order they were yielded,
+        never taking more than limit steps, i.e for a sorter that can only give out so many steps without blocking
+        """
+        if not self.adaptive:
+            num_steps = self.steps_per_frame if limit is None else min(self.steps_per_frame, limit)
+            steps = list(islice(sorter, num_steps))
+            self.exhausted = len(steps) < num_steps
+            self.last_step_count = len(steps)
+            return steps
+
+        # checking the clock on every step would cost more than the steps themselves, so do it per chunk
+        steps = []
+        deadline = perf_counter() + self.frame_budget
+        while limit is None or len(steps) < limit:
+            chunk_size = self.chunk_size if limit is None else min(self.chunk_size, limit - len(steps))
+            chunk = list(islice(sorter, chunk_size))
+            steps.extend(chunk)
+
+            if len(chunk) < chunk_size:
+                self.exhausted = True
+                break
+
+            if perf_counter() >= deadline:
+                break
+
+        self.last_step_count = len(steps)
+        return steps
+
+    def advance_all(self, sorters: List[Iterator[Any]], limits: List[int] = None) -> List[List[Any]]:
+        """
+        advances every sorter by the same number of steps within one frame, returning the steps of every sorter,
+        with the sorters that have run out of steps being skipped, and the scheduler exhausted once all of them are
+
+        [Note]
+        in adaptive mode, the sorters are advanced round-robin a chunk at a time until the time budget is used up,
+        so the budget is split by steps & not by time: a sorter whose steps are slow to take doesn't fall behind
+        the others, it slows them down instead
+
+        """
+        if limits is None:
+            limits = [None] * len(sorters)
+
+        steps = [[] for _ in sorters]
+        active = [k for k in range(len(sorters)) if k not in self.finished]
+
+        deadline = perf_counter() + self.frame_budget
+        while active:
+            for k in active:
+                chunk_size = self.steps_per_frame if not self.adaptive else self.chunk_size
+                if limits[k] is not None:
+                    chunk_size = min(chunk_size, limits[k] - len(steps[k]))
+
+                chunk = list(islice(sorters[k], chunk_size))
+                steps[k].extend(chunk)
+                if len(chunk) < chunk_size:
+                    self.finished.add(k)
+
+            if not self.adaptive or perf_counter() >= deadline:
+                break
+
+            active = [k for k in active if k not in self.finished and (limits[k] is None or len(steps[k]) < limits[k])]
+
+        self.exhausted = len(self.finished) == len(sorters)
+        self.last_step_count = max(map(len, steps), default=0)
+        return steps
+
+
+class _OperationCounter:
+    # the counters shared by the logging containers, which swap their class to turn the counting on & off
+
+    def _init_counters(self) -> None:
         self.num_array_reads = 0
         self.num_array_write = 0
+        self.num_comparisons = 0
+        self.num_swaps = 0
+
+    @property
+    def stats(self) -> Dict[str, int]:
+        return {
+            "reads": self.num_array_reads,
+            "writes": self.num_array_write,
+            "comparisons": self.num_comparisons,
+            "swaps": self.num_swaps,
+        }
+
+    def reset(self) -> None:
+        self._init_counters()
+
+    def count_steps(self, steps: List[Step]) -> None:
+        if not self.logging:
+            return
+
+        ops = [step[0] for step in steps]
+        self.num_comparisons += ops.count(COMPARE)
+        self.num_swaps += ops.count(SWAP)
+
+    def run(self, sorter: Iterable[Step], chunk_size: int = 4096) -> None:
+        """exhausts the sorter while counting its steps"""
+        sorter = iter(sorter)
+        while steps := list(islice(sorter, chunk_size)):
+            self.count_steps(steps)
+
+
+class OperationLoggingList(_OperationCounter, list):
+    """
+    list that keeps count of the operations a sorting algorithm performs on it
+
+    [Counters]
+    num_array_reads & num_array_write: incremented by every indexing made on the list
+    num_comparisons & num_swaps: incremented by the COMPARE & SWAP steps handed to count_steps
+
+    [Note]
+    peek can be used to read an element without it being counted,
+    and logging can be turned off entirely, after which the list runs at the speed of a plain list
+
+    """
+
+    def __init__(self, __iterable: Iterable[Any] = ()) -> None:
+        super().__init__(__iterable)
+        self._init_counters()
+        self.logging = True
+
+    @property
+    def logging(self) -> bool:
+        return isinstance(self, _LoggedList)
+
+    @logging.setter
+    def logging(self, enabled: bool) -> None:
+        # the counting indexing lives in a subclass that gets swapped in & out,
+        # so with logging turned off the list has no python-level indexing at all
+        self.__class__ = _LoggedList if enabled else OperationLoggingList
+
+    def peek(self, __i: int) -> Any:
+        return list.__getitem__(self, __i)
+
+
+class _LoggedList(OperationLoggingList):
+    def __getitem__(self, __i: int) -> Any:
+        self.num_array_reads += 1
+        return list.__getitem__(self, __i)
+
+    def __setitem__(self, __i: int, __val: Any) -> None:
+        self.num_array_write += 1
+        list.__setitem__(self, __i, __val)
+
+
+class OperationLoggingArray(_OperationCounter, array):
+    """
+    compact counterpart of OperationLoggingList, holding its elements as raw machine values in an array.array,
+    i.e 4 bytes per element with the default typecode instead of a pointer to a boxed int
+
+    [Counters]
+    same as OperationLoggingList, with the same peek & logging
+
+    [Bulk Operations]
+    view: a zero-copy numpy view of the elements (a memoryview without numpy), which follows every write made
+    regenerate & shuffle: refill the array with 1..n & shuffle it, without going through the counting indexing
+
+    [Note]
+    the array can't change its size while a view of it is alive, so views have to be dropped before regenerating
+
+    """
+
+    def __new__(cls, __typecode: str = "i", __iterable: Iterable[Any] = ()) -> "OperationLoggingArray":
+        return super().__new__(cls, __typecode, __iterable)
+
+    def __init__(self, __typecode: str = "i", __iterable: Iterable[Any] = ()) -> None:
+        self._init_counters()
+        self.logging = True
+
+    @property
+    def logging(self) -> bool:
+        return isinstance(self, _LoggedArray)
+
+    @logging.setter
+    def logging(self, enabled: bool) -> None:
+        self.__class__ = _LoggedArray if enabled else OperationLoggingArray
+
+    def peek(self, __i: int) -> Any:
+        return array.__getitem__(self, __i)
+
+    def view(self) -> Any:
+        if np is None:
+            return memoryview(self)
+        return np.frombuffer(self, dtype=self.typecode)
+
+    def regenerate(self, n: int, rng: random.Random = random) -> None:
+        array.__delitem__(self, slice(None))
+        self.extend(range(1, n + 1))
+        self.shuffle(rng)
+
+    def load(self, __iterable: Iterable[Any]) -> None:
+        # replaces every element in bulk, which isn't counted as a write
+        array.__delitem__(self, slice(None))
+        self.extend(__iterable)
+
+    def shuffle(self, rng: random.Random = random) -> None:
+        # shuffling a plain list & copying it back in bulk beats shuffling through the array's indexing
+        elements = self.tolist()
+        rng.shuffle(elements)
+        array.__setitem__(self, slice(None), array(self.typecode, elements))
+
 
-    def __getitem__(self, __i: int | Tuple[int, bool]) -> Any:
-        if not isinstance(__i, tuple):
-            self.num_array_reads += 1
-            return super().__getitem__(__i)
-        return super().__getitem__(__i[0])
+class _LoggedArray(OperationLoggingArray):
+    def __getitem__(self, __i: int) -> Any:
+        self.num_array_reads += 1
+        return array.__getitem__(self, __i)
 
     def __setitem__(self, __i: int, __val: Any) -> None:
         self.num_array_write += 1
-        super().__setitem__(__i, __val)
+        array.__setitem__(self, __i, __val)
@@ -0,0 +1,215 @@
+"""
+profiles the operations of the sorting algorithms in vizsort.lib phase by phase, over growing dataset sizes,
+& fits the counts to the n, n log n & n^2 complexity models, reporting their constant factors
+
+usage: python -m vizsort.profiler [--algorithms ...] [--sizes ...] [--distribution NAME] [--format text|json]
+"""
+
+from typing import Callable, Dict, Iterable, Iterator, List, MutableSequence, Sequence
+import argparse
+import json
+import math
+import random
+
+import vizsort.lib
+from vizsort.bench import DISTRIBUTIONS
+
+__all__ = ["PHASES", "MODELS", "phase_of", "profile_run", "fit", "profile", "format_report", "main"]
+
+
+# the phase the steps of a helper generator are attributed to, by the helper's name,
+# the steps of any other generator are attributed to a phase named after the generator itself
+PHASES: Dict[str, str] = {
+    "_partition": "partition",
+    "_partition3": "partition",
+    "_choose_pivot": "pivot selection",
+    "_median_of_three": "pivot selection",
+    "_median_of_medians": "pivot selection",
+    "merge": "merge",
+    "merge_lo": "merge",
+    "merge_hi": "merge",
+    "_sym_merge": "merge",
+    "_rotate": "rotation",
+    "_gallop_left": "gallop",
+    "_gallop_right": "gallop",
+    "count_run": "run detection",
+    "binary_insertion_sort": "insertion",
+    "insertion_sort": "insertion",
+    "digit_pass": "digit pass",
+    "_sift_down": "sift down",
+}
+
+MODELS: Dict[str, Callable[[int], float]] = {
+    "n": lambda n: n,
+    "n log n": lambda n: n * math.log2(n),
+    "n^2": lambda n: n * n,
+}
+
+# steps being every step yielded, which for radix_sort is mostly READ steps of its keys, not counted as array reads
+METRICS = ("steps", "comparisons", "swaps", "reads", "writes")
+
+DEFAULT_SIZES = (100, 200, 400, 800, 1600)
+
+
+def phase_of(sorter: Iterator) -> str:
+    """the phase of the step the sorter has just yielded, found by following its yield froms to the innermost one"""
+    generator = sorter
+    while getattr(generator, "gi_yieldfrom", None) is not None and hasattr(generator.gi_yieldfrom, "gi_code"):
+        generator = generator.gi_yieldfrom
+
+    name = generator.gi_code.co_name if hasattr(generator, "gi_code") else type(generator).__name__
+    return PHASES.get(name, name)
+
+
+def profile_run(sort_algo: Callable[[MutableSequence], Iterable], data: List) -> Dict[str, Dict[str, int]]:
+    """
+    runs the sorting algorithm on a copy of the data & returns the counts of every metric by phase,
+    along with their totals under "total"
+
+    [Process]
+    1. take a step of the sorter, and find the phase of the generator that yielded it
+
+    2. count the step's comparison or swap for the phase, along with the reads & writes made since the previous step,
+       which were made by the generator on its way to the step
+
+    """
+    arr = vizsort.lib.OperationLoggingList(data)
+    sorter = iter(sort_algo(arr))
+
+    phases: Dict[str, Dict[str, int]] = {}
+    reads = writes = 0
+    for op, _, _ in sorter:
+        phase = phases.get(phase_of(sorter))
+        if phase is None:
+            phase = phases[phase_of(sorter)] = dict.fromkeys(METRICS, 0)
+
+        phase["steps"] += 1
+        if op == vizsort.lib.COMPARE:
+            phase["comparisons"] += 1
+        elif op == vizsort.lib.SWAP:
+            phase["swaps"] += 1
+
+        phase["reads"] += arr.num_array_reads - reads
+        phase["writes"] += arr.num_array_write - writes
+        reads, writes = arr.num_array_reads, arr.num_array_write
+
+    if arr != sorted(data):
+        raise ValueError(f"{sort_algo.__name__} failed to sort the data")
+
+    phases["total"] = {metric: sum(phase[metric] for phase in phases.values()) for metric in METRICS}
+    # whatever was read or written after the last step belongs to no step, but still to the total
+    phases["total"]["reads"] += arr.num_array_reads - reads
+    phases["total"]["writes"] += arr.num_array_write - writes
+    return phases
+
+
+def fit(sizes: Sequence[int], counts: Sequence[int]) -> Dict[str, Dict[str, float]]:
+    """
+    fits the counts measured at the sizes to every complexity model, count ~ c * model(n),
+    and returns the constant c & the relative error of every fit, from the best fit to the worst
+
+    [Note]
+    the constant is the least squares solution c = sum(count * model(n)) / sum(model(n)^2),
+    and the error is the root mean square of (count - c * model(n)) / count over the non-zero counts
+
+    """
+    fits = {}
+    for model, f in MODELS.items():
+        values = [f(n) for n in sizes]
+        denominator = sum(v * v for v in values)
+        c = sum(count * v for count, v in zip(counts, values)) / denominator if denominator else 0.0
+
+        residuals = [(count - c * v) / count for count, v in zip(counts, values) if count]
+        error = math.sqrt(sum(r * r for r in residuals) / len(residuals)) if residuals else 0.0
+        fits[model] = {"constant": c, "error": error}
+
+    return dict(sorted(fits.items(), key=lambda item: item[1]["error"]))
+
+
+def profile(
+    algorithms: Iterable[str],
+    sizes: Sequence[int] = DEFAULT_SIZES,
+    distribution: str = "random",
+    seed: int = 0,
+) -> Dict[str, Dict[str, object]]:
+    """
+    profiles every algorithm at every size, on the same data for every algorithm,
+    returns by algorithm the counts of every metric by phase (a count per size), along with their fits
+    """
+    sizes = sorted(sizes)
+    datasets = [DISTRIBUTIONS[distribution](size, random.Random(seed)) for size in sizes]
+
+    report = {}
+    for name in algorithms:
+        sort_algo = vizsort.lib.get_algorithm(name)
+        runs = [profile_run(sort_algo, data) for data in datasets]
+
+        # a phase that only shows up at some of the sizes counts as 0 at the others
+        phases = {}
+        for phase in dict.fromkeys(phase for run in runs for phase in run):
+            phases[phase] = {metric: [run.get(phase, {}).get(metric, 0) for run in runs] for metric in METRICS}
+
+        fits = {
+            phase: {metric: fit(sizes, counts) for metric, counts in metrics.items() if any(counts)}
+            for phase, metrics in phases.items()
+        }
+        report[name] = {"sizes": sizes, "phases": phases, "fits": fits}
+
+    return report
+
+
+def format_report(report: Dict[str, Dict[str, object]]) -> str:
+    # a line per phase & metric, with the counts at the largest size & the constant of every model, best fit first
+    lines = []
+    for name, result in report.items():
+        width = max(map(len, result["phases"])) + 2
+        lines.append(f"{name} (n = {', '.join(map(str, result['sizes']))})")
+        lines.append(f"  {'phase':<{width}}{'metric':<13}{'count':>10}  {'best fit':<10}{'error':>7}  constants")
+
+        # the total first, then the phases by their share of the operations
+        phases = sorted(
+            result["phases"],
+            key=lambda phase: (phase != "total", -sum(counts[-1] for counts in result["phases"][phase].values())),
+        )
+        for phase in phases:
+            for metric, fits in result["fits"][phase].items():
+                best = next(iter(fits))
+                constants = "  ".join(f"{model}: {f['constant']:.3g}" for model, f in fits.items())
+                count = result["phases"][phase][metric][-1]
+                lines.append(
+                    f"  {phase:<{width}}{metric:<13}{count:>10}  {best:<10}{fits[best]['error']:>7.1%}  {constants}"
+                )
+
+        lines.append("")
+
+    return "\n".join(lines)
+
+
+def main(argv: List[str] = None) -> None:
+    all_algorithms = list(vizsort.lib.algorithms())
+
+    parser = argparse.ArgumentParser(prog="python -m vizsort.profiler", description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--algorithms", nargs="+", choices=all_algorithms, default=all_algorithms, metavar="NAME")
+    parser.add_argument("--sizes", nargs="+", type=int, default=DEFAULT_SIZES)
+    parser.add_argument("--distribution", choices=list(DISTRIBUTIONS), default="random")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--format", choices=("text", "json"), default="text")
+    parser.add_argument("--output", help="file to write the report to, defaults to stdout")
+    args = parser.parse_args(argv)
+
+    if len(args.sizes) < 2:
+        parser.error("fitting the complexity models takes at least 2 sizes")
+
+    report = profile(args.algorithms, args.sizes, args.distribution, seed=args.seed)
+    output = json.dumps(report, indent=2) if args.format == "json" else format_report(report)
+
+    if args.output is None:
+        print(output)
+        return
+
+    with open(args.output, "w") as file:
+        file.write(output + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+from typing import Iterable, Tuple
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+__all__ = ["rasterize_columns"]
+
+
+def rasterize_columns(
+    pixels: "np.ndarray",
+    values: "np.ndarray",
+    max_value: int,
+    background_color: Tuple[int, int, int],
+    start_color: Tuple[int, int, int],
+    end_color: Tuple[int, int, int],
+    highlight: Iterable[int] = (),
+    highlight_color: Tuple[int, int, int] = None,
+    shifts: Tuple[int, int, int] = None,
+    alpha_mask: int = 0,
+) -> None:
+    """
+    draws every value as a column into a pixel buffer in a single vectorized pass
+
+    the buffer is indexed by (x, y), and can either be
+    a (width, height) array of packed pixels, i.e the array given by pygame.surfarray.pixels2d,
+    in which case the shifts of the red, green & blue channels has to be given
+    or a (width, height, 3) array, i.e the array given by pygame.surfarray.pixels3d
+
+    [Process]
+    1. pick the element that every pixel column of the buffer shows,
+       with more elements than pixel columns, the elements get sampled
+
+    2. get the height & gradient color of each pixel column from the ratio of its element to the max value
+
+    3. fill every pixel that sits under the top of its column with the column's color, the rest with the background
+
+    """
+    w, h = pixels.shape[:2]
+    n = len(values)
+
+    element_indices = np.arange(w) * n // w
+    ratios = values[element_indices] / max_value
+
+    start = np.array(start_color)
+    colors = (ratios[:, None] * (np.array(end_color) - start)).astype(np.int64) + start
+
+    if highlight_color is not None:
+        for index in highlight:
+            if index is None:
+                continue
+            # make sure the highlighted element is visible even when it wasn't sampled
+            first = min(-(-index * w // n), w - 1)
+            last = max(-(-(index + 1) * w // n), first + 1)
+            colors[first:last] = highlight_color
+            ratios[first:last] = values[index] / max_value
+
+    tops = h - (ratios * h).astype(np.int64)
+    mask = np.arange(h)[None, :] >= tops[:, None]
+
+    if pixels.ndim == 3:
+        pixels[...] = np.where(mask[..., None], colors[:, None, :], np.array(background_color))
+        return
+
+    # packing the colors first means only a single channel has to be written for every pixel
+    r_shift, g_shift, b_shift = shifts
+    packed_colors = (colors[:, 0] << r_shift) | (colors[:, 1] << g_shift) | (colors[:, 2] << b_shift) | alpha_mask
+
+    br, bg, bb = background_color
+    packed_background = (br << r_shift) | (bg << g_shift) | (bb << b_shift) | alpha_mask
+
+    pixels[...] = np.where(mask, packed_colors.astype(pixels.dtype)[:, None], pixels.dtype.type(packed_background))
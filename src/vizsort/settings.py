@@ -0,0 +1,86 @@
+from typing import TYPE_CHECKING
+
+import vizsort.render
+
+if TYPE_CHECKING:
+    import pygame
+
+
+class Settings:
+    FPS = 60
+    # fraction of every frame spent on advancing the sorter when the steps per frame is adaptive
+    STEP_TIME_BUDGET = 0.5
+    # 0 means adaptive, anything else is a fixed number of steps advanced per frame
+    STEPS_PER_FRAME = 0
+    # while sorting, only redraw the columns touched since the last frame, straight at screen resolution
+    INCREMENTAL_RENDER = True
+    # past this many dirty rects, a single rect enclosing all of them is cheaper to hand to the display
+    MAX_DIRTY_RECTS = 128
+    # how full frames get drawn, i.e when the incremental renderer is off or not sorting,
+    # "numpy" rasterizes every column in a single vectorized pass, "pygame" draws the columns one by one
+    RENDER_BACKEND = "pygame" if vizsort.render.np is None else "numpy"
+    CAPTION = "VizSort"
+    BACKGROUND_COLOR = (30, 30, 30)
+    SCREEN_RECT_SIZE = (1000, 700)
+
+    SMALL_DATASET = 50
+    MEDIUM_DATASET = 200
+    LARGE_DATASET = 1000
+    HUGE_DATASET = 100000
+    # the typecode of the array holding the dataset, 4 byte ints are plenty for the dataset sizes above
+    DATASET_TYPECODE = "i"
+
+    COLOR_SCHEME_R = ((110, 13, 53), (200, 200, 130), (0, 255, 0))
+    COLOR_SCHEME_G = ((10, 80, 20), (10, 224, 154), (255, 0, 255))
+    COLOR_SCHEME_B = ((13, 53, 156), (130, 200, 200), (255, 0, 0))
+    CURRENT_COLOR_SCHEME = COLOR_SCHEME_B
+
+    FONT_NAME = "Arial"
+    FONT_SIZE = 30
+    FONT: "pygame.font.Font" = None
+
+    FONT_BACKGROUND_COLOR = (50, 37, 89)
+    FONT_DEFAULT_COLOR = (255, 0, 255)
+    FONT_HOVERED_COLOR = (255, 255, 255)
+    FONT_CLICKED_COLOR = (255, 255, 255)
+
+    BUTTON_HOVERED_COLOR = (195, 30, 0)
+    BUTTON_CLICKED_COLOR = (0, 30, 195)
+
+    MENU_SORTING_ALGO_RECT = (740, 60, 250, 630)
+    MENU_DATASET_SIZE_RECT = (10, 640, 350, 50)
+
+    MENU_BACKGROUND_COLOR = (0, 0, 0)
+    MENU_BUTTON_RECT_PADDING = 5
+
+    SORTING_INFO_POSITION = "topleft"
+    SORTING_DISPLAYER_RECT = (0, 0, 3000, 2500)
+
+    MESSAGE_RECT_PADDING = (25, 25)
+    MESSAGE_POSITION = "center"
+    MESSAGE_SORTING_DONE = "SORTING DONE"
+    MESSAGE_PROMPT_TO_START = "PRESS ENTER TO START"
+    MESSAGE_SELECT_DATASET_SIZE = "SELECT DATASET SIZE"
+    MESSAGE_SELECT_SORTING_ALGORITHM = "SELECT SORTING ALGORITHM"
+    MESSAGE_TRACE_RECORDED = "TRACE RECORDED, PRESS P TO REPLAY"
+    MESSAGE_NO_TRACE = "NO TRACE RECORDED YET, PRESS T TO RECORD ONE"
+
+    # where the trace of a sort gets recorded to & replayed from
+    TRACE_PATH = "vizsort.trace"
+    # the fraction of the trace skipped by seeking forward or backward while replaying
+    TRACE_SEEK_FRACTION = 0.1
+
+    # run the sort ahead of the display in a background thread, with the render loop only consuming its steps
+    BACKGROUND_PRODUCER = False
+
+    # race several algorithms side by side on copies of the same dataset instead of running a single one
+    RACE_MODE = False
+    RACE_ALGORITHMS = ("merge_sort", "tim_sort", "quick_sort", "heap_sort")
+    RACE_MAX_SORTERS = 9
+    RACE_VIEWPORT_PADDING = 4
+    RACE_FONT_SIZE = 18
+    RACE_FONT: "pygame.font.Font" = None
+    # the render time of a race is padded by this factor, to leave room for the display update & the event handling
+    RACE_RENDER_TIME_MARGIN = 1.5
+    # the time the sorters of a race get per frame, no matter how long the render takes
+    RACE_MIN_STEP_TIME = 0.001
@@ -0,0 +1,267 @@
+"""
+streams the steps of a single run of a sorting algorithm to any number of viewers over http, from a local server
+
+usage: python -m vizsort.stream ALGORITHM [--size N] [--distribution NAME] [--host HOST] [--port PORT] ...
+
+every viewer that requests / gets the run from where it's kept from, as a chunked response of json lines:
+{"type": "start", "algorithm": NAME, "data": [...], "steps": N}, the dataset as it is after the first N steps
+{"type": "steps", "steps": [[op, i], [op, i, j], [op, i, value], ...]}, i.e a READ, a COMPARE or SWAP & a WRITE
+{"type": "done", "steps": N}
+"""
+
+from collections import deque
+from itertools import islice
+from typing import Any, Awaitable, Callable, Deque, Dict, Iterable, List, MutableSequence, Tuple
+import argparse
+import asyncio
+import json
+import random
+import sys
+
+import vizsort.lib
+from vizsort.bench import DISTRIBUTIONS
+from vizsort.lib.aio import AsyncSorter, DEFAULT_BATCH_SIZE
+
+__all__ = ["StepBroadcaster", "serve", "main"]
+
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8000
+
+# how many batches the sort is allowed to get ahead of the slowest viewer, which is also how many are kept
+DEFAULT_MAX_BUFFERED = 64
+
+MAX_REQUEST_SIZE = 1 << 16
+
+
+def _encode_event(event: Dict[str, object]) -> bytes:
+    return json.dumps(event, separators=(",", ":")).encode() + b"\n"
+
+
+def _encode_steps(batch: List[Tuple["vizsort.lib.Step", int]]) -> bytes:
+    steps = []
+    for (op, i, j), value in batch:
+        if op == vizsort.lib.WRITE:
+            steps.append((op, i, value))
+        elif j is None:
+            steps.append((op, i))
+        else:
+            steps.append((op, i, j))
+    return _encode_event({"type": "steps", "steps": steps})
+
+
+def _apply_steps(arr: MutableSequence, batch: List[Tuple["vizsort.lib.Step", Any]]) -> None:
+    for (op, i, j), value in batch:
+        if op == vizsort.lib.SWAP:
+            arr[i], arr[j] = arr[j], arr[i]
+        elif op == vizsort.lib.WRITE:
+            arr[i] = value
+
+
+class StepBroadcaster:
+    """
+    runs a sorting algorithm once & hands its steps out to every viewer, without ever re-running it
+
+    [Process]
+    1. the sort is driven on the event loop batch by batch, every batch being encoded a single time,
+       and only the last max_buffered batches are kept, the older ones get applied onto a snapshot of the array
+
+    2. every viewer is sent the snapshot, then the kept batches & every batch after those at its own pace,
+       each send waiting for the viewer to take it in
+
+    3. once the sort is max_buffered batches ahead of the slowest viewer, it waits for that viewer to catch up,
+       so that a slow viewer holds the sort back instead of having the batches pile up,
+       and with no viewer at all, the sort waits for one
+
+    [Note]
+    the batches a viewer still needs are never dropped, as none of them is more than max_buffered batches old,
+    so the memory taken stays at the snapshot plus max_buffered batches, however long the run is
+
+    """
+
+    def __init__(
+        self,
+        sort_algo: Callable[[MutableSequence], Iterable["vizsort.lib.Step"]],
+        data: Iterable[int],
+        name: str = None,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        max_buffered: int = DEFAULT_MAX_BUFFERED,
+    ) -> None:
+        self.sort_algo = sort_algo
+        self.name = name or sort_algo.__name__
+        self.data = list(data)
+        self.batch_size = batch_size
+        self.max_buffered = max_buffered
+
+        # the array after the batches that are no longer kept, & the number of steps in those
+        self.snapshot = self.data.copy()
+        self.snapshot_steps = 0
+        # the kept batches, encoded & as (step, value) pairs, the first of them being batch number base
+        self.batches: Deque[Tuple[bytes, List[Tuple["vizsort.lib.Step", Any]]]] = deque()
+        self.base = 0
+        self.num_steps = 0
+        self.done = False
+
+        # the number of batches every connected viewer has been sent, by viewer
+        self.positions: Dict[object, int] = {}
+        self.changed = asyncio.Condition()
+
+    @property
+    def num_batches(self) -> int:
+        return self.base + len(self.batches)
+
+    def lag(self) -> int:
+        """how many batches the sort is ahead of the slowest viewer"""
+        return self.num_batches - min(self.positions.values(), default=self.num_batches)
+
+    async def run(self) -> None:
+        sorter = AsyncSorter(self.sort_algo, self.data.copy(), self.batch_size, values=True)
+        async for batch in sorter:
+            encoded = _encode_steps(batch)
+
+            async with self.changed:
+                await self.changed.wait_for(lambda: self.positions and self.lag() < self.max_buffered)
+
+                # every viewer has been sent the oldest batch by now, or the sort would still be waiting
+                if len(self.batches) == self.max_buffered:
+                    _, oldest = self.batches.popleft()
+                    _apply_steps(self.snapshot, oldest)
+                    self.snapshot_steps += len(oldest)
+                    self.base += 1
+
+                self.batches.append((encoded, batch))
+                self.num_steps = sorter.num_steps
+                self.changed.notify_all()
+
+        async with self.changed:
+            self.done = True
+            self.changed.notify_all()
+
+    async def stream(self, send: Callable[[bytes], Awaitable[None]]) -> None:
+        """sends the run to a viewer, with send only returning once the viewer has taken the event in"""
+        viewer = object()
+        async with self.changed:
+            start_event = _encode_event(
+                {"type": "start", "algorithm": self.name, "data": self.snapshot, "steps": self.snapshot_steps}
+            )
+            position = self.positions[viewer] = self.base
+            # a sort that's waiting for a viewer can go on
+            self.changed.notify_all()
+
+        try:
+            await send(start_event)
+
+            while True:
+                async with self.changed:
+                    await self.changed.wait_for(lambda: position < self.num_batches or self.done)
+                    pending = [encoded for encoded, _ in islice(self.batches, position - self.base, None)]
+                    if not pending:
+                        break
+
+                for encoded in pending:
+                    await send(encoded)
+                    position += 1
+
+                    async with self.changed:
+                        self.positions[viewer] = position
+                        self.changed.notify_all()
+
+            await send(_encode_event({"type": "done", "steps": self.num_steps}))
+
+        finally:
+            # a viewer that's gone shouldn't hold the sort back any longer
+            async with self.changed:
+                del self.positions[viewer]
+                self.changed.notify_all()
+
+
+async def _handle_viewer(
+    broadcaster: StepBroadcaster, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+) -> None:
+    try:
+        request = await reader.readuntil(b"\r\n\r\n")
+        method, path, *_ = request.split(b"\r\n", 1)[0].split(b" ") + [b"", b""]
+
+        if method != b"GET" or path.split(b"?")[0] != b"/":
+            writer.write(b"HTTP/1.1 404 Not Found\r\nContent-Length: 0\r\nConnection: close\r\n\r\n")
+            await writer.drain()
+            return
+
+        writer.write(
+            b"HTTP/1.1 200 OK\r\n"
+            b"Content-Type: application/x-ndjson\r\n"
+            b"Transfer-Encoding: chunked\r\n"
+            b"Cache-Control: no-cache\r\n"
+            b"Connection: close\r\n\r\n"
+        )
+
+        async def send(event: bytes) -> None:
+            writer.write(b"%x\r\n%s\r\n" % (len(event), event))
+            # only returns once the socket's buffer has room again, which is where the backpressure comes from
+            await writer.drain()
+
+        await broadcaster.stream(send)
+        writer.write(b"0\r\n\r\n")
+        await writer.drain()
+
+    except (ConnectionError, asyncio.IncompleteReadError, asyncio.LimitOverrunError):
+        # the viewer hung up
+        pass
+
+    finally:
+        writer.close()
+
+
+async def serve(
+    broadcaster: StepBroadcaster,
+    host: str = DEFAULT_HOST,
+    port: int = DEFAULT_PORT,
+    started: Callable[[asyncio.AbstractServer], None] = None,
+) -> None:
+    """runs the sort & serves its steps until cancelled, calling started with the server once it's listening"""
+    server = await asyncio.start_server(
+        lambda reader, writer: _handle_viewer(broadcaster, reader, writer), host, port, limit=MAX_REQUEST_SIZE
+    )
+    if started is not None:
+        started(server)
+
+    async with server:
+        await asyncio.gather(broadcaster.run(), server.serve_forever())
+
+
+def main(argv: List[str] = None) -> None:
+    all_algorithms = list(vizsort.lib.algorithms())
+
+    parser = argparse.ArgumentParser(prog="python -m vizsort.stream", description=__doc__.strip().splitlines()[0])
+    parser.add_argument("algorithm", choices=all_algorithms, metavar="ALGORITHM")
+    parser.add_argument("--size", type=int, default=1000)
+    parser.add_argument("--distribution", choices=list(DISTRIBUTIONS), default="random")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE, help="steps per streamed batch")
+    parser.add_argument(
+        "--max-buffered", type=int, default=DEFAULT_MAX_BUFFERED, help="batches kept & ahead of the viewers"
+    )
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    args = parser.parse_args(argv)
+
+    broadcaster = StepBroadcaster(
+        vizsort.lib.get_algorithm(args.algorithm),
+        DISTRIBUTIONS[args.distribution](args.size, random.Random(args.seed)),
+        name=args.algorithm,
+        batch_size=args.batch_size,
+        max_buffered=args.max_buffered,
+    )
+
+    def started(server: asyncio.AbstractServer) -> None:
+        host, port = server.sockets[0].getsockname()[:2]
+        print(f"streaming {args.algorithm} on http://{host}:{port}/", file=sys.stderr)
+
+    try:
+        asyncio.run(serve(broadcaster, args.host, args.port, started))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
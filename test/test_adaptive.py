@@ -0,0 +1,76 @@
+import random
+
+import pytest
+from vizsort.bench import DISTRIBUTIONS
+from vizsort.lib import adaptive, auto_sort, choose_algorithm, profile_input
+from vizsort.lib.utils import exhaust
+
+
+def test_profile_input():
+    assert profile_input(list(range(1000))).inversions == 0
+    assert profile_input(list(range(1000, 0, -1))).inversions == 1
+
+    rng = random.Random(0)
+    profile = profile_input([rng.randrange(4) for _ in range(1000)])
+    assert profile.integers
+    assert profile.value_range == 3
+    assert profile.duplicates > 0.9
+
+    profile = profile_input([str(i) for i in range(1000)])
+    assert not profile.integers
+    assert profile.value_range is None
+
+
+@pytest.mark.parametrize(
+    "data, algorithm",
+    [
+        (list(range(20, 0, -1)), "insertion_sort"),
+        (list(range(1000)), "tim_sort"),
+        (list(range(1000, 0, -1)), "tim_sort"),
+        (DISTRIBUTIONS["random"](1000, random.Random(0)), "radix_sort"),
+        ([random.Random(i).random() for i in range(1000)], "intro_sort"),
+        ([str(i % 5) for i in range(1000)], "intro_sort"),
+    ],
+)
+def test_choose_algorithm(data, algorithm):
+    decision = choose_algorithm(data)
+    assert decision.algorithm == algorithm
+    assert decision.reasons
+    assert decision.describe().startswith(algorithm)
+
+
+def test_choose_algorithm_stable():
+    data = [random.Random(i).random() for i in range(1000)]
+    assert choose_algorithm(data, stable=True).algorithm == "tim_sort"
+
+
+def test_choose_algorithm_checks_every_element_for_parallel(monkeypatch):
+    monkeypatch.setattr(adaptive, "PARALLEL_INPUT", 1000)
+    monkeypatch.setattr(adaptive.os, "cpu_count", lambda: 4)
+
+    rng = random.Random(0)
+    data = [rng.randrange(1 << 60) for _ in range(1000)]
+    assert choose_algorithm(data).algorithm == "parallel_sort"
+
+    # a single int beyond 64 bits, at a position that the sample misses
+    huge = 1 << 70
+    i = next(i for i in range(len(data)) if profile_input(data[:i] + [huge] + data[i + 1 :]).value_range < huge // 2)
+    data[i] = huge
+    assert choose_algorithm(data).algorithm != "parallel_sort"
+
+    arr = data.copy()
+    auto_sort.fast(arr)
+    assert arr == sorted(data)
+
+
+@pytest.mark.parametrize("distribution", list(DISTRIBUTIONS))
+def test_auto_sort(distribution):
+    data = DISTRIBUTIONS[distribution](500, random.Random(0))
+
+    arr = data.copy()
+    exhaust(auto_sort(arr))
+    assert arr == sorted(data)
+
+    arr = data.copy()
+    auto_sort.fast(arr, key=lambda x: -x)
+    assert arr == sorted(data, reverse=True)
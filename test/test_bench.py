@@ -0,0 +1,67 @@
+import io
+import json
+import random
+import time
+
+import pytest
+from vizsort import bench
+
+
+@pytest.mark.parametrize("distribution", list(bench.DISTRIBUTIONS))
+def test_distributions(distribution):
+    data = bench.DISTRIBUTIONS[distribution](100, random.Random(0))
+    assert len(data) == 100
+    assert all(isinstance(x, int) and x >= 0 for x in data)
+
+
+def test_run_reports_every_cell():
+    rows = bench.run(["insertion_sort", "merge_sort"], [10, 50], ["random", "reversed"])
+
+    assert len(rows) == 2 * 2 * 2
+    for row in rows:
+        assert "error" not in row
+        assert row["time"] >= 0
+        assert row["comparisons"] > 0
+        assert row["peak_memory"] >= 0
+
+    reversed_insertion = next(
+        row
+        for row in rows
+        if row["algorithm"] == "insertion_sort" and row["size"] == 50 and row["distribution"] == "reversed"
+    )
+    assert reversed_insertion["swaps"] == 50 * 49 // 2
+
+
+def test_benchmark_leaves_the_first_fast_call_out():
+    calls = []
+
+    def sort_algo(arr):
+        arr.sort()
+        return iter(())
+
+    def fast(arr):
+        # standing in for the fast path being compiled on its first call
+        if not calls:
+            time.sleep(0.2)
+        calls.append(len(arr))
+        arr.sort()
+
+    sort_algo.fast = fast
+    result = bench.benchmark(sort_algo, list(range(100, 0, -1)), repeat=2)
+
+    assert len(calls) == 3
+    assert result["fast_time"] < 0.1
+
+
+def test_main_writes_json(tmp_path):
+    output = tmp_path / "bench.json"
+    bench.main(["--algorithms", "merge_sort", "--sizes", "20", "--distributions", "sorted", "--output", str(output)])
+
+    rows = json.loads(output.read_text())
+    assert [(row["algorithm"], row["size"], row["distribution"]) for row in rows] == [("merge_sort", 20, "sorted")]
+
+
+def test_write_rows_csv():
+    file = io.StringIO()
+    bench.write_rows([{"algorithm": "merge_sort", "size": 1, "distribution": "sorted"}], "csv", file)
+    assert file.getvalue().splitlines()[0] == ",".join(bench.FIELDS)
@@ -0,0 +1,40 @@
+import math
+import random
+
+import pytest
+
+pygame = pytest.importorskip("pygame")
+import vizsort.lib
+from vizsort import export
+
+
+@pytest.mark.parametrize("backend", ["numpy", "pygame"])
+def test_export_image_sequence(backend, tmp_path):
+    if backend == "numpy":
+        pytest.importorskip("numpy")
+
+    num_frames = export.export(
+        "bubble_sort", str(tmp_path), size=50, steps_per_frame=100, resolution=(80, 60), backend=backend
+    )
+
+    frames = sorted(tmp_path.iterdir())
+    assert len(frames) == num_frames
+    # the frames before & after the sort, with every 100 steps in between
+    data = export.DISTRIBUTIONS["random"](50, random.Random(0))
+    num_steps = export.count_steps(vizsort.lib.get_algorithm("bubble_sort"), data)
+    assert num_frames == 1 + math.ceil(num_steps / 100) + 1
+    assert frames[0].read_bytes().startswith(b"P6 80 60 255\n")
+    assert len(frames[0].read_bytes()) == len(b"P6 80 60 255\n") + 80 * 60 * 3
+
+
+def test_export_spreads_the_steps_over_the_duration(tmp_path):
+    num_frames = export.export("insertion_sort", str(tmp_path), size=100, fps=10, duration=2, resolution=(40, 30))
+    # 2 seconds at 10 fps, plus the frames before & after the sort
+    assert 20 <= num_frames <= 22
+
+
+def test_export_png(tmp_path):
+    export.export("heap_sort", str(tmp_path), size=20, steps_per_frame=1000, resolution=(40, 30), image_format="png")
+
+    first = pygame.image.load(str(tmp_path / "frame_000000.png"))
+    assert first.get_size() == (40, 30)
@@ -0,0 +1,51 @@
+import os
+import random
+from array import array
+
+import pytest
+from vizsort.lib import *
+
+DATASET_SIZE = 10000
+
+
+@pytest.mark.parametrize("sort_algo", [tim_sort, radix_sort])
+def test_external_sort_spills_and_merges_runs(sort_algo, tmp_path):
+    data = [random.randint(-(10**12), 10**12) for _ in range(DATASET_SIZE)]
+
+    # 1000 elements per run & 2 runs per merge
+    sorter = ExternalSorter(memory_budget=1000 * 64, fan_in=2, sort_algo=sort_algo, tmp_dir=tmp_path)
+    assert list(sorter.sort(iter(data))) == sorted(data)
+
+    assert sorter.items == DATASET_SIZE
+    # 10 runs, merged into 5, 3, 2 & then streamed out
+    assert sorter.merge_passes == 3
+    assert sorter.runs_written == 10 + 5 + 3 + 2
+    # every element gets written into a run & read back out once per pass
+    assert sorter.bytes_read == sorter.bytes_written == 4 * DATASET_SIZE * 8
+    # the temporary runs get cleaned up
+    assert os.listdir(tmp_path) == []
+
+
+def test_external_sort_file(tmp_path):
+    data = array("d", (random.uniform(-1, 1) for _ in range(DATASET_SIZE)))
+    source, output = tmp_path / "data.bin", tmp_path / "sorted.bin"
+    with open(source, "wb") as file:
+        data.tofile(file)
+
+    sorter = ExternalSorter(typecode="d", memory_budget=4000 * 64, tmp_dir=tmp_path)
+    stats = sorter.sort_file(source, output)
+
+    assert list(sorter.read(output)) == sorted(data)
+    assert stats["runs_written"] == 3
+    assert stats["merge_passes"] == 0
+    # the input & the runs are read once, the runs & the output are written once
+    assert stats["bytes_read"] == stats["bytes_written"] == 2 * DATASET_SIZE * data.itemsize
+
+
+def test_external_sort_in_memory():
+    sorter = ExternalSorter()
+    assert list(sorter.sort([3, 1, 2])) == [1, 2, 3]
+    assert sorter.runs_written == sorter.bytes_written == 0
+
+    with pytest.raises(ValueError):
+        ExternalSorter(fan_in=1)
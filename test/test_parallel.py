@@ -0,0 +1,79 @@
+import random
+
+import pytest
+from vizsort.lib import *
+from vizsort.lib.utils import exhaust
+
+DATASET_SIZE = 10000
+
+
+@pytest.mark.parametrize("sort_algo", [merge_sort, radix_sort, tim_sort])
+def test_parallel_sort(sort_algo):
+    arr = [random.randint(-(10**12), 10**12) for _ in range(DATASET_SIZE)]
+    expected = sorted(arr)
+
+    steps = list(parallel_sort(arr, sort_algo, workers=4, min_chunk_size=1000))
+    assert arr == expected
+    assert all(step.op == WRITE and 0 <= step.i < DATASET_SIZE for step in steps)
+    # every chunk gets copied back once it is sorted, and once more while merging
+    assert len(steps) == 2 * DATASET_SIZE
+
+
+def test_parallel_sort_fast_path_floats():
+    arr = [random.uniform(-1, 1) for _ in range(DATASET_SIZE)]
+    expected = sorted(arr)
+
+    parallel_sort.fast(arr, workers=3, min_chunk_size=1000)
+    assert arr == expected
+
+
+def test_parallel_sort_small_or_unsupported_arrays():
+    # too small to be split, so sorted in this process whatever the elements are
+    arr = ["b", "c", "a"]
+    exhaust(parallel_sort(arr, workers=4))
+    assert arr == ["a", "b", "c"]
+
+    with pytest.raises(TypeError):
+        exhaust(parallel_sort(["a"] * DATASET_SIZE, workers=4, min_chunk_size=1000))
+
+    with pytest.raises(TypeError):
+        exhaust(parallel_sort([1, 2.0] * DATASET_SIZE, workers=4, min_chunk_size=1000))
+
+
+@pytest.mark.parametrize("data", [list(range(DATASET_SIZE, 0, -1)), [i % 7 for i in range(DATASET_SIZE)]])
+def test_parallel_sort_operation_logging_array(data):
+    # the visualizer's dataset, which only takes arrays for its slices
+    arr = OperationLoggingArray("i", data)
+
+    arr.run(parallel_sort(arr, workers=3, min_chunk_size=1000))
+    assert arr.tolist() == sorted(data)
+    assert arr.stats["writes"] == 2 * DATASET_SIZE
+
+
+class Record:
+    def __init__(self, key: float, index: int) -> None:
+        self.key = key
+        self.index = index
+
+
+@pytest.mark.parametrize("reverse", [False, True])
+@pytest.mark.parametrize("sort_algo", [merge_sort, radix_sort])
+def test_parallel_sort_key_and_reverse(sort_algo, reverse):
+    rng = random.Random(0)
+    records = [Record(rng.randrange(-100, 100) / 4, i) for i in range(DATASET_SIZE)]
+    # the builtin sorted is stable for reverse too, so equal keys keep their original order
+    expected = [record.index for record in sorted(records, key=lambda record: record.key, reverse=reverse)]
+
+    arr = records.copy()
+    steps = list(parallel_sort(arr, sort_algo, workers=3, min_chunk_size=1000, key=lambda r: r.key, reverse=reverse))
+    assert [record.index for record in arr] == expected
+    assert len(steps) == 2 * DATASET_SIZE
+
+    arr = records.copy()
+    parallel_sort.fast(arr, sort_algo, workers=4, min_chunk_size=1000, key=lambda r: r.key, reverse=reverse)
+    assert [record.index for record in arr] == expected
+
+    # too small to be split, so handed over to the sorting algorithm along with the key
+    arr = records[:100]
+    parallel_sort.fast(arr, sort_algo, workers=4, key=lambda r: r.key, reverse=reverse)
+    assert [record.index for record in arr] == [index for index in expected if index < 100]
@@ -0,0 +1,60 @@
+import random
+
+import pytest
+from vizsort.lib import *
+
+DATASET_SIZE = 1000
+
+
+def test_producer_hands_over_every_step():
+    data = random.sample(range(DATASET_SIZE), DATASET_SIZE)
+
+    arr = data.copy()
+    live_steps = list(heap_sort(arr))
+
+    produced = data.copy()
+    assert list(StepProducer(heap_sort, produced, batch_size=100, max_batches=2).start()) == live_steps
+    assert produced == arr
+
+
+def test_producer_fast_forward():
+    data = random.sample(range(DATASET_SIZE), DATASET_SIZE)
+    arr = OperationLoggingArray("i", data)
+    producer = StepProducer(bubble_sort, arr, batch_size=100, max_batches=2).start()
+
+    scheduler = StepScheduler(fps=60, steps_per_frame=50)
+    steps = scheduler.advance(producer, limit=producer.available())
+    assert len(steps) <= 50
+
+    producer.fast_forward()
+    while not scheduler.exhausted:
+        scheduler.advance(producer, limit=producer.available())
+
+    assert arr.tolist() == sorted(data)
+
+
+def test_producer_raises_errors_of_the_sort():
+    producer = StepProducer(insertion_sort, [1, "a", None]).start()
+    with pytest.raises(TypeError):
+        list(producer)
+
+
+@pytest.mark.parametrize("fast_forward", [False, True])
+def test_producer_carries_the_operation_counts_over(fast_forward):
+    data = random.sample(range(DATASET_SIZE), DATASET_SIZE)
+
+    arr = OperationLoggingList(data)
+    arr.run(merge_sort(arr))
+
+    produced = OperationLoggingList(data)
+    producer = StepProducer(merge_sort, produced, batch_size=100, max_batches=2).start()
+    if fast_forward:
+        producer.fast_forward()
+    produced.run(producer)
+
+    assert produced == arr
+    # the counts are the sort's own, not the replay's, whichever way the sort was driven
+    assert produced.stats["reads"] == arr.stats["reads"]
+    assert produced.stats["writes"] == arr.stats["writes"]
+    if not fast_forward:
+        assert produced.stats == arr.stats
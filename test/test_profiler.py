@@ -0,0 +1,71 @@
+import json
+import random
+
+import pytest
+import vizsort.lib
+from vizsort import profiler
+
+
+def test_fit_recovers_the_model_and_constant():
+    sizes = [100, 200, 400, 800]
+
+    fits = profiler.fit(sizes, [3 * n * n for n in sizes])
+    assert next(iter(fits)) == "n^2"
+    assert fits["n^2"]["constant"] == pytest.approx(3)
+    assert fits["n^2"]["error"] == pytest.approx(0)
+
+    fits = profiler.fit(sizes, [2 * n for n in sizes])
+    assert next(iter(fits)) == "n"
+    assert fits["n"]["constant"] == pytest.approx(2)
+
+
+@pytest.mark.parametrize(
+    "name, phases",
+    [
+        ("quick_sort", {"partition"}),
+        ("merge_sort", {"merge"}),
+        ("tim_sort", {"run detection", "insertion", "merge"}),
+        ("radix_sort", {"digit pass"}),
+        ("heap_sort", {"sift down"}),
+    ],
+)
+def test_profile_run_splits_the_phases(name, phases):
+    data = list(range(500))
+    random.Random(0).shuffle(data)
+
+    result = profiler.profile_run(vizsort.lib.get_algorithm(name), data)
+
+    assert phases <= set(result)
+    total = result.pop("total")
+    for metric in ("steps", "comparisons", "swaps"):
+        assert total[metric] == sum(phase[metric] for phase in result.values())
+
+
+def test_profile_run_counts_match_the_logging_list():
+    data = list(range(200, 0, -1))
+    arr = vizsort.lib.OperationLoggingList(data)
+    arr.run(vizsort.lib.insertion_sort(arr))
+
+    total = profiler.profile_run(vizsort.lib.insertion_sort, data)["total"]
+    assert {metric: total[metric] for metric in arr.stats} == arr.stats
+
+
+def test_profile_fits_the_expected_models():
+    report = profiler.profile(["insertion_sort", "merge_sort"], sizes=[64, 128, 256, 512], distribution="reversed")
+
+    assert next(iter(report["insertion_sort"]["fits"]["total"]["comparisons"])) == "n^2"
+    assert next(iter(report["merge_sort"]["fits"]["merge"]["writes"])) == "n log n"
+
+
+def test_main_writes_json(tmp_path):
+    output = tmp_path / "profile.json"
+    profiler.main(["--algorithms", "quick_sort", "--sizes", "50", "100", "--format", "json", "--output", str(output)])
+
+    report = json.loads(output.read_text())
+    assert report["quick_sort"]["sizes"] == [50, 100]
+    assert len(report["quick_sort"]["phases"]["partition"]["comparisons"]) == 2
+
+
+def test_main_writes_text(capsys):
+    profiler.main(["--algorithms", "tim_sort", "--sizes", "50", "100"])
+    assert "run detection" in capsys.readouterr().out
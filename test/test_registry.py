@@ -0,0 +1,105 @@
+from functools import total_ordering
+import importlib
+import importlib.metadata
+import random
+import subprocess
+import sys
+
+import pytest
+import vizsort.lib
+from vizsort.lib import registry
+
+
+def test_registered_algorithms_load():
+    algorithms = vizsort.lib.algorithms()
+    assert "tim_sort" in algorithms and "parallel_sort" in algorithms
+
+    for name, info in algorithms.items():
+        sort_algo = info.load()
+        assert sort_algo.__name__ == name
+        assert callable(sort_algo.fast)
+
+        arr = [3, 1, 2]
+        vizsort.lib.exhaust(sort_algo(arr))
+        assert arr == [1, 2, 3]
+
+
+def test_lazy_names_match_their_modules():
+    for name, module_name in vizsort.lib._LAZY_NAMES.items():
+        module = importlib.import_module(module_name, "vizsort.lib")
+        assert name in module.__all__
+        assert getattr(vizsort.lib, name) is getattr(module, name)
+
+
+def test_import_stays_headless():
+    code = "import sys, vizsort.lib; print(sorted(m for m in ('pygame', 'numpy', 'vizsort.lib.utils') if m in sys.modules))"
+    output = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True).stdout
+    assert output.strip() == "[]"
+
+
+@total_ordering
+class Record:
+    # only the key takes part in the comparisons, so records with the same key are equal but still told apart
+    def __init__(self, key: int, index: int) -> None:
+        self.key = key
+        self.index = index
+
+    def __eq__(self, other: "Record") -> bool:
+        return self.key == other.key
+
+    def __lt__(self, other: "Record") -> bool:
+        return self.key < other.key
+
+
+@pytest.mark.parametrize("name", [name for name, info in vizsort.lib.algorithms().items() if info.stable])
+def test_stable_algorithms_keep_equal_elements_in_order(name):
+    info = vizsort.lib.algorithms()[name]
+    rng = random.Random(0)
+
+    # without a key, as the key's tiebreak would make any algorithm stable
+    if info.input_types == registry.NUMERIC:
+        # 0.0 & -0.0 are equal, but their reprs tell them apart
+        data = [rng.choice([0.0, -0.0, 1.5, -2.5]) for _ in range(300)]
+        expected = [repr(x) for x in sorted(data)]
+        arr = data.copy()
+        vizsort.lib.exhaust(info.load()(arr))
+        assert [repr(x) for x in arr] == expected
+
+        arr = data.copy()
+        info.load().fast(arr)
+        assert [repr(x) for x in arr] == expected
+        return
+
+    data = [Record(rng.randrange(10), i) for i in range(300)]
+    expected = [record.index for record in sorted(data)]
+    for run in (lambda arr: vizsort.lib.exhaust(info.load()(arr)), info.load().fast):
+        arr = data.copy()
+        run(arr)
+        assert [record.index for record in arr] == expected
+
+
+def test_entry_point_plugins(monkeypatch):
+    info = vizsort.lib.AlgorithmInfo("plugin_sort", bare_sort, "N log N", stable=True, in_place=True)
+    entry_points = importlib.metadata.EntryPoints(
+        [
+            importlib.metadata.EntryPoint("plugin_sort", "test.test_registry:PLUGIN_INFO", registry.ENTRY_POINT_GROUP),
+            importlib.metadata.EntryPoint("bare_sort", "test.test_registry:bare_sort", registry.ENTRY_POINT_GROUP),
+            importlib.metadata.EntryPoint("broken_sort", "no.such.module:sort", registry.ENTRY_POINT_GROUP),
+        ]
+    )
+    monkeypatch.setattr(importlib.metadata, "entry_points", lambda: entry_points)
+    monkeypatch.setattr(registry, "_ALGORITHMS", dict(registry._ALGORITHMS))
+    monkeypatch.setattr(registry, "_plugins_loaded", False)
+    monkeypatch.setattr(sys.modules[__name__], "PLUGIN_INFO", info, raising=False)
+
+    # the broken plugin only gets a warning
+    with pytest.warns(UserWarning, match="broken_sort"):
+        algorithms = vizsort.lib.algorithms()
+    assert algorithms["plugin_sort"] is info
+    assert algorithms["bare_sort"].load() is bare_sort
+    assert algorithms["bare_sort"].complexity == "unknown"
+    assert "broken_sort" not in algorithms
+
+
+def bare_sort(arr):
+    yield from ()
@@ -0,0 +1,46 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from vizsort.render import rasterize_columns
+
+BACKGROUND = (0, 0, 0)
+START = (0, 0, 100)
+END = (0, 0, 200)
+
+
+def test_rasterize_columns_heights_and_colors():
+    pixels = np.zeros((4, 10, 3), dtype=np.uint8)
+    rasterize_columns(pixels, np.array([1, 2, 3, 4]), 4, BACKGROUND, START, END)
+
+    for x, value in enumerate([1, 2, 3, 4]):
+        column = pixels[x, :, 2]
+        height = int(value / 4 * 10)
+        assert (column[10 - height :] == int(value / 4 * 100) + 100).all()
+        assert (column[: 10 - height] == 0).all()
+
+
+def test_rasterize_columns_packed_matches_rgb():
+    values = np.random.default_rng(0).permutation(1000) + 1
+    # tall enough for the highlight to cover at least a pixel
+    values[10] = 1000
+    rgb = np.zeros((100, 50, 3), dtype=np.uint8)
+    packed = np.zeros((100, 50), dtype=np.uint32)
+
+    rasterize_columns(rgb, values, 1000, BACKGROUND, START, END, highlight=(10, None), highlight_color=(255, 0, 0))
+    rasterize_columns(
+        packed,
+        values,
+        1000,
+        BACKGROUND,
+        START,
+        END,
+        highlight=(10, None),
+        highlight_color=(255, 0, 0),
+        shifts=(16, 8, 0),
+    )
+
+    expected = (rgb[..., 0].astype(np.uint32) << 16) | (rgb[..., 1].astype(np.uint32) << 8) | rgb[..., 2]
+    assert (packed == expected).all()
+    # the highlighted element gets shown even though it isn't one of the sampled elements
+    assert (rgb[1, :, 0] == 255).any()
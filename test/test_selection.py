@@ -0,0 +1,121 @@
+import random
+
+import pytest
+from vizsort.bench import DISTRIBUTIONS
+from vizsort.lib import SWAP, OperationLoggingList, nth_element, partial_sort, top_k
+from vizsort.lib.selection import _select
+from vizsort.lib.utils import exhaust
+
+
+def replay(steps, arr):
+    # applying the swaps of the steps onto a copy has to end up with the same array
+    copy = list(arr)
+    for op, i, j in steps:
+        if op == SWAP:
+            copy[i], copy[j] = copy[j], copy[i]
+    return copy
+
+
+@pytest.mark.parametrize("distribution", list(DISTRIBUTIONS))
+@pytest.mark.parametrize("nth", [0, 1, 250, 498, 499])
+def test_nth_element(distribution, nth):
+    data = DISTRIBUTIONS[distribution](500, random.Random(0))
+    expected = sorted(data)
+
+    arr = data.copy()
+    steps = list(nth_element(arr, nth))
+    assert arr[nth] == expected[nth]
+    assert max(arr[:nth], default=arr[nth]) <= arr[nth] <= min(arr[nth + 1 :], default=arr[nth])
+    assert sorted(arr) == expected
+    assert replay(steps, data) == arr
+
+    arr = data.copy()
+    nth_element.fast(arr, nth)
+    assert arr[nth] == expected[nth]
+
+
+def test_nth_element_on_a_range():
+    arr = list(range(20, 0, -1))
+    exhaust(nth_element(arr, 5, 2, 11))
+    assert arr[:2] == [20, 19] and arr[12:] == list(range(8, 0, -1))
+    assert arr[5] == 12
+
+    with pytest.raises(IndexError):
+        exhaust(nth_element(arr, 12, 2, 11))
+
+
+def test_median_of_medians_stays_linear():
+    # forcing the median of medians from the start, the comparisons have to grow linearly with the size
+    comparisons = []
+    for size in (1000, 2000, 4000):
+        data = list(range(size))
+        random.Random(size).shuffle(data)
+        arr = OperationLoggingList(data)
+        arr.run(_select(arr, 0, size - 1, size // 3, True))
+        assert arr[size // 3] == size // 3
+        comparisons.append(arr.stats["comparisons"])
+
+    assert comparisons[2] / comparisons[0] < 4.5
+
+
+@pytest.mark.parametrize("k", [0, 1, 10, 100, 500, 600])
+def test_partial_sort(k):
+    data = DISTRIBUTIONS["random"](500, random.Random(1))
+
+    arr = data.copy()
+    steps = list(partial_sort(arr, k))
+    assert arr[:k] == sorted(data)[:k]
+    assert sorted(arr) == sorted(data)
+    assert replay(steps, data) == arr
+
+
+@pytest.mark.parametrize("k", [0, 1, 10, 100, 500])
+def test_top_k(k):
+    data = DISTRIBUTIONS["few_unique"](500, random.Random(2))
+
+    arr = data.copy()
+    exhaust(top_k(arr, k))
+    assert sorted(arr[:k]) == sorted(data)[:k]
+    assert sorted(arr) == sorted(data)
+
+
+def test_top_k_bounds():
+    data = list(range(20, 0, -1))
+
+    # taking none or all of the range is a no-op
+    for k in (0, 10):
+        arr = data.copy()
+        assert list(top_k(arr, k, 5, 14)) == []
+        assert arr == data
+
+    for k in (-1, 11):
+        with pytest.raises(IndexError):
+            exhaust(top_k(data.copy(), k, 5, 14))
+        with pytest.raises(IndexError):
+            top_k.fast(data.copy(), k, 5, 14)
+
+
+class Record:
+    def __init__(self, key: int, index: int) -> None:
+        self.key = key
+        self.index = index
+
+
+@pytest.mark.parametrize("reverse", [False, True])
+def test_key_and_reverse(reverse):
+    rng = random.Random(3)
+    records = [Record(rng.randrange(50), i) for i in range(300)]
+    expected = sorted(records, key=lambda record: record.key, reverse=reverse)
+
+    arr = records.copy()
+    exhaust(nth_element(arr, 150, key=lambda record: record.key, reverse=reverse))
+    assert arr[150].key == expected[150].key
+
+    arr = records.copy()
+    exhaust(partial_sort(arr, 40, key=lambda record: record.key, reverse=reverse))
+    # equal keys keep their original order, same as with the builtin sorted
+    assert arr[:40] == expected[:40]
+
+    arr = records.copy()
+    top_k.fast(arr, 40, key=lambda record: record.key, reverse=reverse)
+    assert sorted(record.index for record in arr[:40]) == sorted(record.index for record in expected[:40])
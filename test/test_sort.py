@@ -1,3 +1,5 @@
+from array import array
+from inspect import isgenerator, signature
 from typing import List
 import random
 import pytest
@@ -6,6 +8,22 @@ from vizsort.lib.utils import exhaust
 
 DATASET_SIZE = 1000
 
+SORTING_ALGORITHMS = [
+    bubble_sort,
+    insertion_sort,
+    selection_sort,
+    merge_sort,
+    bottom_up_merge_sort,
+    tim_sort,
+    radix_sort,
+    quick_sort,
+    iterative_quick_sort,
+    heap_sort,
+    intro_sort,
+    block_merge_sort,
+    auto_sort,
+]
+
 
 @pytest.fixture(scope="session")
 def arr() -> List[int]:
@@ -19,10 +37,233 @@ def sorted_arr(arr) -> List[int]:
     return sorted(arr)
 
 
-@pytest.mark.parametrize(
-    "sort_algo",
-    [bubble_sort, insertion_sort, selection_sort, merge_sort, tim_sort, radix_sort, quick_sort, iterative_quick_sort],
-)
+@pytest.mark.parametrize("sort_algo", SORTING_ALGORITHMS)
 def test_sort(sort_algo, arr, sorted_arr):
+    arr = arr.copy()
     exhaust(sort_algo(arr))
     assert arr == sorted_arr
+
+
+@pytest.mark.parametrize("sort_algo", SORTING_ALGORITHMS)
+def test_sort_fast_path(sort_algo, arr, sorted_arr):
+    arr = arr.copy()
+    assert not isgenerator(sort_algo.fast(arr))
+    assert arr == sorted_arr
+
+
+@pytest.mark.parametrize("sort_algo", SORTING_ALGORITHMS)
+def test_sort_steps(sort_algo, arr):
+    arr = arr[:100]
+    for step in sort_algo(arr):
+        assert isinstance(step, Step)
+        assert step.op in (READ, COMPARE, SWAP, WRITE)
+        assert 0 <= step.i < len(arr)
+        assert step.j is None or 0 <= step.j < len(arr)
+
+
+@pytest.mark.parametrize("sort_algo", SORTING_ALGORITHMS)
+def test_sort_steps_announce_every_mutation(sort_algo):
+    # replaying the swaps & writes onto a copy has to keep it in step with the array after every single step
+    data = [random.Random(i).randrange(50) for i in range(120)] + list(range(80, 0, -1))
+    arr = data.copy()
+    shadow = data.copy()
+
+    for op, i, j in sort_algo(arr):
+        if op == SWAP:
+            shadow[i], shadow[j] = shadow[j], shadow[i]
+        elif op == WRITE:
+            shadow[i] = arr[i]
+        assert shadow == arr
+
+    assert arr == sorted(data)
+
+
+@pytest.mark.parametrize("data", [list(range(5000)), list(range(5000, 0, -1)), [i % 3 for i in range(5000)]])
+def test_intro_sort_adversarial_input(data):
+    arr = OperationLoggingList(data)
+    arr.run(intro_sort(arr))
+
+    assert arr == sorted(data)
+    # way below the N^2 / 2 comparisons that a lomuto quick sort makes on these
+    assert arr.num_comparisons < 5000 * 5000 // 20
+
+
+class Record:
+    def __init__(self, key: int, index: int) -> None:
+        self.key = key
+        self.index = index
+
+    def __lt__(self, other: "Record") -> bool:
+        return self.key < other.key
+
+
+def test_tim_sort_is_stable():
+    rng = random.Random(0)
+    records = [Record(rng.randrange(10), i) for i in range(DATASET_SIZE)]
+    expected = sorted(records, key=lambda record: record.key)
+
+    exhaust(tim_sort(records))
+    assert [record.index for record in records] == [record.index for record in expected]
+
+
+def test_block_merge_sort_is_stable_and_in_place():
+    rng = random.Random(0)
+    records = [Record(rng.randrange(10), i) for i in range(DATASET_SIZE)]
+    expected = sorted(records, key=lambda record: record.key)
+
+    # besides its stack of pending merges, which stays at log N, the sort only swaps elements around
+    assert block_merge_sort.fast(records) <= 2 * DATASET_SIZE.bit_length()
+    assert [record.index for record in records] == [record.index for record in expected]
+
+
+@pytest.mark.parametrize("reverse", [False, True])
+def test_block_merge_sort_reports_its_stack_with_a_key(reverse):
+    data = [random.Random(i).randrange(100) for i in range(DATASET_SIZE)]
+    peak = block_merge_sort.fast(data.copy())
+    assert 0 < peak <= 2 * DATASET_SIZE.bit_length()
+
+    assert block_merge_sort.fast(data.copy(), key=lambda x: x, reverse=reverse) > 0
+
+    sorter = block_merge_sort(data.copy(), key=lambda x: x, reverse=reverse)
+    with pytest.raises(StopIteration) as stop:
+        while True:
+            next(sorter)
+    assert stop.value.value > 0
+
+
+def test_tim_sort_gallops_over_presorted_runs():
+    arr = OperationLoggingList(list(range(0, 2 * DATASET_SIZE, 2)) + list(range(1, 2 * DATASET_SIZE, 2)))
+    arr.run(tim_sort(arr))
+    assert arr == sorted(arr)
+
+    arr = OperationLoggingList(list(range(DATASET_SIZE, 2 * DATASET_SIZE)) + list(range(DATASET_SIZE)))
+    arr.run(tim_sort(arr))
+    assert arr == sorted(arr)
+    # finding the 2 runs takes N comparisons, merging them takes a handful of gallops
+    assert arr.num_comparisons < 2 * DATASET_SIZE + 100
+
+
+def test_bottom_up_merge_sort_copies_runs_in_order():
+    arr = OperationLoggingList(range(DATASET_SIZE))
+    arr.run(bottom_up_merge_sort(arr))
+
+    assert arr == sorted(arr)
+    # a single comparison per pair of runs in every pass
+    assert arr.num_comparisons < DATASET_SIZE
+
+
+@pytest.mark.parametrize(
+    "data",
+    [
+        [random.randint(-(10**12), 10**12) for _ in range(DATASET_SIZE)],
+        [random.uniform(-1e6, 1e6) for _ in range(DATASET_SIZE)] + [0.0, -0.0, float("inf"), float("-inf"), 3],
+        [random.randrange(4) << 40 for _ in range(DATASET_SIZE)],
+    ],
+    ids=["negatives", "floats", "single_bucket_digits"],
+)
+def test_radix_sort_general_keys(data):
+    expected = sorted(data)
+
+    arr = data.copy()
+    exhaust(radix_sort(arr))
+    assert arr == expected
+
+    arr = data.copy()
+    radix_sort.fast(arr, base=100)
+    assert arr == expected
+
+
+@pytest.mark.parametrize(
+    "data",
+    [
+        [2**60 + 1, 2**60, 1.5, -(2**70) - 1, -(2**70), 0.25, float("inf"), float("-inf"), 2**60 + 0.0],
+        [0.0, -0.0, 1, -0.0, 0, 0.0, -1.5, 2.0, 2],
+    ],
+    ids=["large_ints_and_floats", "signed_zeros"],
+)
+def test_radix_sort_mixed_keys_are_exact_and_stable(data):
+    # repr tells apart the elements that compare equal, i.e 0 from 0.0 from -0.0, so this checks the stability too
+    expected = [repr(x) for x in sorted(data)]
+
+    arr = data.copy()
+    exhaust(radix_sort(arr))
+    assert [repr(x) for x in arr] == expected
+
+    arr = data.copy()
+    radix_sort.fast(arr, reverse=True)
+    assert [repr(x) for x in arr] == [repr(x) for x in sorted(data, reverse=True)]
+
+
+def test_radix_sort_key_is_stable():
+    rng = random.Random(0)
+    records = [Record(rng.randrange(-5, 5), i) for i in range(DATASET_SIZE)]
+    expected = sorted(records, key=lambda record: record.key)
+
+    exhaust(radix_sort(records, key=lambda record: record.key))
+    assert [record.index for record in records] == [record.index for record in expected]
+
+    with pytest.raises(TypeError):
+        exhaust(radix_sort(["a", "b"]))
+
+
+@pytest.mark.parametrize("reverse", [False, True])
+@pytest.mark.parametrize("sort_algo", SORTING_ALGORITHMS)
+def test_sort_key_and_reverse(sort_algo, reverse):
+    rng = random.Random(0)
+    records = [Record(rng.randrange(-10, 10), i) for i in range(200)]
+    # the builtin sorted is stable for reverse too, so equal keys keep their original order
+    expected = [record.index for record in sorted(records, key=lambda record: record.key, reverse=reverse)]
+
+    arr = records.copy()
+    for step in sort_algo(arr, key=lambda record: record.key, reverse=reverse):
+        assert 0 <= step.i < len(arr)
+    assert [record.index for record in arr] == expected
+
+    arr = records.copy()
+    sort_algo.fast(arr, key=lambda record: record.key, reverse=reverse)
+    assert [record.index for record in arr] == expected
+
+
+# radix sort takes the key itself, & auto sort profiles the keys rather than the elements
+@pytest.mark.parametrize("sort_algo", [s for s in SORTING_ALGORITHMS if s not in (radix_sort, auto_sort)])
+def test_sort_key_counts_the_reads(sort_algo):
+    data = random.Random(0).sample(range(200), 200)
+
+    arr = OperationLoggingList(data)
+    arr.run(sort_algo(arr))
+    keyed = OperationLoggingList(data)
+    keyed.run(sort_algo(keyed, key=lambda x: x))
+
+    assert keyed == arr
+    # with distinct keys in the same order the sort makes the same accesses, after reading every element for its key
+    assert keyed.stats["reads"] == arr.stats["reads"] + len(data)
+    assert keyed.stats["writes"] == arr.stats["writes"]
+
+
+@pytest.mark.parametrize("name", list(algorithms()))
+def test_sort_key_on_a_range(name):
+    sort_algo = get_algorithm(name)
+    if not {"start", "end"} <= set(signature(sort_algo).parameters):
+        pytest.skip(f"{name} always sorts the whole array")
+
+    data = [random.Random(i).randrange(100) for i in range(40)]
+
+    arr = data.copy()
+    exhaust(sort_algo(arr, 5, 30))
+    assert arr == data[:5] + sorted(data[5:31]) + data[31:]
+
+    arr = data.copy()
+    exhaust(sort_algo(arr, 5, 30, key=lambda x: -x, reverse=True))
+    assert arr == data[:5] + sorted(data[5:31]) + data[31:]
+
+    # the fast path writes the sorted range back in one go, which an array only takes from another array
+    arr = array("i", data)
+    sort_algo.fast(arr, 5, 30, reverse=True)
+    assert arr.tolist() == data[:5] + sorted(data[5:31], reverse=True) + data[31:]
+
+
+def test_sort_an_empty_array():
+    for name in algorithms():
+        arr = []
+        exhaust(get_algorithm(name)(arr))
+        assert arr == []
@@ -0,0 +1,161 @@
+import asyncio
+import json
+import random
+
+import vizsort.lib
+from vizsort.lib import AsyncSorter, run_async
+from vizsort.stream import StepBroadcaster, serve
+
+
+def apply_events(lines):
+    events = [json.loads(line) for line in lines]
+    assert events[0]["type"] == "start" and events[-1]["type"] == "done"
+
+    # the viewer starts off from a snapshot that the first steps have already been applied to
+    arr = events[0]["data"]
+    num_steps = events[0]["steps"]
+    for event in events[1:-1]:
+        for step in event["steps"]:
+            num_steps += 1
+            if step[0] == vizsort.lib.SWAP:
+                arr[step[1]], arr[step[2]] = arr[step[2]], arr[step[1]]
+            elif step[0] == vizsort.lib.WRITE:
+                arr[step[1]] = step[2]
+
+    assert num_steps == events[-1]["steps"]
+    return arr
+
+
+def test_sorts_run_side_by_side():
+    order = []
+
+    async def sort(name, arr):
+        sorter = AsyncSorter(vizsort.lib.insertion_sort, arr, batch_size=10)
+        async for batch in sorter:
+            order.append(name)
+        return sorter.num_steps
+
+    async def race():
+        return await asyncio.gather(sort("a", list(range(30, 0, -1))), sort("b", list(range(30, 0, -1))))
+
+    num_steps_a, num_steps_b = asyncio.run(race())
+    assert num_steps_a == num_steps_b == sum(1 for _ in vizsort.lib.insertion_sort(list(range(30, 0, -1))))
+    # control goes back to the loop after every batch, so the sorts take turns
+    assert order[:4] == ["a", "b", "a", "b"]
+
+
+def test_run_async():
+    arr = list(range(100, 0, -1))
+    assert asyncio.run(run_async(vizsort.lib.merge_sort, arr)) > 0
+    assert arr == sorted(arr)
+
+
+def test_slow_viewer_holds_the_sort_back():
+    async def scenario():
+        broadcaster = StepBroadcaster(vizsort.lib.bubble_sort, range(50, 0, -1), batch_size=10, max_buffered=3)
+        resume = asyncio.Event()
+        received = []
+
+        async def slow_send(event):
+            received.append(event)
+            if len(received) == 2:
+                await resume.wait()
+
+        viewer = asyncio.create_task(broadcaster.stream(slow_send))
+        sort = asyncio.create_task(broadcaster.run())
+        for _ in range(100):
+            await asyncio.sleep(0)
+
+        # the viewer is stuck on its 1st batch, so the sort can't get more than 3 batches ahead of it
+        assert broadcaster.num_batches == 3
+        assert not broadcaster.done
+
+        resume.set()
+        await asyncio.gather(viewer, sort)
+        return received
+
+    received = asyncio.run(scenario())
+    assert apply_events(received) == list(range(1, 51))
+
+
+def test_server_streams_one_run_to_every_viewer():
+    data = list(range(200))
+    random.Random(0).shuffle(data)
+
+    async def fetch(port):
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        writer.write(b"GET / HTTP/1.1\r\nHost: localhost\r\n\r\n")
+        await writer.drain()
+
+        head = await reader.readuntil(b"\r\n\r\n")
+        assert head.startswith(b"HTTP/1.1 200") and b"Transfer-Encoding: chunked" in head
+
+        lines = []
+        while True:
+            size = int(await reader.readline(), 16)
+            chunk = await reader.readexactly(size + 2)
+            if size == 0:
+                break
+            lines.append(chunk[:-2])
+
+        writer.close()
+        return lines
+
+    async def scenario():
+        listening = asyncio.Event()
+        ports = []
+
+        def started(server):
+            ports.append(server.sockets[0].getsockname()[1])
+            listening.set()
+
+        broadcaster = StepBroadcaster(vizsort.lib.merge_sort, data, batch_size=100, max_buffered=4)
+        server = asyncio.create_task(serve(broadcaster, port=0, started=started))
+        await listening.wait()
+
+        responses = await asyncio.gather(*(fetch(ports[0]) for _ in range(3)))
+        # a viewer joining after the sort is done still gets a snapshot & the last batches
+        responses.append(await fetch(ports[0]))
+
+        server.cancel()
+        return broadcaster, responses
+
+    broadcaster, responses = asyncio.run(scenario())
+    for response in responses:
+        assert apply_events(response) == sorted(data)
+    assert json.loads(responses[-1][0])["steps"] > 0
+    assert broadcaster.done and not broadcaster.positions
+
+
+def test_history_stays_bounded():
+    async def scenario():
+        broadcaster = StepBroadcaster(vizsort.lib.insertion_sort, range(60, 0, -1), batch_size=10, max_buffered=4)
+        sort = asyncio.create_task(broadcaster.run())
+
+        # without a viewer, the sort doesn't get anywhere
+        for _ in range(20):
+            await asyncio.sleep(0)
+        assert broadcaster.num_batches == 0
+
+        received = []
+
+        async def send(event):
+            received.append(event)
+            assert len(broadcaster.batches) <= 4
+
+        await broadcaster.stream(send)
+        await sort
+
+        late = []
+
+        async def late_send(event):
+            late.append(event)
+
+        await broadcaster.stream(late_send)
+        return broadcaster, received, late
+
+    broadcaster, received, late = asyncio.run(scenario())
+    assert apply_events(received) == apply_events(late) == list(range(1, 61))
+    # the late viewer only gets the batches that are still kept
+    assert len(late) == 1 + 4 + 1
+    assert len(broadcaster.batches) == 4 and broadcaster.base == broadcaster.num_batches - 4
@@ -0,0 +1,51 @@
+import random
+
+import pytest
+from vizsort.lib import *
+
+DATASET_SIZE = 500
+
+
+@pytest.mark.parametrize("sort_algo", [merge_sort, heap_sort, tim_sort, radix_sort])
+def test_trace_replays_every_step(sort_algo, tmp_path):
+    data = [random.randrange(-DATASET_SIZE, DATASET_SIZE) for _ in range(DATASET_SIZE)]
+    path = tmp_path / "sort.trace"
+
+    arr = data.copy()
+    live_steps = list(sort_algo(arr))
+    assert record_trace(sort_algo, data, path, keyframe_interval=1000) == len(live_steps)
+
+    with TraceReplay(path) as replay:
+        assert replay.arr == data
+        assert list(replay) == live_steps
+        assert replay.arr == arr
+
+
+def test_trace_seeking(tmp_path):
+    data = list(range(DATASET_SIZE, 0, -1))
+    path = tmp_path / "sort.trace"
+    num_steps = record_trace(insertion_sort, data, path, keyframe_interval=1000)
+
+    # the state of the array before every 997th step
+    states = []
+    arr = data.copy()
+    for k, _ in enumerate(insertion_sort(arr), 1):
+        if k % 997 == 0:
+            states.append((k, arr.copy()))
+
+    with TraceReplay(path, OperationLoggingArray("i", [0] * DATASET_SIZE)) as replay:
+        assert len(replay) == num_steps
+        for k, state in reversed(states):
+            replay.seek(k)
+            assert replay.position == k
+            assert replay.arr.tolist() == state
+
+        replay.rewind()
+        assert replay.arr.tolist() == data
+
+
+def test_trace_rejects_other_files(tmp_path):
+    path = tmp_path / "not.trace"
+    path.write_bytes(b"not a trace" * 10)
+    with pytest.raises(ValueError):
+        TraceReplay(path)
@@ -0,0 +1,130 @@
+import pytest
+from vizsort.lib import OperationLoggingArray, OperationLoggingList, StepScheduler, bubble_sort
+
+
+def test_step_scheduler_fixed_steps_per_frame():
+    arr = list(range(50, 0, -1))
+    total_steps = sum(1 for _ in bubble_sort(arr.copy()))
+
+    scheduler = StepScheduler(fps=60, steps_per_frame=100)
+    sorter = iter(bubble_sort(arr))
+
+    frames = []
+    while not scheduler.exhausted:
+        frames.append(len(scheduler.advance(sorter)))
+
+    assert sum(frames) == total_steps
+    assert all(n == 100 for n in frames[:-1])
+    assert arr == sorted(arr)
+
+
+def test_step_scheduler_adaptive_drains_everything():
+    arr = list(range(50, 0, -1))
+    scheduler = StepScheduler(fps=60)
+    sorter = iter(bubble_sort(arr))
+
+    while not scheduler.exhausted:
+        scheduler.advance(sorter)
+
+    assert arr == sorted(arr)
+
+
+def test_step_scheduler_limit():
+    scheduler = StepScheduler(fps=60)
+    sorter = iter(range(1000))
+    assert len(scheduler.advance(sorter, limit=10)) == 10
+    assert not scheduler.exhausted
+
+    scheduler.advance(sorter, limit=0)
+    assert not scheduler.exhausted
+
+
+@pytest.mark.parametrize("steps_per_frame", [0, 10])
+def test_step_scheduler_advance_all_is_fair(steps_per_frame):
+    scheduler = StepScheduler(fps=60, steps_per_frame=steps_per_frame, chunk_size=10)
+    sorters = [iter(range(1000)), iter(range(25)), iter(range(1000))]
+
+    taken = [0, 0, 0]
+    while not scheduler.exhausted:
+        steps = scheduler.advance_all(sorters)
+        # every sorter that hasn't run out of steps gets as many as the others
+        assert steps[0] == steps[2]
+        assert len(steps[1]) <= len(steps[0])
+        taken = [n + len(s) for n, s in zip(taken, steps)]
+
+    assert taken == [1000, 25, 1000]
+    assert scheduler.finished == {0, 1, 2}
+
+    scheduler.reset()
+    assert not scheduler.finished
+
+
+def test_operation_logging_list_counts():
+    arr = OperationLoggingList(range(20, 0, -1))
+    arr.run(bubble_sort(arr))
+
+    assert arr == sorted(arr)
+    assert arr.num_comparisons == 20 * 19 // 2
+    assert arr.num_swaps == 20 * 19 // 2
+    assert arr.num_array_write == 2 * arr.num_swaps
+    assert arr.num_array_reads > 0
+
+    reads = arr.num_array_reads
+    arr.peek(0)
+    assert arr.num_array_reads == reads
+
+
+def test_operation_logging_list_disabled():
+    arr = OperationLoggingList(range(20, 0, -1))
+    arr.logging = False
+    arr.run(bubble_sort(arr))
+
+    assert isinstance(arr, OperationLoggingList)
+    assert arr == sorted(arr)
+    assert arr.stats == {"reads": 0, "writes": 0, "comparisons": 0, "swaps": 0}
+
+    arr.logging = True
+    arr[0] = arr[1]
+    assert (arr.num_array_reads, arr.num_array_write) == (1, 1)
+
+
+def test_operation_logging_array_counts():
+    arr = OperationLoggingArray("i", range(20, 0, -1))
+    arr.run(bubble_sort(arr))
+
+    assert arr.tolist() == list(range(1, 21))
+    assert arr.num_comparisons == arr.num_swaps == 20 * 19 // 2
+    assert arr.num_array_write == 2 * arr.num_swaps
+
+    arr.load([3, 2, 1])
+    assert arr.tolist() == [3, 2, 1]
+    assert arr.num_array_write == 2 * arr.num_swaps
+
+    arr.logging = False
+    arr.reset()
+    arr.shuffle()
+    arr[0] = arr[1]
+    assert isinstance(arr, OperationLoggingArray)
+    assert arr.stats == {"reads": 0, "writes": 0, "comparisons": 0, "swaps": 0}
+
+
+def test_operation_logging_array_view():
+    np = pytest.importorskip("numpy")
+
+    arr = OperationLoggingArray()
+    arr.regenerate(100)
+    assert sorted(arr) == list(range(1, 101))
+
+    view = arr.view()
+    assert view.dtype == np.int32
+    bubble_sort.fast(arr)
+    # the view follows the writes made to the array
+    assert view.tolist() == list(range(1, 101))
+    assert arr.num_array_reads > 0
+
+    # resizing has to wait until the view is gone
+    with pytest.raises(BufferError):
+        arr.regenerate(10)
+    del view
+    arr.regenerate(10)
+    assert len(arr) == 10